@@ -0,0 +1,178 @@
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Awaitable, Callable, List, Optional
+
+from src.domain.ports.obsidian_port import ObsidianPort
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticIndexService:
+    """
+    Background indexer for the semantic search index.
+    Callers only post cheap "maybe stale" signals; the indexer coalesces them and
+    runs at most one sync per `min_interval_seconds`, off the request path.
+    Every `reconcile_interval_seconds` it also reconciles the index with the vault listing.
+    """
+
+    def __init__(self, obsidian_port: ObsidianPort, min_interval_seconds: float = 300, debounce_seconds: float = 2, reconcile_interval_seconds: float = 0):
+        self.obsidian_port = obsidian_port
+        self.min_interval_seconds = min_interval_seconds
+        self.debounce_seconds = debounce_seconds
+        self.reconcile_interval_seconds = reconcile_interval_seconds
+        self.is_running = False
+        self._task: Optional[asyncio.Task] = None
+        self._reconcile_task: Optional[asyncio.Task] = None
+        self._signal: Optional[asyncio.Event] = None
+
+        # Status
+        self.pending_signals = 0
+        self.coalesced_signals = 0
+        self.syncs_completed = 0
+        self.warm = False
+        self.warm_up_seconds: Optional[float] = None
+        self.indexing = False
+        self.last_started_at: Optional[datetime] = None
+        self.last_completed_at: Optional[datetime] = None
+        self.last_duration_seconds: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self._last_finished_monotonic: Optional[float] = None
+
+    async def start(self):
+        """Starts the background indexing loop."""
+        if self.is_running:
+            return
+        self.is_running = True
+        self._signal = asyncio.Event()
+        self._task = asyncio.create_task(self._run_loop())
+        if self.reconcile_interval_seconds > 0:
+            self._reconcile_task = asyncio.create_task(self._reconcile_loop())
+        logger.info("SemanticIndexService started.")
+
+    async def stop(self):
+        """Stops the background indexing loop."""
+        self.is_running = False
+        for task in (self._task, self._reconcile_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        logger.info("SemanticIndexService stopped.")
+
+    def notify(self) -> None:
+        """Signals that the index may be stale. Never blocks; signals are coalesced."""
+        self.pending_signals += 1
+        if self._signal:
+            self._signal.set()
+
+    def status(self) -> dict:
+        try:
+            index = self.obsidian_port.index_stats()
+        except Exception as e:
+            index = {"error": str(e)}
+        return {
+            "running": self.is_running,
+            "warm": self.warm,
+            "warm_up_seconds": self.warm_up_seconds,
+            "indexing": self.indexing,
+            "queue_depth": self.pending_signals,
+            "coalesced_signals": self.coalesced_signals,
+            "syncs_completed": self.syncs_completed,
+            "last_started_at": self.last_started_at.isoformat() if self.last_started_at else None,
+            "last_completed_at": self.last_completed_at.isoformat() if self.last_completed_at else None,
+            "last_duration_seconds": self.last_duration_seconds,
+            "last_error": self.last_error,
+            "index": index,
+        }
+
+    async def _run_loop(self):
+        await self._warm_up()
+        while self.is_running:
+            await self._signal.wait()
+
+            # Let bursts of signals settle, then respect the minimum interval between syncs
+            await asyncio.sleep(self.debounce_seconds)
+            if self._last_finished_monotonic is not None:
+                remaining = self.min_interval_seconds - (time.monotonic() - self._last_finished_monotonic)
+                if remaining > 0:
+                    await asyncio.sleep(remaining)
+
+            self._signal.clear()
+            signals = self.pending_signals
+            self.pending_signals = 0
+            self.coalesced_signals += max(0, signals - 1)
+
+            await self.run_once()
+
+    async def _warm_up(self):
+        """Opens the index and runs the initial sync. On failure, the next signal retries it."""
+        self.indexing = True
+        started = time.monotonic()
+        try:
+            await self.obsidian_port.warm_up()
+            self.warm = True
+            self.warm_up_seconds = round(time.monotonic() - started, 3)
+            logger.info(f"Semantic index warm-up finished in {self.warm_up_seconds}s")
+        except Exception as e:
+            self.last_error = str(e)
+            logger.error(f"Semantic index warm-up failed: {e}", exc_info=True)
+        finally:
+            self.indexing = False
+            self._last_finished_monotonic = time.monotonic()
+
+    async def _reconcile_loop(self):
+        while self.is_running:
+            await asyncio.sleep(self.reconcile_interval_seconds)
+            await self.reconcile()
+
+    async def reconcile(self) -> Optional[dict]:
+        """Reconciles the index with the vault (and compacts it if needed). Returns the index stats."""
+        try:
+            return await self.obsidian_port.reconcile()
+        except Exception as e:
+            self.last_error = str(e)
+            logger.error(f"Semantic index reconciliation failed: {e}", exc_info=True)
+            return None
+
+    async def compact(self, force: bool = False) -> Optional[dict]:
+        """
+        Compacts the index now if it crossed the dead-entry threshold, or unconditionally with
+        `force`. Returns the index stats, or None if the compaction failed.
+        """
+        try:
+            return await self.obsidian_port.compact(force=force)
+        except Exception as e:
+            self.last_error = str(e)
+            logger.error(f"Semantic index compaction failed: {e}", exc_info=True)
+            return None
+
+    async def run_once(self):
+        """Runs a single full sync and records its outcome."""
+        await self._run(lambda: self.obsidian_port.async_sync(force=True))
+
+    async def sync_paths(self, changed_paths: List[str], deleted_paths: List[str]):
+        """Indexes exactly the given notes, e.g. as reported by a filesystem watcher."""
+        await self._run(lambda: self.obsidian_port.async_sync_paths(changed_paths, deleted_paths))
+
+    async def _run(self, sync: Callable[[], Awaitable[None]]):
+        self.indexing = True
+        self.last_started_at = datetime.now()
+        started = time.monotonic()
+        try:
+            await sync()
+            self.last_error = None
+            self.warm = True
+            self.syncs_completed += 1
+            self.last_completed_at = datetime.now()
+        except Exception as e:
+            self.last_error = str(e)
+            logger.error(f"Semantic index sync failed: {e}", exc_info=True)
+        finally:
+            self.indexing = False
+            self._last_finished_monotonic = time.monotonic()
+            self.last_duration_seconds = round(self._last_finished_monotonic - started, 3)
+        logger.info(f"Semantic index sync finished in {self.last_duration_seconds}s")
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Any, Dict, List, Optional
 
 class ObsidianPort(ABC):
     @abstractmethod
@@ -10,9 +10,34 @@ class ObsidianPort(ABC):
         pass
 
     @abstractmethod
-    def search(self, query: str, k: int = 5) -> List[dict]:
+    def search(self, query: str, k: int = 5, filters: Optional[Dict[str, Any]] = None, hops: int = 0) -> List[dict]:
         """
         Performs a semantic similarity search.
+        `filters` restricts the search to notes whose frontmatter matches, e.g. {"Oficios": "Ebanista"}.
+        `hops` adds the notes linked to or from the top hits, up to that many links away.
+        """
+        pass
+
+    @abstractmethod
+    async def asearch(self, query: str, k: int = 5, filters: Optional[Dict[str, Any]] = None, hops: int = 0) -> List[dict]:
+        """
+        Performs a semantic similarity search without blocking the event loop.
+        """
+        pass
+
+    @abstractmethod
+    def text_search(self, query: str, k: int = 10) -> List[dict]:
+        """
+        Full-text search of the vault ignoring accents and casing, tolerant to unfinished words and typos.
+        """
+        pass
+
+    @abstractmethod
+    async def warm_up(self) -> None:
+        """
+        Opens the semantic search index and runs its initial sync.
+        Construction stays cheap; servers run this in the background after startup.
+        Raises if the initial sync fails.
         """
         pass
 
@@ -22,3 +47,67 @@ class ObsidianPort(ABC):
         Synchronizes the semantic search index with the Obsidian API.
         """
         pass
+
+    @abstractmethod
+    async def async_sync(self, force: bool = False) -> None:
+        """
+        Synchronizes the semantic search index without blocking the event loop.
+        Raises if the sync fails.
+        """
+        pass
+
+    @abstractmethod
+    async def async_sync_paths(self, changed_paths: List[str], deleted_paths: List[str]) -> None:
+        """
+        Re-indexes the given changed notes and removes the given deleted notes from the index.
+        A deleted path ending in "/" stands for every note under that folder.
+        """
+        pass
+
+    @abstractmethod
+    async def reconcile(self) -> dict:
+        """
+        Removes notes that no longer exist from the index and indexes notes it is missing.
+        Returns the index stats.
+        """
+        pass
+
+    @abstractmethod
+    async def compact(self, force: bool = False) -> dict:
+        """
+        Rebuilds the index without its deleted entries once they cross the configured threshold.
+        Returns the index stats.
+        """
+        pass
+
+    @abstractmethod
+    def index_stats(self) -> dict:
+        """
+        Returns live and dead entry counts and the outcome of the last reconciliation and compaction.
+        """
+        pass
+
+    @abstractmethod
+    def related_notes(self, note: str, hops: int = 1, direction: str = "both", limit: int = 50) -> Optional[List[dict]]:
+        """
+        Returns the notes within `hops` links of `note` with their distance, following links
+        "out" of it, "in" to it (backlinks) or "both". None if the note is not indexed.
+        """
+        pass
+
+    @abstractmethod
+    def query_notes(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        sort_by: Optional[str] = None,
+        descending: bool = False,
+        limit: int = 50,
+        fields: Optional[List[str]] = None,
+        group_by: Optional[str] = None,
+        stats: Optional[str] = None,
+    ) -> dict:
+        """
+        Filters, sorts and aggregates notes by their frontmatter properties, path, title, folder
+        and modification time. Returns {"total", "notes", "groups"?, "stats"?}.
+        """
+        pass
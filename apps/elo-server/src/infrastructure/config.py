@@ -14,6 +14,9 @@ class AIConfig(BaseModel):
     model: str = "gemini-2.0-flash"
     search_api_key: Optional[str] = None
     search_engine_id: Optional[str] = None
+    planner_mode: str = "auto"
+    planner_bypass_max_words: int = 12
+    fast_commands: bool = True
 
 class ObsidianConfig(BaseModel):
     vault_path: Optional[str] = None
@@ -21,6 +24,36 @@ class ObsidianConfig(BaseModel):
     api_key: Optional[str] = None
     url: str = "http://host.docker.internal:27123"
     last_index_datetime: Optional[str] = None
+    embedding_cache_path: Optional[str] = None
+    indexer: str = "rest"  # "rest" (Local REST API) or "filesystem" (reads vault_path directly)
+    max_concurrent_requests: int = 8
+    max_retries: int = 3
+    retry_backoff_seconds: float = 0.5
+    sync_min_interval_seconds: float = 300
+    sync_debounce_seconds: float = 2
+    reconcile_interval_seconds: float = 3600  # 0 disables the periodic reconciliation pass
+    reconcile_batch_size: int = 500
+    reconcile_max_removed_fraction: float = 0.5  # Larger removals abort the pass (e.g. an empty vault listing)
+    compaction_threshold: float = 0.3
+    watch: bool = False
+    watch_batch_seconds: float = 1.0
+    watch_poll_interval_seconds: float = 2.0
+    chunk_size: int = 1500
+    query_cache_size: int = 256
+    result_cache_size: int = 128
+    result_cache_ttl_seconds: float = 60
+    search_token_budget: int = 1500
+    mmr_lambda: float = 0.7
+    graph_decay: float = 0.5
+    embedding_provider: str = "gemini"  # "gemini", "local" (hashed n-grams, offline) or "sentence-transformers"
+    embedding_model: Optional[str] = None
+    embedding_backend: str = "torch"  # sentence-transformers backend: "torch" or "onnx"
+    embedding_dimensions: Optional[int] = None  # Truncated width (local provider: hash size, default 512)
+    embedding_batch_size: int = 64
+    embedding_workers: int = 2
+    vector_store: str = "chroma"  # "chroma" or "numpy" (memory-mapped, quantized)
+    vector_dtype: str = "int8"  # numpy backend: "int8" or "float16"
+    vector_index: str = "flat"  # numpy backend: "flat" (exact) or "hnsw" (needs hnswlib)
 
 class FilesystemConfig(BaseModel):
     allowed_paths: List[str] = Field(default_factory=list)
@@ -102,7 +135,10 @@ def load_config(config_path: Optional[str] = None) -> AppConfig:
         "api_key": os.getenv("GOOGLE_AI_API_KEY", ""),
         "model": ai_data.get("model", os.getenv("AI_MODEL", "gemini-2.0-flash")),
         "search_api_key": os.getenv("GOOGLE_SEARCH_API_KEY", os.getenv("GOOGLE_AI_API_KEY")),
-        "search_engine_id": ai_data.get("search_engine_id", os.getenv("GOOGLE_SEARCH_ENGINE_ID"))
+        "search_engine_id": ai_data.get("search_engine_id", os.getenv("GOOGLE_SEARCH_ENGINE_ID")),
+        "planner_mode": ai_data.get("plannerMode", "auto"),
+        "planner_bypass_max_words": ai_data.get("plannerBypassMaxWords", 12),
+        "fast_commands": ai_data.get("fastCommands", True)
     }
     
     # Obsidian Config
@@ -112,7 +148,37 @@ def load_config(config_path: Optional[str] = None) -> AppConfig:
         "api_key": os.getenv("OBSIDIAN_API_KEY"),
         "url": obs_data.get("url", obs_data.get("url", os.getenv("OBSIDIAN_URL", "http://host.docker.internal:27123"))),
         "persist_directory": os.getenv("PERSIST_DIRECTORY"),
-        "last_index_datetime": obs_data.get("lastIndexDatetime")
+        "last_index_datetime": obs_data.get("lastIndexDatetime"),
+        "embedding_cache_path": os.getenv("EMBEDDING_CACHE_PATH", obs_data.get("embeddingCachePath")),
+        "indexer": os.getenv("OBSIDIAN_INDEXER", obs_data.get("indexer", "rest")),
+        "max_concurrent_requests": obs_data.get("maxConcurrentRequests", 8),
+        "max_retries": obs_data.get("maxRetries", 3),
+        "retry_backoff_seconds": obs_data.get("retryBackoffSeconds", 0.5),
+        "sync_min_interval_seconds": obs_data.get("syncMinIntervalSeconds", 300),
+        "sync_debounce_seconds": obs_data.get("syncDebounceSeconds", 2),
+        "reconcile_interval_seconds": obs_data.get("reconcileIntervalSeconds", 3600),
+        "reconcile_batch_size": obs_data.get("reconcileBatchSize", 500),
+        "reconcile_max_removed_fraction": obs_data.get("reconcileMaxRemovedFraction", 0.5),
+        "compaction_threshold": obs_data.get("compactionThreshold", 0.3),
+        "watch": os.getenv("OBSIDIAN_WATCH", str(obs_data.get("watch", False))).lower() == "true",
+        "watch_batch_seconds": obs_data.get("watchBatchSeconds", 1.0),
+        "watch_poll_interval_seconds": obs_data.get("watchPollIntervalSeconds", 2.0),
+        "chunk_size": obs_data.get("chunkSize", 1500),
+        "query_cache_size": obs_data.get("queryCacheSize", 256),
+        "result_cache_size": obs_data.get("resultCacheSize", 128),
+        "result_cache_ttl_seconds": obs_data.get("resultCacheTtlSeconds", 60),
+        "search_token_budget": obs_data.get("searchTokenBudget", 1500),
+        "mmr_lambda": obs_data.get("mmrLambda", 0.7),
+        "graph_decay": obs_data.get("graphDecay", 0.5),
+        "embedding_provider": os.getenv("EMBEDDING_PROVIDER", obs_data.get("embeddingProvider", "gemini")),
+        "embedding_model": obs_data.get("embeddingModel"),
+        "embedding_backend": obs_data.get("embeddingBackend", "torch"),
+        "embedding_dimensions": obs_data.get("embeddingDimensions"),
+        "embedding_batch_size": obs_data.get("embeddingBatchSize", 64),
+        "embedding_workers": obs_data.get("embeddingWorkers", 2),
+        "vector_store": os.getenv("VECTOR_STORE", obs_data.get("vectorStore", "chroma")),
+        "vector_dtype": obs_data.get("vectorDtype", "int8"),
+        "vector_index": obs_data.get("vectorIndex", "flat")
     }
     
     # Server Config
@@ -221,23 +287,10 @@ def load_config(config_path: Optional[str] = None) -> AppConfig:
         # Default to 'workspace/chromadb' if not set
         if not config.obsidian.persist_directory:
              config.obsidian.persist_directory = os.path.join(workspace_path, "chromadb")
+        # Keep the embedding cache next to (not inside) the vector store so it survives a wipe
+        if not config.obsidian.embedding_cache_path:
+             config.obsidian.embedding_cache_path = os.path.join(
+                 os.path.dirname(os.path.normpath(config.obsidian.persist_directory)), "embedding-cache.sqlite"
+             )
             
     return config
-
-def update_obsidian_last_index(config_path: str, last_index: str):
-    """
-    Updates only the lastIndexDatetime field in elo.config.json.
-    """
-    if not os.path.exists(config_path):
-        return
-        
-    with open(config_path, "r") as f:
-        config_dict = json.load(f)
-        
-    if "obsidian" not in config_dict:
-        config_dict["obsidian"] = {}
-        
-    config_dict["obsidian"]["lastIndexDatetime"] = last_index
-    
-    with open(config_path, "w") as f:
-        json.dump(config_dict, f, indent=4)
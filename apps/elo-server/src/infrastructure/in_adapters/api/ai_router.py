@@ -86,6 +86,14 @@ async def transcribe(request: TranscribeRequest, use_case: AIToolsUseCase = Depe
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/agent/stats", dependencies=[Depends(verify_token)])
+async def agent_stats(request: Request):
+    adapter = getattr(request.app.state, "ai_adapter", None)
+    if adapter is None:
+        raise HTTPException(status_code=503, detail="The agent is not initialized.")
+    commands = adapter.command_registry.stats() if adapter.command_registry else None
+    return {"planner_mode": adapter.planner_mode, "routes": adapter.route_stats.snapshot(), "commands": commands}
+
 @router.post("/image-search", response_model=ImageSearchResponse, dependencies=[Depends(verify_token)])
 async def image_search(request: ImageSearchRequest, use_case: AIToolsUseCase = Depends(get_ai_use_case)):
     try:
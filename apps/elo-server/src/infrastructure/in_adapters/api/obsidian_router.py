@@ -0,0 +1,43 @@
+from fastapi import APIRouter, Depends, HTTPException, Request
+from src.application.services.semantic_index_service import SemanticIndexService
+from src.infrastructure.in_adapters.api.auth import verify_token
+
+router = APIRouter(prefix="/api/obsidian", tags=["Obsidian"])
+
+# --- Dependencies ---
+# The indexer is injected into app state during bootstrap (None when semantic search is disabled)
+def get_semantic_index_service(request: Request) -> SemanticIndexService:
+    service = getattr(request.app.state, "semantic_index_service", None)
+    if service is None:
+        raise HTTPException(status_code=503, detail="Semantic search is not enabled.")
+    return service
+
+# --- Endpoints ---
+@router.get("/index/status", dependencies=[Depends(verify_token)])
+async def index_status(request: Request, service: SemanticIndexService = Depends(get_semantic_index_service)):
+    watcher = getattr(request.app.state, "vault_watcher", None)
+    return {**service.status(), "watcher": watcher.status() if watcher else None}
+
+
+@router.get("/search/stats", dependencies=[Depends(verify_token)])
+async def search_stats(request: Request):
+    adapter = getattr(request.app.state, "obsidian_adapter", None)
+    if adapter is None:
+        raise HTTPException(status_code=503, detail="Semantic search is not enabled.")
+    return adapter.stats()
+
+
+@router.post("/index/reconcile", dependencies=[Depends(verify_token)])
+async def reconcile_index(service: SemanticIndexService = Depends(get_semantic_index_service)):
+    stats = await service.reconcile()
+    if stats is None:
+        raise HTTPException(status_code=502, detail=f"Reconciliation failed: {service.last_error}")
+    return stats
+
+
+@router.post("/index/compact", dependencies=[Depends(verify_token)])
+async def compact_index(force: bool = False, service: SemanticIndexService = Depends(get_semantic_index_service)):
+    stats = await service.compact(force=force)
+    if stats is None:
+        raise HTTPException(status_code=502, detail=f"Compaction failed: {service.last_error}")
+    return stats
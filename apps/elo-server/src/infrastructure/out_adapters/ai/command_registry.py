@@ -0,0 +1,69 @@
+import re
+import threading
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Pattern, Tuple
+
+from src.infrastructure.out_adapters.ai.request_router import normalize_text
+
+# Politeness that does not change the command ("por favor, lista los workflows")
+_POLITE_RE = re.compile(r"^(please|por favor|porfa|can you|could you|puedes|podrias) |( please| por favor| porfa)$")
+
+
+class Command(NamedTuple):
+    """A request that maps one-to-one onto a tool without arguments."""
+    tool: str
+    patterns: Tuple[Pattern, ...]
+
+
+def command(tool: str, *patterns: str) -> Command:
+    """Patterns match the whole request after folding case and accents and dropping punctuation."""
+    return Command(tool, tuple(re.compile(rf"^(?:{pattern})$") for pattern in patterns))
+
+
+DEFAULT_COMMANDS: List[Command] = [
+    command(
+        "list_n8n_workflows",
+        r"(list|show|lista|listar|muestra|muestrame|mostrar|ver|dame)( (all|the|my|todos|los|mis))* (n8n )?(workflows|flujos)( (de|in|on) n8n)?",
+        r"(que|which|what) (workflows|flujos)( de n8n)? (hay|tengo|are there|do i have)",
+    ),
+    command(
+        "refresh_local_tools",
+        r"(refresh|reload|recarga|recargar|refresca|refrescar|actualiza|actualizar)( (the|my|las|mis))? (local )?(tools|herramientas)( locales)?",
+    ),
+    command(
+        "sync_workspace",
+        r"(sync|synchronize|sincroniza|sincronizar)( (the|my|el|mi))? (workspace|espacio de trabajo)",
+    ),
+]
+
+
+class CommandRegistry:
+    """
+    Declarative fast path for requests that name a known command ("lista los workflows",
+    "refresh tools"). Matching requests run their tool directly, without any model call.
+    Matches and misses are counted.
+    """
+
+    def __init__(self, commands: Iterable[Command] = DEFAULT_COMMANDS):
+        self.commands = list(commands)
+        self._lock = threading.Lock()
+        self._matches: Dict[str, int] = {}
+        self._misses = 0
+
+    def match(self, text: str, available: Optional[Iterable[str]] = None) -> Optional[Command]:
+        """The command `text` asks for, if any, among those whose tool is `available`."""
+        normalized = _POLITE_RE.sub("", normalize_text(text)).strip()
+        available = set(available) if available is not None else None
+        for candidate in self.commands:
+            if available is not None and candidate.tool not in available:
+                continue
+            if normalized and any(pattern.match(normalized) for pattern in candidate.patterns):
+                with self._lock:
+                    self._matches[candidate.tool] = self._matches.get(candidate.tool, 0) + 1
+                return candidate
+        with self._lock:
+            self._misses += 1
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"matches": dict(self._matches), "misses": self._misses}
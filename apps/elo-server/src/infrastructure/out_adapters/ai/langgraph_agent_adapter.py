@@ -1,18 +1,28 @@
 import operator
-from typing import Any, List, Optional, Sequence, Type, TypedDict, Annotated, Literal, Dict
+import asyncio
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Coroutine, Iterator, List, Optional, Sequence, Type, TypedDict, Annotated, Literal, Dict, Tuple
 from datetime import datetime
 from pathlib import Path
 from pydantic import BaseModel, Field
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langgraph.prebuilt import create_react_agent
+from langgraph.prebuilt.chat_agent_executor import AgentState as ReactAgentState
 from langgraph.checkpoint.memory import MemorySaver
 from langgraph.graph import StateGraph, START, END
 from langgraph.graph.message import add_messages
 import os
-from langchain_core.messages import AIMessage, AnyMessage, HumanMessage, BaseMessage, SystemMessage
+from langchain_core.messages import AIMessage, AIMessageChunk, AnyMessage, HumanMessage, BaseMessage, SystemMessage, ToolMessage
 from langchain_core.runnables import Runnable
 
 from src.domain.ports.ai_port import AIPort
+from src.infrastructure.out_adapters.ai.command_registry import CommandRegistry
+from src.infrastructure.out_adapters.ai.request_router import PLANNER_MODES, ROUTE_COMMAND, ROUTE_DIRECT, RouteStats, last_human_text, route_request
+from src.infrastructure.out_adapters.obsidian.vault_files import load_vault_schema
 
 
 from src.infrastructure.logging.langchain_callback_handler import PromptLoggingCallbackHandler
@@ -33,6 +43,12 @@ class AgentState(TypedDict):
     messages: Annotated[list[AnyMessage], add_messages]
     plan: List[str]
     delegation_reason: Optional[str]
+    route: Optional[str]
+    route_reason: Optional[str]
+
+class ExecutorState(ReactAgentState):
+    """State of the ReAct executor: the conversation plus the plan of the current turn."""
+    plan: List[str]
 
 class LangGraphAgentAdapter(AIPort, Runnable):
 
@@ -44,9 +60,11 @@ class LangGraphAgentAdapter(AIPort, Runnable):
     def output_schema(self) -> Type[BaseModel]:
         return AIMessage
 
-    def __init__(self, api_key: str, model_name: str = "gemini-1.5-flash", tools: Optional[List] = None, base_storage_path: str = "workspace/users", vault_path: Optional[str] = None):
+    def __init__(self, api_key: str, model_name: str = "gemini-1.5-flash", tools: Optional[List] = None, base_storage_path: str = "workspace/users", vault_path: Optional[str] = None, planner_mode: str = "auto", planner_bypass_max_words: int = 12, fast_commands: bool = True):
         if not api_key:
             raise ValueError("API key must be provided")
+        if planner_mode not in PLANNER_MODES:
+            raise ValueError(f"planner_mode must be one of {', '.join(PLANNER_MODES)}")
             
         self.callbacks = [PromptLoggingCallbackHandler(provider="google")]
         self.llm = ChatGoogleGenerativeAI(
@@ -63,6 +81,10 @@ class LangGraphAgentAdapter(AIPort, Runnable):
             
         self.checkpointer = MemorySaver()
         self.graph = None
+        self.planner_mode = planner_mode
+        self.planner_bypass_max_words = planner_bypass_max_words
+        self.route_stats = RouteStats()
+        self.command_registry = CommandRegistry() if fast_commands else None
         
         # Load vault schema if available
         self.vault_schema = self._load_vault_schema()
@@ -71,22 +93,7 @@ class LangGraphAgentAdapter(AIPort, Runnable):
 
     def _load_vault_schema(self) -> dict:
         """Loads frontmatter keys from .obsidian/types.json if it exists."""
-        if not self.vault_path:
-            return {}
-            
-        # Try both direct path and inside .obsidian
-        schema_path = self.vault_path / ".obsidian" / "types.json"
-        if not schema_path.exists():
-            return {}
-
-        try:
-            import json
-            with open(schema_path, "r") as f:
-                data = json.load(f)
-                return data.get("types", {})
-        except Exception as e:
-            print(f"Warning: Could not load vault schema: {e}")
-            return {}
+        return load_vault_schema(str(self.vault_path) if self.vault_path else None)
 
     def _initialize_agent(self):
         """
@@ -113,7 +120,8 @@ class LangGraphAgentAdapter(AIPort, Runnable):
             system_msg += (
                 f"\\n\\nVault Metadata Schema (Frontmatter keys):\\n{schema_keys}\\n"
                 "When searching or querying notes, use these exact keys in your queries if possible. "
-                "Be aware of accents and specific naming (e.g., 'Oficios', 'Profesión')."
+                "Keys are matched exactly by MCP tools, so mind accents (e.g., 'Oficios', 'Profesión'). "
+                "The vault_* tools ignore accents and casing, so there is no need to retry spellings with them."
             )
 
         system_msg += (
@@ -121,6 +129,15 @@ class LangGraphAgentAdapter(AIPort, Runnable):
             "the Filesystem tools as a fallback or broaden your search."
         )
 
+        def router_node(state: AgentState):
+            messages = state.get("messages", [])
+            route, reason = route_request(messages, self.planner_mode, self.planner_bypass_max_words)
+            update = {"route": route, "route_reason": reason}
+            if route == ROUTE_DIRECT:
+                # Implicit one-step plan: the request itself
+                update["plan"] = [last_human_text(messages)]
+            return update
+
         async def planner_node(state: AgentState):
             messages = state.get("messages", [])
             
@@ -134,22 +151,26 @@ class LangGraphAgentAdapter(AIPort, Runnable):
             plan_result = await planner.ainvoke([planner_prompt] + messages)
             return {"plan": plan_result.steps}
 
+        def executor_prompt(state: ExecutorState) -> List[BaseMessage]:
+            # The plan changes every turn, so it is read from the state rather than compiled into the agent
+            plan_text = "\\n".join([f"{i+1}. {step}" for i, step in enumerate(state.get("plan", []))])
+            executor_sys_msg = f"{system_msg}\\n\\nHere is your step-by-step plan:\\n{plan_text}\\n\\nExecute the plan step-by-step."
+            return [SystemMessage(content=executor_sys_msg)] + state["messages"]
+
+        # The ReAct agent is compiled once per tool set (binding converts every tool schema)
+        self.executor_agent = create_react_agent(
+            self.llm,
+            self.tools,
+            prompt=executor_prompt,
+            state_schema=ExecutorState,
+        )
+
         async def executor_node(state: AgentState):
             messages = state.get("messages", [])
             plan = state.get("plan", [])
             
-            plan_text = "\\n".join([f"{i+1}. {step}" for i, step in enumerate(plan)])
-            executor_sys_msg = f"{system_msg}\\n\\nHere is your step-by-step plan:\\n{plan_text}\\n\\nExecute the plan step-by-step."
-            
-            # Create a localized ReAct agent for execution
-            executor_agent = create_react_agent(
-                self.llm, 
-                self.tools, 
-                prompt=executor_sys_msg
-            )
-            
             # Execute taking the entire message history
-            result = await executor_agent.ainvoke({"messages": messages})
+            result = await self.executor_agent.ainvoke({"messages": messages, "plan": plan})
             
             new_msgs = result["messages"][len(messages):]
             
@@ -183,11 +204,17 @@ class LangGraphAgentAdapter(AIPort, Runnable):
             return "__end__"
 
         workflow = StateGraph(AgentState)
+        workflow.add_node("router", router_node)
         workflow.add_node("planner", planner_node)
         workflow.add_node("executor", executor_node)
         workflow.add_node("delegator", delegator_node)
 
-        workflow.add_edge(START, "planner")
+        workflow.add_edge(START, "router")
+        workflow.add_conditional_edges(
+            "router",
+            lambda state: "executor" if state.get("route") == ROUTE_DIRECT else "planner",
+            {"planner": "planner", "executor": "executor"},
+        )
         workflow.add_edge("planner", "executor")
         workflow.add_conditional_edges("executor", should_delegate, {"delegator": "delegator", "__end__": END})
         workflow.add_edge("delegator", END)
@@ -263,16 +290,36 @@ class LangGraphAgentAdapter(AIPort, Runnable):
     def invoke(self, input, config=None, **kwargs):
         input = self._sanitize_input(input)
         config = self._ensure_config(config)
+        started = time.monotonic()
+        reply = self._run_blocking(self._run_command(input, config, started))
+        if reply is not None:
+            return reply
         result = self.graph.invoke(input, config, **kwargs)
+        self._record_route(result.get("route"), result.get("route_reason"), started)
         return self._extract_output(result)
 
+    @staticmethod
+    def _run_blocking(coro: Coroutine):
+        """Runs a coroutine to completion, on a helper thread if a loop is already running."""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coro)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, coro).result()
+
     async def ainvoke(self, input, config=None, **kwargs):
         import logging
         logger = logging.getLogger("src.infrastructure.out_adapters.ai.langgraph_agent_adapter")
         logger.info(f"AI Agent ainvoke | Input: {input}")
         input = self._sanitize_input(input)
         config = self._ensure_config(config)
+        started = time.monotonic()
+        reply = await self._run_command(input, config, started)
+        if reply is not None:
+            return reply
         result = await self.graph.ainvoke(input, config, **kwargs)
+        self._record_route(result.get("route"), result.get("route_reason"), started)
         output = self._extract_output(result)
         logger.info(f"AI Agent ainvoke | Output type: {type(output)}")
         if hasattr(output, "content"):
@@ -280,24 +327,137 @@ class LangGraphAgentAdapter(AIPort, Runnable):
         return output
 
     def stream(self, input, config=None, **kwargs):
-        input = self._sanitize_input(input)
-        config = self._ensure_config(config)
-        # Fallback to invoke to ensure stability for now.
-        # Yield the extracted message.
-        result = self.graph.invoke(input, config, **kwargs)
-        yield self._extract_output(result)
+        """
+        Blocking variant of `astream`. The graph nodes are async, so the stream is driven on
+        a helper thread's event loop and its chunks are handed over as they arrive. Closing the
+        generator early (a client disconnect) cancels the turn on the helper loop.
+        """
+        chunks: queue.Queue = queue.Queue()
+        done = object()
+        running = threading.Event()
+        pump_task: Dict[str, Any] = {}
+
+        async def pump():
+            pump_task.update(loop=asyncio.get_running_loop(), task=asyncio.current_task())
+            running.set()
+            try:
+                async for chunk in self.astream(input, config, **kwargs):
+                    chunks.put(chunk)
+            except asyncio.CancelledError:
+                pass
+            except Exception as e:
+                chunks.put(e)
+            finally:
+                chunks.put(done)
+
+        threading.Thread(target=asyncio.run, args=(pump(),), name="agent-stream", daemon=True).start()
+        finished = False
+        try:
+            while (chunk := chunks.get()) is not done:
+                if isinstance(chunk, Exception):
+                    finished = True
+                    raise chunk
+                yield chunk
+            finished = True
+        finally:
+            if not finished:
+                running.wait()
+                try:
+                    pump_task["loop"].call_soon_threadsafe(pump_task["task"].cancel)
+                except RuntimeError:
+                    pass  # The turn ended and its loop closed meanwhile
 
     async def astream(self, input, config=None, **kwargs):
-        import logging
+        """
+        Streams an agent turn while it runs, as LangServe message chunks:
+        - the plan, as soon as the planner returns: an empty AIMessageChunk with `additional_kwargs["plan"]`;
+        - the executor's model output token by token (AIMessageChunk); tool calls arrive as
+          `tool_call_chunks`, which mark the start of a tool call;
+        - each tool result as a ToolMessage, which marks its end;
+        - a delegation to a human as a single AIMessageChunk.
+        """
         logger = logging.getLogger("src.infrastructure.out_adapters.ai.langgraph_agent_adapter")
         logger.info(f"AI Agent astream | Input: {input}")
         input = self._sanitize_input(input)
         config = self._ensure_config(config)
-        # Fallback to ainvoke for stability.
-        result = await self.graph.ainvoke(input, config, **kwargs)
-        output = self._extract_output(result)
-        logger.info(f"AI Agent astream | Yielding: {output}")
-        yield output
+        started = time.monotonic()
+        reply = await self._run_command(input, config, started)
+        if reply is not None:
+            yield AIMessageChunk(content=reply.content)
+            return
+        first_chunk = True
+        route = route_reason = None
+        async for namespace, mode, data in self.graph.astream(
+            input, config, stream_mode=["messages", "updates"], subgraphs=True, **kwargs
+        ):
+            if mode == "updates" and not namespace and "router" in data:
+                route, route_reason = data["router"]["route"], data["router"]["route_reason"]
+            for chunk in self._stream_chunks(namespace, mode, data):
+                if first_chunk:
+                    logger.info(f"AI Agent astream | First chunk after {time.monotonic() - started:.2f}s (route: {route})")
+                    first_chunk = False
+                yield chunk
+        self._record_route(route, route_reason, started)
+
+    async def _run_command(self, input, config, started: float) -> Optional[AIMessage]:
+        """
+        Fast path for a request that names a known command ("list n8n workflows"): runs its tool
+        directly, without any model call, and records the exchange in the conversation thread.
+        Returns None when the request is not a command, so the graph handles it.
+        """
+        messages = input.get("messages", []) if isinstance(input, dict) else []
+        if self.command_registry is None or not messages or not isinstance(messages[-1], HumanMessage):
+            return None
+        text = last_human_text(messages)
+        tools = {t.name: t for t in self.tools}
+        matched = self.command_registry.match(text, tools)
+        if matched is None:
+            return None
+        try:
+            result = await tools[matched.tool].ainvoke({})
+        except Exception as e:
+            logging.getLogger("src.infrastructure.out_adapters.ai.langgraph_agent_adapter").warning(
+                f"AI Agent | Command {matched.tool} failed, falling back to the agent: {e}"
+            )
+            return None
+        reply = AIMessage(content=str(result))
+        # Recorded as an executor answer without delegation, so the turn ends there and the next one starts at the router
+        await self.graph.aupdate_state(
+            config,
+            {"messages": messages + [reply], "plan": [text], "delegation_reason": None, "route": ROUTE_COMMAND, "route_reason": matched.tool},
+            as_node="executor",
+        )
+        self._record_route(ROUTE_COMMAND, matched.tool, started)
+        return reply
+
+    def _record_route(self, route: Optional[str], reason: Optional[str], started: float) -> None:
+        """Logs and counts the latency of a turn per route, to tune the planner bypass."""
+        if route is None:
+            return
+        elapsed = time.monotonic() - started
+        self.route_stats.record(route, reason or "", elapsed)
+        logging.getLogger("src.infrastructure.out_adapters.ai.langgraph_agent_adapter").info(
+            f"AI Agent | Route: {route} ({reason}) | Turn took {elapsed:.2f}s"
+        )
+
+    @staticmethod
+    def _stream_chunks(namespace: Tuple[str, ...], mode: str, data: Any) -> Iterator[BaseMessage]:
+        """Maps one graph stream event to the message chunks sent to the client."""
+        if mode == "messages":
+            message, _ = data
+            # Only the executor's ReAct loop (a subgraph) streams tokens; the planner's structured
+            # output is reported whole once it is parsed
+            if not namespace:
+                return
+            if isinstance(message, ToolMessage):
+                yield message
+            elif isinstance(message, AIMessageChunk) and (message.content or message.tool_call_chunks):
+                yield message
+        elif mode == "updates" and not namespace:
+            if (data.get("planner") or {}).get("plan"):
+                yield AIMessageChunk(content="", additional_kwargs={"plan": data["planner"]["plan"]})
+            for message in (data.get("delegator") or {}).get("messages", []):
+                yield AIMessageChunk(content=message.content)
 
     def batch(self, inputs, config=None, **kwargs):
 
@@ -321,11 +481,15 @@ class LangGraphAgentAdapter(AIPort, Runnable):
              return response.content
 
         config = self._ensure_config(None, user_id=user_id)
-        
-        result = await self.graph.ainvoke(
-            {"messages": [HumanMessage(content=prompt)]},
-            config=config
-        )
+        input = {"messages": [HumanMessage(content=prompt)]}
+        started = time.monotonic()
+        reply = await self._run_command(input, config, started)
+        if reply is not None:
+            return reply.content
+
+        result = await self.graph.ainvoke(input, config=config)
+        if isinstance(result, dict):
+            self._record_route(result.get("route"), result.get("route_reason"), started)
         
         # Extract the last message content from the state dict
         if isinstance(result, dict) and "messages" in result:
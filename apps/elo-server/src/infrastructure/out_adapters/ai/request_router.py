@@ -0,0 +1,94 @@
+import re
+import threading
+import unicodedata
+from typing import Any, Dict, Sequence, Tuple
+
+from langchain_core.messages import BaseMessage, HumanMessage
+
+ROUTE_PLAN = "plan"
+ROUTE_DIRECT = "direct"
+ROUTE_COMMAND = "command"
+PLANNER_MODES = ("auto", "always", "never")
+
+# Greetings, thanks and acknowledgements, in Spanish and English (accents and case folded)
+_SMALL_TALK_RE = re.compile(
+    r"^(hola|buenas|buenos dias|buenas tardes|buenas noches|hey|hi|hello|gracias|muchas gracias|thanks|thank you|"
+    r"ok|okay|vale|perfecto|genial|adios|hasta luego|bye|si|no|de acuerdo)( \w+)?$"
+)
+# Words that chain several tasks in one request ("busca X y luego crea Y")
+_SEQUENCE_RE = re.compile(
+    r"\b(y luego|y despues|luego|despues|primero|segundo|finalmente|por ultimo|ademas|tambien|a continuacion|"
+    r"then|after that|afterwards|first|second|finally|also|and then)\b"
+)
+_LIST_ITEM_RE = re.compile(r"^\s*(\d+[.)]|[-*•])\s+", re.MULTILINE)
+_SENTENCE_END_RE = re.compile(r"[.?!]+(\s|$)")
+
+
+def normalize_text(text: str) -> str:
+    folded = unicodedata.normalize("NFKD", text.lower())
+    folded = "".join(char for char in folded if not unicodedata.combining(char))
+    return " ".join(re.sub(r"[^\w\s]", " ", folded).split())
+
+
+def last_human_text(messages: Sequence[BaseMessage]) -> str:
+    for message in reversed(messages):
+        if isinstance(message, HumanMessage):
+            return message.content if isinstance(message.content, str) else str(message.content)
+    return ""
+
+
+def route_request(messages: Sequence[BaseMessage], mode: str = "auto", max_words: int = 12) -> Tuple[str, str]:
+    """
+    Decides whether a request needs the planner, as (route, reason). In "auto" mode, small talk
+    and short single-intent requests go straight to the executor. Long requests, requests that
+    chain several tasks and follow-ups to a delegation are planned. "always" and "never" force
+    one route.
+    """
+    if mode == "always":
+        return ROUTE_PLAN, "planner always on"
+    if mode == "never":
+        return ROUTE_DIRECT, "planner disabled"
+
+    text = last_human_text(messages)
+    normalized = normalize_text(text)
+    if not normalized:
+        return ROUTE_PLAN, "no text"
+    if any("DELEGATED_TO_HUMAN" in str(message.content) for message in messages[-4:]):
+        return ROUTE_PLAN, "follow-up to a delegation"
+    if _SMALL_TALK_RE.match(normalized):
+        return ROUTE_DIRECT, "small talk"
+    if len(normalized.split()) > max_words:
+        return ROUTE_PLAN, "long request"
+    if _SEQUENCE_RE.search(normalized) or len(_LIST_ITEM_RE.findall(text)) > 1:
+        return ROUTE_PLAN, "several tasks"
+    if len(_SENTENCE_END_RE.findall(text.strip())) > 1:
+        return ROUTE_PLAN, "several sentences"
+    return ROUTE_DIRECT, "single intent"
+
+
+class RouteStats:
+    """Turn counts and latencies per route, to tune the planner bypass."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, route: str, reason: str, seconds: float) -> None:
+        with self._lock:
+            stats = self._routes.setdefault(route, {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "reasons": {}})
+            stats["count"] += 1
+            stats["total_ms"] += seconds * 1000
+            stats["max_ms"] = max(stats["max_ms"], seconds * 1000)
+            stats["reasons"][reason] = stats["reasons"].get(reason, 0) + 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                route: {
+                    "count": stats["count"],
+                    "avg_ms": round(stats["total_ms"] / stats["count"], 1),
+                    "max_ms": round(stats["max_ms"], 1),
+                    "reasons": dict(stats["reasons"]),
+                }
+                for route, stats in self._routes.items()
+            }
@@ -0,0 +1,255 @@
+import math
+import os
+import sqlite3
+import threading
+from collections import Counter
+from typing import AbstractSet, Dict, List, Optional, Sequence, Set, Tuple
+
+from src.infrastructure.out_adapters.obsidian.term_trie import TermTrie
+from src.infrastructure.out_adapters.obsidian.text_analysis import tokenize
+
+# Query word expansion for full-text search: words this long also match longer terms they
+# start with, and words this long also match terms one edit away. Expanded terms score lower
+PREFIX_MIN_LENGTH = 3
+PREFIX_EXPANSIONS = 50
+PREFIX_WEIGHT = 0.8
+FUZZY_MIN_LENGTH = 4
+FUZZY_WEIGHT = 0.6
+
+
+class BM25Index:
+    """
+    On-disk inverted index (SQLite) over the same chunks stored in the vector store,
+    scored with Okapi BM25. Chunks are added and removed by ID alongside the vector store.
+    """
+
+    def __init__(self, db_path: str, k1: float = 1.2, b: float = 0.75):
+        self.db_path = db_path
+        self.k1 = k1
+        self.b = b
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS chunks (
+                id TEXT PRIMARY KEY,
+                path TEXT NOT NULL,
+                length INTEGER NOT NULL,
+                content TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS chunks_path ON chunks(path);
+            CREATE TABLE IF NOT EXISTS postings (
+                term TEXT NOT NULL,
+                chunk_id TEXT NOT NULL,
+                tf INTEGER NOT NULL,
+                PRIMARY KEY (term, chunk_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS postings_chunk ON postings(chunk_id);
+            """
+        )
+        self._conn.commit()
+        self._stats: Optional[tuple] = None
+        self._vocabulary: Optional[TermTrie] = None
+
+    def add(self, chunk_ids: Sequence[str], paths: Sequence[str], contents: Sequence[str]) -> None:
+        """Indexes (or re-indexes) the given chunks."""
+        if not chunk_ids:
+            return
+        added: Set[str] = set()
+        with self._lock:
+            with self._conn:
+                self._delete_locked(chunk_ids)
+                for cid, path, content in zip(chunk_ids, paths, contents):
+                    terms = Counter(tokenize(content))
+                    self._conn.execute(
+                        "INSERT INTO chunks (id, path, length, content) VALUES (?, ?, ?, ?)",
+                        (cid, path, sum(terms.values()), content),
+                    )
+                    self._conn.executemany(
+                        "INSERT INTO postings (term, chunk_id, tf) VALUES (?, ?, ?)",
+                        [(term, cid, tf) for term, tf in terms.items()],
+                    )
+                    added.update(terms)
+            self._stats = None
+            if self._vocabulary is not None:
+                self._vocabulary.add(added)
+
+    def delete(self, chunk_ids: Sequence[str]) -> None:
+        if not chunk_ids:
+            return
+        with self._lock:
+            with self._conn:
+                self._delete_locked(chunk_ids)
+            self._stats = None
+
+    def _delete_locked(self, chunk_ids: Sequence[str]) -> None:
+        for start in range(0, len(chunk_ids), 500):
+            batch = list(chunk_ids[start:start + 500])
+            placeholders = ",".join("?" for _ in batch)
+            self._conn.execute(f"DELETE FROM postings WHERE chunk_id IN ({placeholders})", batch)
+            self._conn.execute(f"DELETE FROM chunks WHERE id IN ({placeholders})", batch)
+
+    def clear(self) -> None:
+        with self._lock:
+            with self._conn:
+                self._conn.execute("DELETE FROM postings")
+                self._conn.execute("DELETE FROM chunks")
+            self._stats = None
+            self._vocabulary = None
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+
+    def search(self, query: str, k: int = 5, chunk_ids: Optional[AbstractSet[str]] = None) -> List[dict]:
+        """
+        Returns the top-k chunks as dicts with id, path, content and score.
+        When `chunk_ids` is given, only those chunks are scored.
+        """
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+
+        with self._lock:
+            if self._stats is None:
+                self._stats = self._conn.execute("SELECT COUNT(*), AVG(length) FROM chunks").fetchone()
+            total_chunks, avg_length = self._stats
+            if not total_chunks:
+                return []
+            avg_length = avg_length or 1.0
+
+            scores: Dict[str, float] = {}
+            for term in terms:
+                rows = self._conn.execute(
+                    "SELECT p.chunk_id, p.tf, c.length FROM postings p JOIN chunks c ON c.id = p.chunk_id WHERE p.term = ?",
+                    (term,),
+                ).fetchall()
+                if not rows:
+                    continue
+                df = len(rows)
+                idf = math.log(1 + (total_chunks - df + 0.5) / (df + 0.5))
+                for cid, tf, length in rows:
+                    if chunk_ids is not None and cid not in chunk_ids:
+                        continue
+                    norm = tf + self.k1 * (1 - self.b + self.b * length / avg_length)
+                    scores[cid] = scores.get(cid, 0.0) + idf * tf * (self.k1 + 1) / norm
+
+            top = sorted(scores, key=lambda cid: scores[cid], reverse=True)[:k]
+            if not top:
+                return []
+            placeholders = ",".join("?" for _ in top)
+            rows = self._conn.execute(
+                f"SELECT id, path, content FROM chunks WHERE id IN ({placeholders})", top
+            ).fetchall()
+
+        by_id = {cid: (path, content) for cid, path, content in rows}
+        return [
+            {"id": cid, "path": by_id[cid][0], "content": by_id[cid][1], "score": scores[cid]}
+            for cid in top if cid in by_id
+        ]
+
+    @property
+    def vocabulary(self) -> TermTrie:
+        """Distinct indexed terms, loaded on first use and extended as chunks are added."""
+        with self._lock:
+            if self._vocabulary is None:
+                self._vocabulary = TermTrie(row[0] for row in self._conn.execute("SELECT DISTINCT term FROM postings"))
+            return self._vocabulary
+
+    def expand(self, word: str) -> Dict[str, float]:
+        """
+        Index terms a folded query word stands for, with their weight: the word itself, the
+        terms it is a prefix of and the terms one edit away from it.
+        """
+        vocabulary = self.vocabulary
+        weights = {word: 1.0}
+        if len(word) >= PREFIX_MIN_LENGTH:
+            for term in vocabulary.prefix(word, PREFIX_EXPANSIONS):
+                weights.setdefault(term, PREFIX_WEIGHT)
+        if len(word) >= FUZZY_MIN_LENGTH:
+            for term, _ in vocabulary.fuzzy(word, max_distance=1):
+                weights.setdefault(term, FUZZY_WEIGHT)
+        return weights
+
+    def text_search(self, query: str, k: int = 10) -> List[dict]:
+        """
+        Full-text search tolerant to accents, casing, unfinished words and one typo per word.
+        Chunks matching more query words rank first, then by BM25 score (expanded terms weigh
+        less than exact ones). Returns the best chunk of each of the top `k` notes as dicts with
+        id, path, content, score, matched (query words found), words (query words) and terms
+        (the index terms that matched).
+        """
+        words = list(dict.fromkeys(tokenize(query)))
+        if not words:
+            return []
+        expansions = [self.expand(word) for word in words]
+
+        with self._lock:
+            if self._stats is None:
+                self._stats = self._conn.execute("SELECT COUNT(*), AVG(length) FROM chunks").fetchone()
+            total_chunks, avg_length = self._stats
+            if not total_chunks:
+                return []
+            avg_length = avg_length or 1.0
+
+            # Best (score, term) of every chunk for each query word
+            per_word: List[Dict[str, Tuple[float, str]]] = []
+            for weights in expansions:
+                best: Dict[str, Tuple[float, str]] = {}
+                for term, weight in weights.items():
+                    rows = self._conn.execute(
+                        "SELECT p.chunk_id, p.tf, c.length FROM postings p JOIN chunks c ON c.id = p.chunk_id WHERE p.term = ?",
+                        (term,),
+                    ).fetchall()
+                    if not rows:
+                        continue
+                    idf = math.log(1 + (total_chunks - len(rows) + 0.5) / (len(rows) + 0.5))
+                    for cid, tf, length in rows:
+                        norm = tf + self.k1 * (1 - self.b + self.b * length / avg_length)
+                        score = weight * idf * tf * (self.k1 + 1) / norm
+                        if score > best.get(cid, (0.0, ""))[0]:
+                            best[cid] = (score, term)
+                per_word.append(best)
+
+            totals: Dict[str, Tuple[int, float]] = {}
+            for best in per_word:
+                for cid, (score, _) in best.items():
+                    matched, total = totals.get(cid, (0, 0.0))
+                    totals[cid] = (matched + 1, total + score)
+            # A note's best chunk is among the top few chunks overall
+            top = sorted(totals, key=lambda cid: totals[cid], reverse=True)[:k * 5]
+            if not top:
+                return []
+            placeholders = ",".join("?" for _ in top)
+            rows = self._conn.execute(
+                f"SELECT id, path, content FROM chunks WHERE id IN ({placeholders})", top
+            ).fetchall()
+
+        by_id = {cid: (path, content) for cid, path, content in rows}
+        results: List[dict] = []
+        seen_paths: Set[str] = set()
+        for cid in top:
+            if cid not in by_id or by_id[cid][0] in seen_paths:
+                continue
+            seen_paths.add(by_id[cid][0])
+            results.append({
+                "id": cid,
+                "path": by_id[cid][0],
+                "content": by_id[cid][1],
+                "score": totals[cid][1],
+                "matched": totals[cid][0],
+                "words": len(words),
+                "terms": sorted({best[cid][1] for best in per_word if cid in best}),
+            })
+            if len(results) == k:
+                break
+        return results
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,131 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from array import array
+from typing import Dict, List, Optional
+
+from langchain_core.embeddings import Embeddings
+
+
+class EmbeddingCache:
+    """
+    Persistent embedding store in SQLite keyed by (model, task_type, sha256(text)).
+    It lives outside the vector store directory so a wiped index can be rebuilt
+    without calling the embedding API again.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model TEXT NOT NULL,
+                task_type TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                PRIMARY KEY (model, task_type, text_hash)
+            )
+            """
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def text_hash(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def get_many(self, model: str, task_type: str, hashes: List[str]) -> Dict[str, List[float]]:
+        """Returns the cached vectors for the given text hashes (missing ones are omitted)."""
+        found: Dict[str, List[float]] = {}
+        unique = list(dict.fromkeys(hashes))
+        with self._lock:
+            # Stay well below SQLite's bound-parameter limit
+            for start in range(0, len(unique), 500):
+                batch = unique[start:start + 500]
+                placeholders = ",".join("?" for _ in batch)
+                rows = self._conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings "
+                    f"WHERE model = ? AND task_type = ? AND text_hash IN ({placeholders})",
+                    [model, task_type, *batch],
+                ).fetchall()
+                for text_hash, blob in rows:
+                    found[text_hash] = array("f", blob).tolist()
+        return found
+
+    def put_many(self, model: str, task_type: str, items: Dict[str, List[float]]) -> None:
+        if not items:
+            return
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (model, task_type, text_hash, vector) VALUES (?, ?, ?, ?)",
+                    [(model, task_type, h, array("f", v).tobytes()) for h, v in items.items()],
+                )
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Wraps an Embeddings provider and serves document embeddings from an EmbeddingCache.
+    Only the texts that are not cached are sent to the underlying provider.
+    """
+
+    def __init__(self, embeddings: Embeddings, cache: EmbeddingCache, model: str, task_type: Optional[str] = None):
+        self.embeddings = embeddings
+        self.cache = cache
+        self.model = model
+        self.task_type = task_type or "default"
+        self.hits = 0
+        self.misses = 0
+
+    def _split_cached(self, texts: List[str]):
+        hashes = [EmbeddingCache.text_hash(t) for t in texts]
+        cached = self.cache.get_many(self.model, self.task_type, hashes)
+        missing = {}
+        for text, h in zip(texts, hashes):
+            if h not in cached:
+                missing.setdefault(h, text)
+        self.hits += sum(1 for h in hashes if h in cached)
+        self.misses += len(missing)
+        return hashes, cached, missing
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        hashes, cached, missing = self._split_cached(texts)
+        if missing:
+            vectors = self.embeddings.embed_documents(list(missing.values()))
+            computed = dict(zip(missing.keys(), vectors))
+            self.cache.put_many(self.model, self.task_type, computed)
+            cached.update(computed)
+            logging.info(f"Embedding cache: {len(texts) - len(missing)} hits, {len(missing)} embedded")
+        return [cached[h] for h in hashes]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        hashes, cached, missing = self._split_cached(texts)
+        if missing:
+            vectors = await self.embeddings.aembed_documents(list(missing.values()))
+            computed = dict(zip(missing.keys(), vectors))
+            self.cache.put_many(self.model, self.task_type, computed)
+            cached.update(computed)
+            logging.info(f"Embedding cache: {len(texts) - len(missing)} hits, {len(missing)} embedded")
+        return [cached[h] for h in hashes]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embeddings.embed_query(text)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return await self.embeddings.aembed_query(text)
@@ -0,0 +1,103 @@
+import re
+from typing import List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from langchain_google_genai import GoogleGenerativeAIEmbeddings
+
+from src.infrastructure.config import ObsidianConfig
+from src.infrastructure.out_adapters.obsidian.local_embeddings import HashingNgramEmbeddings, SentenceTransformerEmbeddings
+
+GEMINI_EMBEDDING_MODEL = "models/gemini-embedding-001"
+DEFAULT_SENTENCE_TRANSFORMER_MODEL = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+
+EMBEDDING_PROVIDERS = ("gemini", "local", "sentence-transformers")
+DEFAULT_LOCAL_DIMENSIONS = 512
+
+
+class TruncatedEmbeddings(Embeddings):
+    """
+    Matryoshka-style truncation: keeps the first `dimensions` components of every vector and
+    re-normalizes it. Documents and queries go through the same transform.
+    """
+
+    def __init__(self, embeddings: Embeddings, dimensions: int):
+        self.embeddings = embeddings
+        self.dimensions = dimensions
+
+    def _truncate(self, vectors: List[List[float]]) -> List[List[float]]:
+        if not vectors:
+            return []
+        matrix = np.asarray(vectors, dtype=np.float32)[:, :self.dimensions]
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix.tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._truncate(self.embeddings.embed_documents(texts))
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._truncate(await self.embeddings.aembed_documents(texts))
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._truncate([self.embeddings.embed_query(text)])[0]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return self._truncate([await self.embeddings.aembed_query(text)])[0]
+
+
+def embedding_model_id(config: ObsidianConfig) -> str:
+    """Identifies the full-width vectors a provider produces (and keys the embedding cache)."""
+    if config.embedding_provider == "local":
+        return f"hashing-ngram-{output_dimensions(config)}"
+    if config.embedding_provider == "sentence-transformers":
+        return config.embedding_model or DEFAULT_SENTENCE_TRANSFORMER_MODEL
+    return config.embedding_model or GEMINI_EMBEDDING_MODEL
+
+
+def output_dimensions(config: ObsidianConfig) -> Optional[int]:
+    """Width of the indexed vectors, or None for the model's native width."""
+    if config.embedding_provider == "local":
+        return config.embedding_dimensions or DEFAULT_LOCAL_DIMENSIONS
+    return config.embedding_dimensions
+
+
+def collection_name(config: ObsidianConfig) -> str:
+    """
+    Vector store collection for the configured provider and width, so switching either
+    builds a new index instead of mixing incomparable vectors.
+    """
+    if config.embedding_provider == "gemini" and not config.embedding_model and not config.embedding_dimensions:
+        return "langchain"  # Collection used before providers were configurable
+    model_id = embedding_model_id(config)
+    if config.embedding_provider != "local" and config.embedding_dimensions:
+        model_id = f"{model_id}-{config.embedding_dimensions}d"
+    slug = re.sub(r"[^a-zA-Z0-9._-]+", "-", model_id).strip("-._")
+    return f"vault-{slug}"[:63]
+
+
+def create_embeddings(config: ObsidianConfig, google_api_key: str) -> Embeddings:
+    """
+    Builds the embedding provider selected by `obsidian.embeddingProvider`, at full width.
+    Truncation to `embeddingDimensions` is applied by the caller, on top of the cache.
+    """
+    if config.embedding_provider == "local":
+        return HashingNgramEmbeddings(
+            dimensions=output_dimensions(config),
+            batch_size=config.embedding_batch_size,
+            workers=config.embedding_workers,
+        )
+    if config.embedding_provider == "sentence-transformers":
+        return SentenceTransformerEmbeddings(
+            embedding_model_id(config),
+            backend=config.embedding_backend,
+            batch_size=config.embedding_batch_size,
+            workers=config.embedding_workers,
+        )
+    if config.embedding_provider != "gemini":
+        raise ValueError(f"Unknown embedding provider '{config.embedding_provider}'. Use one of: {', '.join(EMBEDDING_PROVIDERS)}")
+    return GoogleGenerativeAIEmbeddings(
+        model=embedding_model_id(config),
+        google_api_key=google_api_key,
+        task_type="retrieval_document"
+    )
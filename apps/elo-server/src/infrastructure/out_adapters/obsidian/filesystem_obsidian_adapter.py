@@ -0,0 +1,91 @@
+import os
+import json
+import asyncio
+import logging
+from contextlib import nullcontext
+from typing import AsyncContextManager, List, Optional, Set, Tuple
+
+import httpx
+
+from src.infrastructure.config import ObsidianConfig
+from src.infrastructure.out_adapters.obsidian.index_state import NoteState
+from src.infrastructure.out_adapters.obsidian.langchain_obsidian_adapter import LangChainObsidianAdapter
+from src.infrastructure.out_adapters.obsidian.vault_files import walk_vault
+
+
+class FilesystemObsidianAdapter(LangChainObsidianAdapter):
+    """
+    Semantic search adapter that indexes the vault straight from disk.
+    Changes are detected against the (mtime, size) recorded in the index state and confirmed by
+    content hash, so Obsidian does not need to be running.
+    """
+
+    def __init__(self, obsidian_config: ObsidianConfig, google_api_key: str):
+        if not obsidian_config.vault_path:
+            raise ValueError("vault_path must be configured for the filesystem indexer")
+        self.vault_root = os.path.abspath(obsidian_config.vault_path)
+        super().__init__(obsidian_config, google_api_key)
+        self._migrate_manifest(os.path.join(obsidian_config.persist_directory, "fs-manifest.json"))
+
+    def _migrate_manifest(self, manifest_path: str) -> None:
+        """Imports the JSON manifest written by earlier versions into the index state, once."""
+        if not os.path.exists(manifest_path):
+            return
+        try:
+            with open(manifest_path, "r") as f:
+                manifest = json.load(f)
+            if not self.index_state.notes():
+                self.index_state.import_notes({
+                    path: NoteState(content_hash=entry[2], chunk_ids=None, mtime_ns=entry[0], size=entry[1], index_version=0)
+                    for path, entry in manifest.items()
+                })
+                logging.info(f"Imported {len(manifest)} notes from the vault manifest into the index state")
+            os.remove(manifest_path)
+        except Exception as e:
+            logging.warning(f"Could not migrate the vault manifest, re-scanning the vault: {e}")
+
+    def _detect_changes(self) -> Optional[Tuple[List[str], List[str]]]:
+        logging.info(f"Scanning vault for changes in {self.vault_root}...")
+        if not os.path.isdir(self.vault_root):
+            logging.error(f"Vault path not found: {self.vault_root}")
+            return None
+
+        known = self.index_state.notes()
+        changed: List[str] = []
+        seen = set()
+        for path, stat in walk_vault(self.vault_root):
+            seen.add(path)
+            state = known.get(path)
+            # Cheap check first; the content hash is compared once the file is read
+            if state and state.mtime_ns == stat.st_mtime_ns and state.size == stat.st_size:
+                continue
+            changed.append(path)
+
+        return changed, [path for path in known if path not in seen]
+
+    def _list_vault_paths(self) -> Optional[Set[str]]:
+        if not os.path.isdir(self.vault_root):
+            logging.error(f"Vault path not found: {self.vault_root}")
+            return None
+        return {path for path, _ in walk_vault(self.vault_root)}
+
+    def _fetch_note_content(self, path: str) -> Optional[str]:
+        full_path = os.path.join(self.vault_root, path)
+        try:
+            with open(full_path, "rb") as f:
+                raw = f.read()
+            stat = os.stat(full_path)
+        except OSError as e:
+            logging.error(f"Error reading {path}: {e}")
+            return None
+
+        # Recorded with the note's state once it is indexed (or found unchanged)
+        self._fetched_stats[path] = (stat.st_mtime_ns, stat.st_size)
+        return raw.decode("utf-8", errors="replace")
+
+    def _create_async_client(self, max_connections: int) -> AsyncContextManager[Optional[httpx.AsyncClient]]:
+        # Notes are read from disk; there is no Local REST API to talk to
+        return nullcontext()
+
+    async def _afetch_note_content(self, client: Optional[httpx.AsyncClient], path: str) -> Optional[str]:
+        return await asyncio.to_thread(self._fetch_note_content, path)
@@ -0,0 +1,241 @@
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from src.infrastructure.out_adapters.obsidian.markdown_chunker import frontmatter_metadata, parse_frontmatter
+from src.infrastructure.out_adapters.obsidian.text_analysis import fold
+
+RANGE_OPERATORS = {"$gt", "$gte", "$lt", "$lte"}
+NEGATED_OPERATORS = {"$ne": "$eq", "$nin": "$in", "$not_contains": "$contains"}
+
+
+def extract_properties(content: str) -> Dict[str, Any]:
+    """Every frontmatter property of a note, flattened the same way as chunk metadata."""
+    frontmatter, _ = parse_frontmatter(content)
+    return frontmatter_metadata(frontmatter)
+
+
+def modified_iso(mtime_ns: Optional[int]) -> Optional[str]:
+    """Local ISO timestamp of a file mtime, comparable with dates as strings ("2026-10-17")."""
+    if mtime_ns is None:
+        return None
+    return datetime.fromtimestamp(mtime_ns / 1e9).isoformat(timespec="seconds")
+
+
+def _index_key(value: Any) -> Any:
+    """Hash index key: strings match ignoring case and accents."""
+    return fold(value) if isinstance(value, str) else value
+
+
+def _sort_key(value: Any) -> Tuple[int, Any]:
+    """Numbers sort before strings; values of different kinds are never compared."""
+    if isinstance(value, (int, float)):
+        return (0, value)
+    return (1, fold(str(value)))
+
+
+def _items(value: Any) -> List[Any]:
+    if value is None:
+        return []
+    return list(value) if isinstance(value, list) else [value]
+
+
+class FrontmatterStore:
+    """
+    Columnar, in-memory store of note properties (frontmatter plus path, title, folder and
+    modification time), kept in step with the index note by note so structured questions are
+    answered locally instead of through Dataview queries.
+
+    Each property is a column aligned to integer row IDs. Columns get a hash index (value ->
+    rows) for equality filters and a sorted index, built on first use after a write, for range
+    filters and sorting. A list property matches a filter when any of its items does.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._rows: Dict[str, int] = {}
+            self._paths: List[str] = []
+            self._alive = bytearray()
+            self._columns: Dict[str, List[Any]] = {}
+            self._hash: Dict[str, Dict[Any, Set[int]]] = {}
+            self._sorted: Dict[str, Tuple[List[Tuple[int, Any]], List[int]]] = {}
+
+    def __len__(self) -> int:
+        return sum(self._alive)
+
+    def columns(self) -> List[str]:
+        return sorted(key for key, index in self._hash.items() if index)
+
+    # Updates
+
+    def set(self, path: str, properties: Dict[str, Any], file_modified: Optional[str] = None) -> None:
+        """Adds or replaces the properties of a note. A frontmatter `modified` is kept as is."""
+        folder, _, name = path.rpartition("/")
+        values = dict(properties, path=path, title=name.removesuffix(".md"), folder=folder, file_modified=file_modified)
+        with self._lock:
+            row = self._rows.get(path)
+            if row is None:
+                row = self._rows[path] = len(self._paths)
+                self._paths.append(path)
+                self._alive.append(0)
+                for column in self._columns.values():
+                    column.append(None)
+            self._clear_row(row)
+            self._alive[row] = 1
+            for key, value in values.items():
+                if value is None:
+                    continue
+                if key not in self._columns:
+                    self._columns[key] = [None] * len(self._paths)
+                    self._hash[key] = {}
+                self._columns[key][row] = value
+                for item in _items(value):
+                    self._hash[key].setdefault(_index_key(item), set()).add(row)
+                self._sorted.pop(key, None)
+
+    def remove(self, path: str) -> None:
+        with self._lock:
+            row = self._rows.get(path)
+            if row is not None and self._alive[row]:
+                self._clear_row(row)
+                self._alive[row] = 0
+
+    def _clear_row(self, row: int) -> None:
+        for key, column in self._columns.items():
+            value = column[row]
+            if value is None:
+                continue
+            for item in _items(value):
+                rows = self._hash[key].get(_index_key(item))
+                if rows is not None:
+                    rows.discard(row)
+                    if not rows:
+                        del self._hash[key][_index_key(item)]
+            column[row] = None
+            self._sorted.pop(key, None)
+
+    # Indexes
+
+    def _sorted_index(self, key: str) -> Tuple[List[Tuple[int, Any]], List[int]]:
+        """(sort keys, rows) of every value of a column, in ascending order."""
+        index = self._sorted.get(key)
+        if index is None:
+            entries = sorted(
+                (_sort_key(item), row)
+                for row, value in enumerate(self._columns.get(key, ()))
+                if value is not None
+                for item in _items(value)
+            )
+            index = self._sorted[key] = ([k for k, _ in entries], [row for _, row in entries])
+        return index
+
+    def _live_rows(self) -> Set[int]:
+        return {row for row, alive in enumerate(self._alive) if alive}
+
+    def _match(self, key: str, operator: str, expected: Any) -> Set[int]:
+        if operator in NEGATED_OPERATORS:
+            return self._live_rows() - self._match(key, NEGATED_OPERATORS[operator], expected)
+        if operator in ("$eq", "$contains"):
+            return set(self._hash.get(key, {}).get(_index_key(expected), ()))
+        if operator == "$in":
+            return set().union(*(self._match(key, "$eq", item) for item in _items(expected)))
+        if operator in RANGE_OPERATORS:
+            keys, rows = self._sorted_index(key)
+            bound = _sort_key(expected)
+            kind_start, kind_end = bisect_left(keys, (bound[0],)), bisect_left(keys, (bound[0] + 1,))
+            if operator == "$gt":
+                start, end = bisect_right(keys, bound), kind_end
+            elif operator == "$gte":
+                start, end = bisect_left(keys, bound), kind_end
+            elif operator == "$lt":
+                start, end = kind_start, bisect_left(keys, bound)
+            else:
+                start, end = kind_start, bisect_right(keys, bound)
+            return set(rows[start:end])
+        raise ValueError(f"Unsupported filter operator '{operator}'")
+
+    def _filter(self, filters: Optional[Dict[str, Any]]) -> Set[int]:
+        """
+        Rows matching every filter. A value matches equal values (ignoring case and accents),
+        a list matches any of its items and a dict applies operators: {"$gte": "2026-10-01"}.
+        """
+        matched = self._live_rows()
+        for key, condition in (filters or {}).items():
+            if key not in self._columns:
+                raise ValueError(f"Unknown property '{key}'. Available properties: {', '.join(self.columns())}")
+            if isinstance(condition, dict):
+                for operator, expected in condition.items():
+                    matched &= self._match(key, operator, expected)
+            elif isinstance(condition, (list, tuple, set)):
+                matched &= self._match(key, "$in", list(condition))
+            else:
+                matched &= self._match(key, "$eq", condition)
+        return matched
+
+    # Queries
+
+    def query(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        sort_by: Optional[str] = None,
+        descending: bool = False,
+        limit: int = 50,
+        fields: Optional[Iterable[str]] = None,
+        group_by: Optional[str] = None,
+        stats: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Filters notes by their properties and returns
+        {"total", "notes": [{"path", <fields>...}], "groups"?, "stats"?}.
+        Notes are ordered by `sort_by` (notes without it last) or by path. `group_by` counts the
+        matching notes per value of a property; `stats` summarizes a property (count, min, max,
+        and sum and average for numbers).
+        """
+        with self._lock:
+            matched = self._filter(filters)
+            for key in (sort_by, group_by, stats, *(fields or ())):
+                if key and key not in self._columns:
+                    raise ValueError(f"Unknown property '{key}'. Available properties: {', '.join(self.columns())}")
+
+            if sort_by:
+                _, rows = self._sorted_index(sort_by)
+                ordered = list(dict.fromkeys(row for row in rows if row in matched))
+                if descending:
+                    ordered.reverse()
+                ordered += sorted((row for row in matched if self._columns[sort_by][row] is None), key=lambda r: self._paths[r])
+            else:
+                ordered = sorted(matched, key=lambda r: self._paths[r])
+
+            shown = list(dict.fromkeys(k for k in (*(fields or ()), sort_by, group_by) if k and k != "path"))
+            result: Dict[str, Any] = {
+                "total": len(matched),
+                "notes": [
+                    {"path": self._paths[row], **{key: self._columns[key][row] for key in shown}}
+                    for row in ordered[:max(limit, 0)]
+                ],
+            }
+            if group_by:
+                groups: Dict[str, int] = {}
+                for row in matched:
+                    for item in _items(self._columns[group_by][row]) or [None]:
+                        groups[str(item)] = groups.get(str(item), 0) + 1
+                result["groups"] = dict(sorted(groups.items(), key=lambda g: (-g[1], g[0])))
+            if stats:
+                result["stats"] = self._stats(stats, matched)
+            return result
+
+    def _stats(self, key: str, rows: Set[int]) -> Dict[str, Any]:
+        values = [item for row in rows for item in _items(self._columns[key][row])]
+        summary: Dict[str, Any] = {"count": len(values)}
+        if values:
+            ordered = sorted(values, key=_sort_key)
+            summary.update(min=ordered[0], max=ordered[-1])
+            numbers = [v for v in values if isinstance(v, (int, float)) and not isinstance(v, bool)]
+            if numbers:
+                summary.update(sum=sum(numbers), avg=sum(numbers) / len(numbers))
+        return summary
@@ -0,0 +1,198 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+
+def content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def _dumps(value: Any) -> Optional[str]:
+    return json.dumps(value, ensure_ascii=False, default=str) if value is not None else None
+
+
+class NoteState(NamedTuple):
+    content_hash: Optional[str]
+    chunk_ids: Optional[List[str]]  # None when unknown (e.g. migrated from the old manifest)
+    mtime_ns: Optional[int]
+    size: Optional[int]
+    index_version: int
+    links: Optional[List[str]] = None  # Keys of the linked notes; None when not recorded yet
+    properties: Optional[Dict[str, Any]] = None  # Flattened frontmatter; None when not recorded yet
+
+
+class IndexStateStore:
+    """
+    Crash-safe record of what the semantic index holds, in SQLite next to the vector store.
+    One row per note (content hash, chunk IDs, outgoing links, frontmatter, file stat and the
+    index version that wrote it) plus per-collection metadata such as the sync checkpoint. Every note is committed in its
+    own transaction right after its chunks are written, so an interrupted sync resumes where
+    it stopped instead of re-embedding or skipping notes.
+    """
+
+    def __init__(self, db_path: str, collection: str):
+        self.db_path = db_path
+        self.collection = collection
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS notes (
+                collection TEXT NOT NULL,
+                path TEXT NOT NULL,
+                content_hash TEXT,
+                chunk_ids TEXT,
+                mtime_ns INTEGER,
+                size INTEGER,
+                index_version INTEGER NOT NULL,
+                links TEXT,
+                properties TEXT,
+                PRIMARY KEY (collection, path)
+            );
+            CREATE TABLE IF NOT EXISTS meta (
+                collection TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                PRIMARY KEY (collection, key)
+            );
+            """
+        )
+        # State files written before links and properties were tracked
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(notes)")}
+        for column in ("links", "properties"):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE notes ADD COLUMN {column} TEXT")
+        self._conn.commit()
+
+    @staticmethod
+    def _row_to_state(row: tuple) -> NoteState:
+        content_hash, chunk_ids, mtime_ns, size, index_version, links, properties = row
+        return NoteState(
+            content_hash,
+            json.loads(chunk_ids) if chunk_ids is not None else None,
+            mtime_ns,
+            size,
+            index_version,
+            json.loads(links) if links is not None else None,
+            json.loads(properties) if properties is not None else None,
+        )
+
+    # Notes
+
+    def get(self, path: str) -> Optional[NoteState]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content_hash, chunk_ids, mtime_ns, size, index_version, links, properties FROM notes WHERE collection = ? AND path = ?",
+                (self.collection, path),
+            ).fetchone()
+        return self._row_to_state(row) if row else None
+
+    def notes(self) -> Dict[str, NoteState]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path, content_hash, chunk_ids, mtime_ns, size, index_version, links, properties FROM notes WHERE collection = ?",
+                (self.collection,),
+            ).fetchall()
+        return {row[0]: self._row_to_state(row[1:]) for row in rows}
+
+    def commit_note(
+        self,
+        path: str,
+        content_hash: str,
+        chunk_ids: List[str],
+        mtime_ns: Optional[int] = None,
+        size: Optional[int] = None,
+        links: Optional[List[str]] = None,
+        properties: Optional[Dict[str, Any]] = None,
+    ) -> int:
+        """Records a note as indexed and returns the new index version."""
+        with self._lock, self._conn:
+            version = self._next_version()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO notes (collection, path, content_hash, chunk_ids, mtime_ns, size, index_version, links, properties) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    self.collection, path, content_hash, json.dumps(chunk_ids), mtime_ns, size, version,
+                    _dumps(links), _dumps(properties),
+                ),
+            )
+        return version
+
+    def set_extracted(self, path: str, links: List[str], properties: Dict[str, Any]) -> None:
+        """Records the links and properties of a note whose content did not change."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE notes SET links = ?, properties = ? WHERE collection = ? AND path = ?",
+                (_dumps(links), _dumps(properties), self.collection, path),
+            )
+
+    def touch(self, path: str, mtime_ns: int, size: int) -> None:
+        """Updates the file stat of a note whose content did not change."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE notes SET mtime_ns = ?, size = ? WHERE collection = ? AND path = ?",
+                (mtime_ns, size, self.collection, path),
+            )
+
+    def delete_notes(self, paths: Iterable[str]) -> None:
+        with self._lock, self._conn:
+            self._next_version()
+            self._conn.executemany("DELETE FROM notes WHERE collection = ? AND path = ?", [(self.collection, p) for p in paths])
+
+    def import_notes(self, notes: Dict[str, NoteState]) -> None:
+        """Bulk-loads note states in one transaction (used to migrate older state files)."""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO notes (collection, path, content_hash, chunk_ids, mtime_ns, size, index_version, links, properties) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        self.collection, path, s.content_hash, _dumps(s.chunk_ids),
+                        s.mtime_ns, s.size, s.index_version, _dumps(s.links), _dumps(s.properties),
+                    )
+                    for path, s in notes.items()
+                ],
+            )
+
+    # Collection metadata
+
+    def _next_version(self) -> int:
+        row = self._conn.execute("SELECT value FROM meta WHERE collection = ? AND key = 'index_version'", (self.collection,)).fetchone()
+        version = (json.loads(row[0]) if row else 0) + 1
+        self._conn.execute(
+            "INSERT OR REPLACE INTO meta (collection, key, value) VALUES (?, 'index_version', ?)",
+            (self.collection, json.dumps(version)),
+        )
+        return version
+
+    def get_meta(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE collection = ? AND key = ?", (self.collection, key)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set_meta(self, **values: Any) -> None:
+        """Writes the given keys in a single transaction."""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO meta (collection, key, value) VALUES (?, ?, ?)",
+                [(self.collection, key, json.dumps(value, default=str)) for key, value in values.items()],
+            )
+
+    def clear(self) -> None:
+        """Forgets every note and all metadata of the collection."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM notes WHERE collection = ?", (self.collection,))
+            self._conn.execute("DELETE FROM meta WHERE collection = ?", (self.collection,))
+        logging.info(f"Index state of '{self.collection}' cleared")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
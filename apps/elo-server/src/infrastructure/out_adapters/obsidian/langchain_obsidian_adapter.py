@@ -1,28 +1,75 @@
 import os
 import json
+import asyncio
+import hashlib
 import logging
+import threading
+import time
 import httpx
 import urllib.parse
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import aclosing
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Coroutine, Dict, List, Optional, Set, Tuple
 
 # Suppress Chroma telemetry and other noise
 os.environ["ANONYMIZED_TELEMETRY"] = "False"
 logging.getLogger("chromadb").setLevel(logging.ERROR)
 
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
-from langchain_chroma import Chroma
+from langchain_core.vectorstores import VectorStore
 from langchain_core.documents import Document
-from chromadb.config import Settings
 from src.domain.ports.obsidian_port import ObsidianPort
-from src.infrastructure.config import ObsidianConfig, update_obsidian_last_index
+from src.infrastructure.config import ObsidianConfig
+from src.infrastructure.out_adapters.obsidian.embedding_cache import CachedEmbeddings, EmbeddingCache
+from src.infrastructure.out_adapters.obsidian.embedding_providers import (
+    TruncatedEmbeddings,
+    collection_name,
+    create_embeddings,
+    embedding_model_id,
+    output_dimensions,
+)
+from src.infrastructure.out_adapters.obsidian.bm25_index import BM25Index
+from src.infrastructure.out_adapters.obsidian.frontmatter_store import FrontmatterStore, extract_properties, modified_iso
+from src.infrastructure.out_adapters.obsidian.index_state import IndexStateStore, content_hash
+from src.infrastructure.out_adapters.obsidian.link_graph import LinkGraph, extract_links
+from src.infrastructure.out_adapters.obsidian.retrieval import maximal_marginal_relevance, reciprocal_rank_scores
+from src.infrastructure.out_adapters.obsidian.search_cache import LRUCache, normalize_query
+from src.infrastructure.out_adapters.obsidian.sync_lock import SyncLock
+from src.infrastructure.out_adapters.obsidian.snippets import merge_adjacent, pack_snippets, query_terms
+from src.infrastructure.out_adapters.obsidian.markdown_chunker import MarkdownChunker
+from src.infrastructure.out_adapters.obsidian.metadata_filter import build_where
+from src.infrastructure.out_adapters.obsidian.vault_files import load_vault_schema
+from src.infrastructure.out_adapters.obsidian.vector_stores import compact_vector_store, count_entries, create_vector_store
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+_MISSING = object()
+
+def _parse_mtime_ns(value: Any) -> Optional[int]:
+    """Parses a Dataview date (ISO string or epoch milliseconds) into nanoseconds."""
+    try:
+        if isinstance(value, (int, float)):
+            return int(value * 1_000_000)
+        return int(datetime.fromisoformat(str(value)).timestamp() * 1e9)
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+def chunk_id(path: str, content: str, metadata: Optional[dict] = None) -> str:
+    """
+    Returns a deterministic ID for a chunk derived from its note path and content.
+    Metadata is part of the key so frontmatter edits rewrite the affected chunks.
+    """
+    key = f"{path}\x00{content}"
+    if metadata:
+        key += "\x00" + json.dumps(metadata, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
 
 class LangChainObsidianAdapter(ObsidianPort):
-    def __init__(self, obsidian_config: ObsidianConfig, google_api_key: str, config_path: str):
+    def __init__(self, obsidian_config: ObsidianConfig, google_api_key: str):
         self.obs_config = obsidian_config
         self.google_api_key = google_api_key
-        self.config_path = config_path
         self.persist_directory = obsidian_config.persist_directory
         
         # Initialize HTTP Client
@@ -35,45 +82,152 @@ class LangChainObsidianAdapter(ObsidianPort):
         
         self.last_sync_attempt = None
         self.sync_cooldown_seconds = 300 # 5 minutes
+        self._sync_lock = SyncLock()
+        
+        # 1. Initialize Embeddings. Remote document embeddings are served from a persistent cache at
+        # full width, then truncated to the configured dimensionality (documents and queries alike)
+        self.embedding_model = embedding_model_id(obsidian_config)
+        self.output_dimensions = output_dimensions(obsidian_config)
+        self.collection_name = collection_name(obsidian_config)
+        self.embeddings = create_embeddings(obsidian_config, google_api_key)
+        self.cached_embeddings: Optional[CachedEmbeddings] = None
+        if obsidian_config.embedding_cache_path and obsidian_config.embedding_provider != "local":
+            self.embedding_cache = EmbeddingCache(obsidian_config.embedding_cache_path)
+            self.embeddings = self.cached_embeddings = CachedEmbeddings(
+                self.embeddings,
+                self.embedding_cache,
+                model=self.embedding_model,
+                task_type="retrieval_document"
+            )
+        if obsidian_config.embedding_provider != "local" and self.output_dimensions:
+            self.embeddings = TruncatedEmbeddings(self.embeddings, self.output_dimensions)
+        
+        # Heading-aware chunker; frontmatter keys of the vault schema become chunk metadata
+        self.chunker = MarkdownChunker(chunk_size=obsidian_config.chunk_size)
+        self.vault_schema = load_vault_schema(obsidian_config.vault_path)
+        
+        # 2. Keyword index (BM25) maintained alongside the vector store for hybrid retrieval
+        self.bm25_index = BM25Index(os.path.join(self.persist_directory, "bm25.sqlite"))
+        self._search_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="vault-search")
         
-        # 1. Initialize Embeddings
-        self.embeddings = GoogleGenerativeAIEmbeddings(
-            model="models/gemini-embedding-001",
-            google_api_key=google_api_key,
-            task_type="retrieval_document"
+        # 3. Query caches. Results are keyed by index version, which moves on every committed write
+        self.index_version = 0
+        self.query_embedding_cache = LRUCache(maxsize=obsidian_config.query_cache_size)
+        self.result_cache = LRUCache(
+            maxsize=obsidian_config.result_cache_size,
+            ttl_seconds=obsidian_config.result_cache_ttl_seconds
         )
         
-        self.vector_store = self._initialize_vector_store()
+        # 4. Per-note index state, committed note by note, plus the maintenance state: tombstoned
+        # paths (hidden from search until their chunks are gone) and entries deleted since the last compaction
+        self.index_state = IndexStateStore(os.path.join(self.persist_directory, "index-state.sqlite"), self.collection_name)
+        if self.index_state.get_meta("last_index_datetime", _MISSING) is _MISSING:
+            # Checkpoint kept in elo.config.json by earlier versions
+            self.index_state.set_meta(last_index_datetime=obsidian_config.last_index_datetime)
+        self.tombstones: Set[str] = set(self.index_state.get_meta("tombstones", []))
+        self.dead_entries: int = self.index_state.get_meta("dead_entries", 0)
+        self.last_reconcile: Optional[dict] = self.index_state.get_meta("last_reconcile")
+        self.last_compaction: Optional[dict] = self.index_state.get_meta("last_compaction")
+        self._fetched_stats: Dict[str, Tuple[int, Optional[int]]] = {}  # (mtime_ns, size) of fetched notes
 
-    def _initialize_vector_store(self):
-        # 1. Load or Create Chroma
-        vector_store = None
-        if os.path.exists(self.persist_directory) and os.listdir(self.persist_directory):
-            try:
-                vector_store = Chroma(
-                    persist_directory=self.persist_directory,
-                    embedding_function=self.embeddings,
-                    client_settings=Settings(anonymized_telemetry=False)
-                )
-            except Exception as e:
-                logging.warning(f"Could not load existing ChromaDB: {e}")
-
-        if not vector_store:
-            logging.info(f"Creating new ChromaDB at {self.persist_directory}")
-            vector_store = Chroma(
-                embedding_function=self.embeddings,
-                persist_directory=self.persist_directory,
-                client_settings=Settings(anonymized_telemetry=False)
-            )
+        # Wikilink graph and note properties, loaded from the index state when the index opens
+        # and kept in step note by note
+        self.link_graph = LinkGraph()
+        self.frontmatter_store = FrontmatterStore()
 
-        # 2. Sync Index (Initial)
-        self.sync(force=True, vector_store=vector_store)
-        
+        # 5. The vector store is opened and synced by `warm_up`, off the startup path. Until the
+        # first sync completes, searches answer from whatever the persisted index already holds
+        self.vector_store: Optional[VectorStore] = None
+        self.initial_sync_completed = False
+        self._open_lock = threading.Lock()
+
+    @property
+    def warming(self) -> bool:
+        """True until a full sync has completed, be it the initial one or a later retry."""
+        return not self.initial_sync_completed
+
+    async def warm_up(self) -> None:
+        """
+        Opens the index and runs the initial full sync. Meant to run as a background task
+        started by the server, so a slow vault or embedding API never delays startup.
+        Raises if the index cannot be opened or the sync fails; a later `async_sync` retries it.
+        """
+        started = time.monotonic()
+        await asyncio.to_thread(self._open_index)
+        logging.info(f"Semantic index opened in {time.monotonic() - started:.2f}s. Running initial sync...")
+        async with self._sync_lock:
+            self.last_sync_attempt = datetime.now()
+            await self._sync_index_internal(self.vector_store)
+        self.initial_sync_completed = True
+        logging.info(f"Semantic index warm in {time.monotonic() - started:.2f}s")
+
+    def _open_index(self) -> VectorStore:
+        """Opens the vector store once; later calls return the open store."""
+        with self._open_lock:
+            if self.vector_store is None:
+                self.vector_store = self._initialize_vector_store()
+            return self.vector_store
+
+    def _initialize_vector_store(self) -> VectorStore:
+        # 1. Open the configured vector store (Chroma by default)
+        vector_store = create_vector_store(self.obs_config, self.embeddings, self.collection_name)
+
+        # 2. Keep the keyword index in step with the collection. An empty collection (new store,
+        # new embedding provider or width) needs every note; stores created before BM25 existed are backfilled
+        self._check_dimensions(vector_store)
+        if not vector_store.get(limit=1, include=[])["ids"]:
+            self.bm25_index.clear()
+            self._reset_sync_state()
+            self.tombstones = set()
+            self.dead_entries = 0
+        elif self.bm25_index.count() == 0:
+            existing = vector_store.get(include=["documents", "metadatas"])
+            logging.info(f"Backfilling keyword index with {len(existing['ids'])} chunks...")
+            self.bm25_index.add(
+                existing["ids"],
+                [m.get("path", "") for m in existing["metadatas"]],
+                existing["documents"]
+            )
+        notes = self.index_state.notes()
+        self.link_graph.load({path: state.links or [] for path, state in notes.items()})
+        self.frontmatter_store.clear()
+        for path, state in notes.items():
+            self.frontmatter_store.set(path, state.properties or {}, modified_iso(state.mtime_ns))
         return vector_store
 
-    def sync(self, force: bool = False, vector_store: Optional[Chroma] = None) -> None:
+    def _check_dimensions(self, vector_store: VectorStore) -> None:
+        """Empties the collection if its vectors do not have the configured width, forcing a rebuild."""
+        if not self.output_dimensions:
+            return
+        stored = vector_store.get(limit=1, include=["embeddings"])
+        embeddings = stored.get("embeddings")
+        if embeddings is None or len(embeddings) == 0 or len(embeddings[0]) == self.output_dimensions:
+            return
+        logging.warning(
+            f"Index vectors have {len(embeddings[0])} dimensions, expected {self.output_dimensions}. Rebuilding the index..."
+        )
+        vector_store.reset_collection()
+
+    def sync(self, force: bool = False) -> None:
+        """
+        Blocking variant of async_sync for callers without an event loop.
         """
-        Exposed sync method with cooldown to prevent hammering the API.
+        self._run_blocking(self.async_sync(force=force))
+
+    @staticmethod
+    def _run_blocking(coro: Coroutine):
+        """Runs a coroutine to completion, on a helper thread if a loop is already running."""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coro)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, coro).result()
+
+    async def async_sync(self, force: bool = False) -> None:
+        """
+        Exposed sync method with cooldown to prevent hammering the API. Raises if the sync
+        fails; a completed one ends the warm-up, even after a failed `warm_up`.
         """
         now = datetime.now()
         if not force and self.last_sync_attempt:
@@ -82,15 +236,226 @@ class LangChainObsidianAdapter(ObsidianPort):
                 logging.info(f"Skipping semantic sync (cooldown: {int(self.sync_cooldown_seconds - elapsed)}s remaining)")
                 return
 
-        self.last_sync_attempt = now
-        v_store = vector_store or self.vector_store
-        if v_store:
-            self._sync_index_internal(v_store)
+        if not self._sync_lock.try_acquire():
+            logging.info("Skipping semantic sync (another sync is in progress)")
+            return
+        try:
+            self.last_sync_attempt = now
+            vector_store = await asyncio.to_thread(self._open_index)
+            await self._sync_index_internal(vector_store)
+            self.initial_sync_completed = True
+        finally:
+            self._sync_lock.release()
+
+    async def async_sync_paths(self, changed_paths: List[str], deleted_paths: List[str]) -> None:
+        """
+        Re-indexes exactly the given notes, e.g. from filesystem events. A deleted path ending
+        in "/" removes every indexed note under that folder. Waits for a running sync to finish
+        instead of skipping the batch.
+        """
+        async with self._sync_lock:
+            deleted_paths = self._expand_folders(deleted_paths)
+            vector_store = await asyncio.to_thread(self._open_index)
+            await self._sync_index_internal(vector_store, (changed_paths, deleted_paths))
+
+    def _expand_folders(self, paths: List[str]) -> List[str]:
+        """Replaces folder paths ("Archive/") with the indexed notes under them."""
+        folders = tuple(path for path in paths if path.endswith("/"))
+        if not folders:
+            return paths
+        notes = [path for path in paths if not path.endswith("/")]
+        notes += [path for path in self.index_state.notes() if path.startswith(folders)]
+        return list(dict.fromkeys(notes))
+
+    async def _sync_index_internal(self, vector_store: VectorStore, paths: Optional[Tuple[List[str], List[str]]] = None):
+        """Syncs the given notes, or every change since the last sync. Raises if the sync fails."""
+        sync_started = datetime.now()
+        detected = paths if paths is not None else await asyncio.to_thread(self._detect_changes)
+        if detected is None:
+            raise RuntimeError("Could not list the changed vault notes")
+        changed_paths, deleted_paths = detected
+        if paths is None:
+            # Notes indexed before links and properties were recorded are read once more; their chunks are kept
+            unextracted = [
+                path for path, state in self.index_state.notes().items()
+                if state.links is None or state.properties is None
+            ]
+            changed_paths = list(dict.fromkeys(changed_paths + unextracted))
+
+        if not changed_paths and not deleted_paths:
+            logging.info("No new or modified notes found since last sync.")
+            return
+
+        logging.info(f"Syncing {len(changed_paths)} modified/new and {len(deleted_paths)} deleted files...")
+        self.vault_schema = load_vault_schema(self.obs_config.vault_path)
+        
+        written_chunks = 0
+        deleted_chunks = 0
+        
+        try:
+            # Notes are chunked and embedded as soon as they are fetched
+            async with aclosing(self._fetch_notes(changed_paths)) as notes:
+                async for path, content in notes:
+                    if content is None:
+                        continue
+                    written, deleted = await asyncio.to_thread(self._index_note, vector_store, path, content)
+                    written_chunks += written
+                    deleted_chunks += deleted
 
-    def _sync_index_internal(self, vector_store: Chroma):
+            for path in deleted_paths:
+                deleted = await asyncio.to_thread(self._remove_note, vector_store, path)
+                deleted_chunks += deleted
+                logging.info(f" Removed {path}: {deleted} chunks")
+
+            logging.info(f"Successfully synchronized {written_chunks} new chunks ({deleted_chunks} stale removed).")
+            if paths is None:
+                self._commit_sync(sync_started)
+            self._save_index_state()
+            
+        except Exception as e:
+            logging.error(f"Error updating vector store: {e}")
+            raise
+
+    def _index_note(self, vector_store: VectorStore, path: str, content: str) -> Tuple[int, int]:
+        """
+        Splits a note into chunks, upserts them and commits the note's state.
+        Returns (written, deleted) chunk counts.
+        """
+        note_hash = content_hash(content)
+        mtime_ns, size = self._fetched_stats.pop(path, (None, None))
+        previous = self.index_state.get(path)
+        if mtime_ns is None:
+            # Notes synced by path (watcher batches, reconcile) were not listed with their mtime
+            mtime_ns = self._file_mtime_ns(path)
+            if mtime_ns is None and previous:
+                mtime_ns = previous.mtime_ns
+        links = extract_links(content)
+        properties = extract_properties(content)
+        if previous and previous.content_hash == note_hash and previous.chunk_ids is not None:
+            # Already indexed, e.g. fetched again after an interrupted sync
+            if mtime_ns is not None:
+                self.index_state.touch(path, mtime_ns, size)
+            if previous.links is None or previous.properties is None:
+                self.index_state.set_extracted(path, links, properties)
+                self.link_graph.set_links(path, links)
+            self.frontmatter_store.set(path, properties, modified_iso(mtime_ns))
+            return 0, 0
+
+        # Split along headings and key every chunk by path + content + metadata
+        splits = self.chunker.split(path, content, self.vault_schema) if content.strip() else []
+        new_chunks: Dict[str, Document] = {}
+        for split in splits:
+            new_chunks.setdefault(chunk_id(path, split.page_content, split.metadata), split)
+        
+        written, deleted = self._upsert_note_chunks(vector_store, path, new_chunks, previous.chunk_ids if previous else None)
+        self.index_state.commit_note(path, note_hash, list(new_chunks), mtime_ns, size, links, properties)
+        self.link_graph.set_links(path, links)
+        self.frontmatter_store.set(path, properties, modified_iso(mtime_ns))
+        logging.info(f" Synced {path}: {len(new_chunks)} chunks ({written} written, {deleted} removed)")
+        return written, deleted
+
+    def _file_mtime_ns(self, path: str) -> Optional[int]:
+        """The note's mtime from `vault_path`, when the vault is also mounted here."""
+        if not self.obs_config.vault_path:
+            return None
+        try:
+            return os.stat(os.path.join(self.obs_config.vault_path, path)).st_mtime_ns
+        except OSError:
+            return None
+
+    def _remove_note(self, vector_store: VectorStore, path: str) -> int:
+        """Deletes a note's chunks and its state. Returns the number of deleted chunks."""
+        previous = self.index_state.get(path)
+        _, deleted = self._upsert_note_chunks(vector_store, path, {}, previous.chunk_ids if previous else None)
+        self.index_state.delete_notes([path])
+        self.link_graph.remove(path)
+        self.frontmatter_store.remove(path)
+        return deleted
+
+    async def _fetch_notes(self, paths: List[str]):
+        """
+        Fetches notes with at most `max_concurrent_requests` requests in flight over a pooled
+        async client, yielding (path, content) pairs in completion order. An unexpected error
+        in a fetch is raised to the consumer.
+        """
+        concurrency = max(1, self.obs_config.max_concurrent_requests)
+        pending_paths = iter(paths)
+        # Bounded so fetching cannot run far ahead of chunking/embedding
+        results: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+
+        async with self._create_async_client(concurrency) as client:
+            async def worker():
+                try:
+                    for path in pending_paths:
+                        await results.put((path, await self._afetch_note_content(client, path)))
+                except Exception as e:
+                    await results.put(e)
+                finally:
+                    # Always signalled, so the consumer never waits on a worker that is gone
+                    await results.put(None)
+
+            workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+            try:
+                finished = 0
+                while finished < len(workers):
+                    item = await results.get()
+                    if item is None:
+                        finished += 1
+                        continue
+                    if isinstance(item, Exception):
+                        raise item
+                    yield item
+            finally:
+                for task in workers:
+                    task.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+
+    def _create_async_client(self, max_connections: int) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            base_url=self.obs_config.url,
+            headers={"Authorization": f"Bearer {self.obs_config.api_key}"},
+            verify=False,
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        )
+
+    async def _afetch_note_content(self, client: httpx.AsyncClient, path: str) -> Optional[str]:
+        """Fetches a note over the Local REST API, retrying 429/5xx responses with exponential backoff."""
+        encoded_path = urllib.parse.quote(path)
+        max_retries = max(0, self.obs_config.max_retries)
+        for attempt in range(max_retries + 1):
+            try:
+                response = await client.get(f"/vault/{encoded_path}")
+                if response.status_code in RETRYABLE_STATUS_CODES and attempt < max_retries:
+                    await asyncio.sleep(self._retry_delay(attempt, response))
+                    continue
+                response.raise_for_status()
+                return response.text
+            except httpx.TransportError as e:
+                if attempt < max_retries:
+                    await asyncio.sleep(self._retry_delay(attempt))
+                    continue
+                logging.error(f"Error fetching content for {path}: {e}")
+                return None
+            except Exception as e:
+                logging.error(f"Error fetching content for {path}: {e}")
+                return None
+        return None
+
+    def _retry_delay(self, attempt: int, response: Optional[httpx.Response] = None) -> float:
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+        return self.obs_config.retry_backoff_seconds * (2 ** attempt)
+
+    def _detect_changes(self) -> Optional[Tuple[List[str], List[str]]]:
+        """
+        Returns the (changed, deleted) note paths since the last sync, or None if the
+        source could not be queried. Uses a DQL query against the Local REST API.
+        """
         logging.info("Checking for Obsidian notes updates via API...")
         
-        last_sync = self.obs_config.last_index_datetime
+        last_sync = self.index_state.get_meta("last_index_datetime")
         
         # Build DQL
         if last_sync and last_sync.strip():
@@ -101,7 +466,22 @@ class LangChainObsidianAdapter(ObsidianPort):
             dql = 'TABLE file.mtime WHERE file.name != ""'
             
         logging.info(f"Syncing with DQL: {dql}")
-        
+        notes = self._query_notes(dql)
+        if notes is None:
+            return None
+        for path, mtime_ns in notes:
+            if mtime_ns is not None:
+                # Recorded with the note's state, for the `file_modified` property
+                self._fetched_stats[path] = (mtime_ns, None)
+        return [path for path, _ in notes], []
+
+    def _query_paths(self, dql: str) -> Optional[List[str]]:
+        """Runs a DQL query against the Local REST API and returns the matching note paths."""
+        notes = self._query_notes(dql)
+        return [path for path, _ in notes] if notes is not None else None
+
+    def _query_notes(self, dql: str) -> Optional[List[Tuple[str, Optional[int]]]]:
+        """Runs a `TABLE file.mtime` DQL query and returns (path, mtime in ns) for the matching notes."""
         try:
             response = self.client.post(
                 "/search/",
@@ -112,80 +492,476 @@ class LangChainObsidianAdapter(ObsidianPort):
             changes = response.json()
         except Exception as e:
             logging.error(f"Failed to fetch changes from Obsidian API: {e}")
-            return
+            return None
+        return [
+            (item["filename"], _parse_mtime_ns((item.get("result") or {}).get("file.mtime")))
+            for item in changes or [] if item.get("filename")
+        ]
 
-        if not changes:
-            logging.info("No new or modified notes found since last sync.")
-            return
+    def _list_vault_paths(self) -> Optional[Set[str]]:
+        """Every note path in the vault, or None if the source could not be listed."""
+        paths = self._query_paths('TABLE file.mtime WHERE file.name != ""')
+        return set(paths) if paths is not None else None
 
-        logging.info(f"Syncing {len(changes)} modified/new files...")
-        
-        all_new_documents = []
-        text_splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
+    def _reset_sync_state(self) -> None:
+        """Forgets every indexed note and the sync checkpoint so the next sync indexes the whole vault."""
+        self.index_state.clear()
+        self.index_state.set_meta(last_index_datetime=None)
+        self.link_graph.clear()
+        self.frontmatter_store.clear()
+
+    def _commit_sync(self, sync_started: datetime) -> None:
+        """
+        Moves the sync checkpoint once all changes have been written. Notes are committed one by
+        one as they are indexed, so an interrupted sync only re-fetches notes, never re-embeds them.
+        """
+        new_timestamp = sync_started.strftime("%Y-%m-%dT%H:%M:%S")
+        self.index_state.set_meta(last_index_datetime=new_timestamp)
+        logging.info(f"Sync checkpoint moved to {new_timestamp}")
+
+    def _get_indexed_chunk_ids(self, vector_store: VectorStore, path: str) -> Set[str]:
+        """Returns the IDs of the chunks currently stored for a note."""
+        existing = vector_store.get(where={"path": path}, include=[])
+        return set(existing.get("ids", []))
+
+    def _upsert_note_chunks(self, vector_store: VectorStore, path: str, new_chunks: Dict[str, Document], known_ids: Optional[List[str]] = None) -> tuple[int, int]:
+        """
+        Makes the stored chunks of a note match `new_chunks`.
+        Stale chunks are deleted and only chunks not already stored are embedded and written.
+        `known_ids` are the chunk IDs recorded in the index state; without them the store is queried.
+        Returns the number of written and deleted chunks.
+        """
+        existing_ids = set(known_ids) if known_ids is not None else self._get_indexed_chunk_ids(vector_store, path)
         
-        for item in changes:
-            path = item.get("filename")
-            if not path: continue
+        stale_ids = [cid for cid in existing_ids if cid not in new_chunks]
+        if stale_ids:
+            vector_store.delete(ids=stale_ids)
+            self.bm25_index.delete(stale_ids)
+            self.dead_entries += len(stale_ids)
             
-            # Fetch content via API
-            content = self._fetch_note_content(path)
-            if not content:
-                continue
-                
-            # Create LangChain Document
-            doc = Document(
-                page_content=content,
-                metadata={"path": path, "source": path}
-            )
+        to_write = [cid for cid in new_chunks if cid not in existing_ids]
+        if to_write:
+            vector_store.add_documents([new_chunks[cid] for cid in to_write], ids=to_write)
+            self.bm25_index.add(to_write, [path] * len(to_write), [new_chunks[cid].page_content for cid in to_write])
+        
+        if stale_ids or to_write:
+            self._bump_index_version()
             
-            # Split and add
-            splits = text_splitter.split_documents([doc])
-            all_new_documents.extend(splits)
-            logging.info(f" Prepared {len(splits)} chunks for: {path}")
+        return len(to_write), len(stale_ids)
+
+    # Reconciliation and compaction
 
-        if all_new_documents:
+    def _save_index_state(self) -> None:
+        self.index_state.set_meta(
+            tombstones=sorted(self.tombstones),
+            dead_entries=self.dead_entries,
+            last_reconcile=self.last_reconcile,
+            last_compaction=self.last_compaction,
+        )
+
+    def _indexed_chunk_ids(self, vector_store: VectorStore, page_size: int = 5000) -> Dict[str, List[str]]:
+        """Chunk IDs in the collection, grouped by note path."""
+        by_path: Dict[str, List[str]] = {}
+        offset = 0
+        while True:
+            page = vector_store.get(limit=page_size, offset=offset, include=["metadatas"])
+            for cid, metadata in zip(page["ids"], page["metadatas"]):
+                by_path.setdefault((metadata or {}).get("path", ""), []).append(cid)
+            if len(page["ids"]) < page_size:
+                return by_path
+            offset += page_size
+
+    def _delete_chunks(self, vector_store: VectorStore, ids: List[str]) -> None:
+        vector_store.delete(ids=ids)
+        self.bm25_index.delete(ids)
+        self.dead_entries += len(ids)
+        self._bump_index_version()
+
+    def index_stats(self) -> dict:
+        """Live and dead entry counts of the collection, tombstones and the last maintenance passes."""
+        live = None
+        if self.vector_store is not None:
             try:
-                # To avoid duplicates in simple implementation, we'd delete by path first
-                # But since Chroma LC add_documents doesn't easily support 'delete by metadata' 
-                # without IDs, for now we just add. 
-                # Better: In the future, use IDs based on path.
-                
-                vector_store.add_documents(all_new_documents)
-                logging.info(f"Successfully synchronized {len(all_new_documents)} chunks.")
-                
-                # Update persistent config
-                new_timestamp = datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
-                update_obsidian_last_index(self.config_path, new_timestamp)
-                logging.info(f"Updated lastIndexDatetime to {new_timestamp}")
-                
+                live = count_entries(self.vector_store)
             except Exception as e:
-                logging.error(f"Error updating vector store: {e}")
+                logging.warning(f"Could not count index entries: {e}")
+        total = (live or 0) + self.dead_entries
+        return {
+            "collection": self.collection_name,
+            "live_entries": live,
+            "dead_entries": self.dead_entries,
+            "dead_fraction": round(self.dead_entries / total, 4) if total else 0.0,
+            "tombstones": len(self.tombstones),
+            "last_reconcile": self.last_reconcile,
+            "last_compaction": self.last_compaction,
+        }
 
-    def _fetch_note_content(self, path: str) -> Optional[str]:
-        try:
-            encoded_path = urllib.parse.quote(path)
-            response = self.client.get(f"/vault/{encoded_path}")
-            response.raise_for_status()
-            return response.text
-        except Exception as e:
-            logging.error(f"Error fetching content for {path}: {e}")
-            return None
+    async def reconcile(self) -> dict:
+        """
+        Diffs the indexed note paths against the vault listing, which catches what the
+        mtime-based sync cannot see. Notes that are gone are tombstoned, so search hides them
+        at once, and their chunks are deleted in batches. Notes missing from the index (e.g.
+        renamed ones) are indexed. Compacts the collection afterwards if it crossed the threshold.
+        """
+        vector_store = await asyncio.to_thread(self._open_index)
+        async with self._sync_lock:
+            started = time.monotonic()
+            vault_paths = await asyncio.to_thread(self._list_vault_paths)
+            if vault_paths is None:
+                raise RuntimeError("Could not list the vault notes")
+            indexed = await asyncio.to_thread(self._indexed_chunk_ids, vector_store)
+            # Notes without chunks (e.g. empty ones) are only known to the index state
+            known = set(indexed) | set(await asyncio.to_thread(self.index_state.notes))
+
+            gone = sorted((known | self.tombstones) - vault_paths)
+            unindexed = sorted(vault_paths - known)
+            self._check_removal(known, vault_paths, gone)
+            if gone:
+                self.tombstones.update(gone)
+                self._bump_index_version()
+                self._save_index_state()
+
+            stale_ids = [cid for path in gone for cid in indexed.get(path, [])]
+            batch_size = max(1, self.obs_config.reconcile_batch_size)
+            for start in range(0, len(stale_ids), batch_size):
+                await asyncio.to_thread(self._delete_chunks, vector_store, stale_ids[start:start + batch_size])
+            if gone:
+                self.index_state.delete_notes(gone)
+                for path in gone:
+                    self.link_graph.remove(path)
+                    self.frontmatter_store.remove(path)
+                self.tombstones.difference_update(gone)
+                self._bump_index_version()
+
+            if unindexed:
+                await self._sync_index_internal(vector_store, (unindexed, []))
+
+            self.last_reconcile = {
+                "finished_at": datetime.now().isoformat(timespec="seconds"),
+                "duration_seconds": round(time.monotonic() - started, 3),
+                "vault_notes": len(vault_paths),
+                "indexed_notes": len(indexed),
+                "removed_notes": len(gone),
+                "removed_chunks": len(stale_ids),
+                "added_notes": len(unindexed),
+            }
+            self._save_index_state()
+            logging.info(f"Index reconciliation: {self.last_reconcile}")
+
+            if self._needs_compaction():
+                await asyncio.to_thread(self._compact, vector_store)
+            return self.index_stats()
+
+    def _check_removal(self, known: Set[str], vault_paths: Set[str], gone: List[str]) -> None:
+        """
+        Refuses a reconciliation that would empty the index or remove more than the configured
+        share of it, which is what a bad listing looks like: Dataview answers `[]` while Obsidian
+        is still indexing, and an unmounted vault walks as empty.
+        """
+        if not known:
+            return
+        if not vault_paths:
+            raise RuntimeError(f"The vault listing is empty but {len(known)} notes are indexed; keeping the index")
+        max_fraction = self.obs_config.reconcile_max_removed_fraction
+        if len(gone) / len(known) > max_fraction:
+            raise RuntimeError(
+                f"Reconciliation would remove {len(gone)} of {len(known)} indexed notes "
+                f"(more than reconcileMaxRemovedFraction={max_fraction}); keeping the index"
+            )
+
+    async def compact(self, force: bool = False) -> dict:
+        """Rebuilds the collection without its dead entries, if they crossed the threshold (or `force`)."""
+        vector_store = await asyncio.to_thread(self._open_index)
+        async with self._sync_lock:
+            if force or self._needs_compaction():
+                await asyncio.to_thread(self._compact, vector_store)
+            return self.index_stats()
+
+    def _needs_compaction(self) -> bool:
+        stats = self.index_stats()
+        return self.dead_entries > 0 and stats["dead_fraction"] >= self.obs_config.compaction_threshold
+
+    def _compact(self, vector_store: VectorStore) -> None:
+        started = time.monotonic()
+        dead_entries = self.dead_entries
+        logging.info(f"Compacting index ({dead_entries} dead entries)...")
+        compact_vector_store(vector_store, batch_size=max(1, self.obs_config.reconcile_batch_size))
+        self.dead_entries = 0
+        self.last_compaction = {
+            "finished_at": datetime.now().isoformat(timespec="seconds"),
+            "duration_seconds": round(time.monotonic() - started, 3),
+            "dead_entries_removed": dead_entries,
+            "live_entries": count_entries(vector_store),
+        }
+        self._save_index_state()
+        self._bump_index_version()
+        logging.info(f"Index compaction: {self.last_compaction}")
 
     def query(self, question: str) -> str:
         return "Query method is deprecated. Use semantic search tool instead."
 
-    def search(self, query: str, k: int = 5) -> List[dict]:
-        """Performs a semantic similarity search and returns raw document snippets."""
+    def _bump_index_version(self) -> None:
+        """Invalidates cached search results after the index changed."""
+        self.index_version += 1
+        self.result_cache.clear()
+
+    def _embed_query(self, query: str) -> List[float]:
+        key = normalize_query(query)
+        embedding = self.query_embedding_cache.get(key)
+        if embedding is None:
+            embedding = self.embeddings.embed_query(query)
+            self.query_embedding_cache.put(key, embedding)
+        return embedding
+
+    async def _aembed_query(self, query: str) -> List[float]:
+        key = normalize_query(query)
+        embedding = self.query_embedding_cache.get(key)
+        if embedding is None:
+            embedding = await self.embeddings.aembed_query(query)
+            self.query_embedding_cache.put(key, embedding)
+        return embedding
+
+    def stats(self) -> dict:
+        """Cache counters and index version, exposed for tuning."""
+        stats = {
+            "index_version": self.index_version,
+            "query_embedding_cache": self.query_embedding_cache.stats(),
+            "result_cache": self.result_cache.stats(),
+        }
+        if self.cached_embeddings:
+            stats["document_embedding_cache"] = {"hits": self.cached_embeddings.hits, "misses": self.cached_embeddings.misses}
+        return stats
+
+    def search(self, query: str, k: int = 5, filters: Optional[Dict[str, Any]] = None, hops: int = 0) -> List[dict]:
+        """
+        Hybrid search: runs vector similarity and BM25 keyword retrieval concurrently and merges
+        both rankings with reciprocal rank fusion, then diversifies the top results and packs
+        them into `search_token_budget` tokens with the matching words highlighted.
+        Frontmatter `filters` are pushed down into the vector store query; keyword retrieval
+        only scores the chunks that pass them. With `hops`, notes linked to or from the top hits
+        (up to that many links away) are added after them, scored down by `graph_decay` per hop.
+        Returns nothing while the index is still opening.
+        """
+        where = build_where(filters, self.vault_schema)
+        if self.vector_store is None:
+            return []
+        cache_key = self._search_cache_key(query, k, where, hops)
+        cached = self.result_cache.get(cache_key)
+        if cached is not None:
+            return [dict(r) for r in cached]
+        
+        fetch_k = max(k * 4, 20)
         try:
-            docs = self.vector_store.similarity_search(query, k=k)
-            return [
-                {
-                    "content": d.page_content, 
-                    "path": d.metadata.get("path", "unknown"),
-                    "source": d.metadata.get("source", "unknown")
-                } 
-                for d in docs
-            ]
+            allowed_ids = self._allowed_ids(where)
+            if allowed_ids is not None and not allowed_ids:
+                self.result_cache.put(cache_key, [])
+                return []
+
+            vector_future = self._search_executor.submit(
+                lambda: self._vector_search(self._embed_query(query), fetch_k, where)
+            )
+            keyword_future = self._search_executor.submit(self._keyword_search, query, fetch_k, allowed_ids)
+            results = self._rank(query, vector_future.result(), keyword_future.result(), k, hops, where)
+            self.result_cache.put(cache_key, results)
+            return [dict(r) for r in results]
+        except Exception as e:
+            logging.error(f"Error performing semantic search: {e}")
+            return []
+
+    async def asearch(self, query: str, k: int = 5, filters: Optional[Dict[str, Any]] = None, hops: int = 0) -> List[dict]:
+        """
+        Async variant of `search` that never blocks the event loop: the query is embedded with
+        the async client and Chroma/BM25 run on the dedicated search thread pool.
+        """
+        where = build_where(filters, self.vault_schema)
+        if self.vector_store is None:
+            return []
+        cache_key = self._search_cache_key(query, k, where, hops)
+        cached = self.result_cache.get(cache_key)
+        if cached is not None:
+            return [dict(r) for r in cached]
+
+        loop = asyncio.get_running_loop()
+        fetch_k = max(k * 4, 20)
+        try:
+            allowed_ids = await loop.run_in_executor(self._search_executor, self._allowed_ids, where)
+            if allowed_ids is not None and not allowed_ids:
+                self.result_cache.put(cache_key, [])
+                return []
+
+            # Keyword retrieval runs while the query is being embedded
+            keyword_future = loop.run_in_executor(self._search_executor, self._keyword_search, query, fetch_k, allowed_ids)
+            embedding = await self._aembed_query(query)
+            vector_docs = await loop.run_in_executor(self._search_executor, self._vector_search, embedding, fetch_k, where)
+            keyword_hits = await keyword_future
+            results = await loop.run_in_executor(self._search_executor, self._rank, query, vector_docs, keyword_hits, k, hops, where)
+            self.result_cache.put(cache_key, results)
+            return [dict(r) for r in results]
         except Exception as e:
             logging.error(f"Error performing semantic search: {e}")
             return []
+
+    def _search_cache_key(self, query: str, k: int, where: Optional[dict], hops: int = 0) -> tuple:
+        return (normalize_query(query), k, json.dumps(where, sort_keys=True, default=str), hops, self.index_version)
+
+    def _allowed_ids(self, where: Optional[dict]) -> Optional[Set[str]]:
+        """IDs of the chunks that pass the filters, or None when the search is unfiltered."""
+        if not where:
+            return None
+        return set(self.vector_store.get(where=where, include=[])["ids"])
+
+    def _vector_search(self, embedding: List[float], fetch_k: int, where: Optional[dict]) -> List[Document]:
+        return self.vector_store.similarity_search_by_vector(embedding, k=fetch_k, filter=where)
+
+    def _keyword_search(self, query: str, fetch_k: int, allowed_ids: Optional[Set[str]]) -> List[dict]:
+        try:
+            return self.bm25_index.search(query, fetch_k, allowed_ids)
+        except Exception as e:
+            logging.warning(f"Keyword search failed, using vector results only: {e}")
+            return []
+
+    def _rank(
+        self,
+        query: str,
+        vector_docs: List[Document],
+        keyword_hits: List[dict],
+        k: int,
+        hops: int = 0,
+        where: Optional[dict] = None,
+    ) -> List[dict]:
+        """
+        Merges the vector and keyword rankings with reciprocal rank fusion (leaving out tombstoned
+        notes), picks `k` diverse chunks with maximal marginal relevance over their stored vectors,
+        joins adjacent chunks of the same note, adds linked notes when `hops` is set and packs
+        the snippets into the token budget.
+        """
+        candidates: Dict[str, dict] = {}
+        vector_ranking = []
+        for d in vector_docs:
+            if d.metadata.get("path") in self.tombstones:
+                continue
+            cid = d.id or chunk_id(d.metadata.get("path", ""), d.page_content)
+            vector_ranking.append(cid)
+            candidates[cid] = {
+                "content": d.page_content,
+                "path": d.metadata.get("path", "unknown"),
+                "source": d.metadata.get("source", "unknown")
+            }
+
+        keyword_ranking = []
+        for hit in keyword_hits:
+            if hit["path"] in self.tombstones:
+                continue
+            keyword_ranking.append(hit["id"])
+            candidates.setdefault(hit["id"], {"content": hit["content"], "path": hit["path"], "source": hit["path"]})
+
+        scores = reciprocal_rank_scores([vector_ranking, keyword_ranking])
+        ranked = sorted(scores, key=lambda cid: scores[cid], reverse=True)
+        vectors = self._load_candidate_vectors(ranked, candidates)
+        picked = maximal_marginal_relevance([scores[cid] for cid in ranked], vectors, k, self.obs_config.mmr_lambda)
+        results = merge_adjacent([candidates[ranked[i]] for i in picked])
+        if hops > 0:
+            seeds: Dict[str, float] = {}
+            for i in picked:
+                path = candidates[ranked[i]]["path"]
+                seeds[path] = max(seeds.get(path, 0.0), scores[ranked[i]])
+            results += self._linked_results(seeds, hops, k, where)
+        return pack_snippets(results, query_terms(query), self.obs_config.search_token_budget)
+
+    def _linked_results(self, seeds: Dict[str, float], hops: int, k: int, where: Optional[dict]) -> List[dict]:
+        """
+        Up to `k` notes linked to or from the seed notes, best decayed score first, each
+        represented by its first chunk that passes the filters.
+        """
+        expanded = self.link_graph.expand(seeds, hops, self.obs_config.graph_decay)
+        ranked = sorted((p for p in expanded if p not in self.tombstones), key=lambda p: expanded[p][0], reverse=True)
+        linked = []
+        for path in ranked:
+            if len(linked) >= k:
+                break
+            note_filter = {"$and": [where, {"path": path}]} if where else {"path": path}
+            stored = self.vector_store.get(where=note_filter, include=["documents", "metadatas"])
+            if not stored["ids"]:
+                continue
+            first = min(range(len(stored["ids"])), key=lambda i: (stored["metadatas"][i] or {}).get("chunk_index", 0))
+            linked.append({
+                "content": stored["documents"][first],
+                "path": path,
+                "source": (stored["metadatas"][first] or {}).get("source", path),
+                "linked_from": expanded[path][1],
+            })
+        return linked
+
+    def text_search(self, query: str, k: int = 10) -> List[dict]:
+        """
+        Full-text search over the keyword index that ignores accents and casing and matches
+        unfinished words and single typos. Returns the best snippet of each matching note,
+        with the matched words highlighted, packed into the search token budget.
+        """
+        try:
+            tombstones = set(self.tombstones)
+            # Over-fetch so that hiding tombstoned notes still leaves `k` of them
+            hits = [hit for hit in self.bm25_index.text_search(query, k + len(tombstones)) if hit["path"] not in tombstones][:k]
+        except Exception as e:
+            logging.error(f"Error performing text search: {e}")
+            return []
+        terms = {term for hit in hits for term in hit["terms"]}
+        packed = pack_snippets(hits, terms, self.obs_config.search_token_budget)
+        for snippet, hit in zip(packed, hits):
+            snippet["matched"] = f"{hit['matched']}/{hit['words']}"
+        return packed
+
+    def query_notes(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        sort_by: Optional[str] = None,
+        descending: bool = False,
+        limit: int = 50,
+        fields: Optional[List[str]] = None,
+        group_by: Optional[str] = None,
+        stats: Optional[str] = None,
+    ) -> dict:
+        """
+        Structured query over the properties of the indexed notes, answered from the local
+        frontmatter store (see `FrontmatterStore.query`). Raises ValueError for unknown properties.
+        """
+        return self.frontmatter_store.query(filters, sort_by, descending, limit, fields, group_by, stats)
+
+    def related_notes(self, note: str, hops: int = 1, direction: str = "both", limit: int = 50) -> Optional[List[dict]]:
+        """
+        Notes within `hops` links of `note` (a path, note name or link target), nearest first,
+        answered from the link graph. Returns None when the note is not in the index.
+        """
+        path = self.link_graph.resolve(note)
+        if path is None:
+            return None
+        return [{"path": p, "distance": d} for p, d in self.link_graph.neighbors(path, hops, direction)[:limit]]
+
+    def _load_candidate_vectors(self, ids: List[str], candidates: Dict[str, dict]) -> np.ndarray:
+        """
+        L2-normalized stored vectors of the candidates, one row each (zeros when missing).
+        Also fills in the chunk position and heading used to merge adjacent chunks.
+        """
+        try:
+            stored = self.vector_store.get(ids=ids, include=["embeddings", "metadatas"])
+        except Exception as e:
+            logging.warning(f"Could not load candidate vectors, ranking by relevance only: {e}")
+            return np.zeros((len(ids), 1), dtype=np.float32)
+
+        embeddings = stored.get("embeddings")
+        metadatas = stored.get("metadatas") or [None] * len(stored["ids"])
+        found = {}
+        for i, cid in enumerate(stored["ids"]):
+            metadata = metadatas[i] or {}
+            candidates[cid]["chunk_index"] = metadata.get("chunk_index")
+            candidates[cid]["heading"] = metadata.get("heading")
+            if embeddings is not None and embeddings[i] is not None:
+                found[cid] = np.asarray(embeddings[i], dtype=np.float32)
+
+        width = len(next(iter(found.values()))) if found else 1
+        vectors = np.zeros((len(ids), width), dtype=np.float32)
+        for row, cid in enumerate(ids):
+            if cid in found:
+                norm = np.linalg.norm(found[cid])
+                vectors[row] = found[cid] / norm if norm > 0 else 0
+        return vectors
@@ -0,0 +1,209 @@
+import re
+import threading
+import urllib.parse
+from array import array
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from src.infrastructure.out_adapters.obsidian.text_analysis import fold
+
+# [[Target]], [[Target|alias]], [[Target#Heading]], [[Target^block]] and ![[embeds]]
+_WIKILINK_RE = re.compile(r"!?\[\[([^\]\|#\^]+)(?:[\|#\^][^\]]*)?\]\]")
+# [text](Other%20Note.md) style links to notes
+_MARKDOWN_LINK_RE = re.compile(r"\]\(([^)\s]+\.md)(?:#[^)]*)?\)")
+_ATTACHMENT_RE = re.compile(r"\.(png|jpe?g|gif|svg|webp|bmp|pdf|mp3|mp4|m4a|wav|webm|mov|canvas|excalidraw)$", re.IGNORECASE)
+
+DIRECTIONS = ("out", "in", "both")
+
+
+def link_key(target: str) -> str:
+    """Normalized key of a link target or note path ("People/Ana.md" -> "people/ana")."""
+    return fold(target.strip().removesuffix(".md").strip("/"))
+
+
+def note_keys(path: str) -> Tuple[str, ...]:
+    """Keys a note can be linked by: its full path and its name."""
+    full = link_key(path)
+    name = full.rsplit("/", 1)[-1]
+    return (full,) if name == full else (full, name)
+
+
+def extract_links(content: str) -> List[str]:
+    """Keys of the notes linked from `content` (wikilinks, embeds and Markdown links), in order."""
+    targets = [m.group(1) for m in _WIKILINK_RE.finditer(content)]
+    targets += [
+        urllib.parse.unquote(m.group(1)) for m in _MARKDOWN_LINK_RE.finditer(content)
+        if "://" not in m.group(1)
+    ]
+    keys = (link_key(t) for t in targets if t.strip() and not _ATTACHMENT_RE.search(t.strip()))
+    return list(dict.fromkeys(k for k in keys if k))
+
+
+class LinkGraph:
+    """
+    In-memory graph of the links between notes, updated note by note as the index syncs.
+    Paths are interned to integer IDs and adjacency is kept in per-note `array('i')` lists
+    (outgoing and incoming), so neighbourhood queries are plain array walks.
+
+    Links are stored by target key and resolved the way Obsidian does: by path, or by note
+    name (preferring the shortest path when several notes share a name). A link to a note
+    that does not exist yet starts resolving as soon as that note is indexed.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._ids: Dict[str, int] = {}
+            self._paths: List[str] = []
+            self._alive = bytearray()
+            self._targets: List[Tuple[str, ...]] = []
+            self._out: List[array] = []
+            self._in: List[array] = []
+            self._by_key: Dict[str, Set[int]] = {}
+            self._referrers: Dict[str, Set[int]] = {}  # Target key -> notes linking to it
+
+    def __len__(self) -> int:
+        return sum(self._alive)
+
+    def __contains__(self, path: str) -> bool:
+        node = self._ids.get(path)
+        return node is not None and bool(self._alive[node])
+
+    # Updates
+
+    def load(self, links: Dict[str, Iterable[str]]) -> None:
+        """Replaces the graph with the given note -> link keys mapping."""
+        with self._lock:
+            self.clear()
+            nodes = [self._add(path, keys) for path, keys in links.items()]
+            for node in nodes:
+                self._rewire(node)
+
+    def set_links(self, path: str, keys: Iterable[str]) -> None:
+        """Adds or updates a note and its outgoing links."""
+        with self._lock:
+            is_new = path not in self
+            node = self._add(path, keys)
+            if is_new:
+                self._rewire_referrers(path)
+            self._rewire(node)
+
+    def remove(self, path: str) -> None:
+        with self._lock:
+            node = self._ids.get(path)
+            if node is None or not self._alive[node]:
+                return
+            self._set_targets(node, ())
+            self._rewire(node)
+            self._alive[node] = 0
+            for key in note_keys(path):
+                self._by_key.get(key, set()).discard(node)
+            self._rewire_referrers(path)
+
+    def _intern(self, path: str) -> int:
+        node = self._ids.get(path)
+        if node is None:
+            node = self._ids[path] = len(self._paths)
+            self._paths.append(path)
+            self._alive.append(0)
+            self._targets.append(())
+            self._out.append(array("i"))
+            self._in.append(array("i"))
+        return node
+
+    def _add(self, path: str, keys: Iterable[str]) -> int:
+        node = self._intern(path)
+        self._set_targets(node, tuple(dict.fromkeys(keys)))
+        if not self._alive[node]:
+            self._alive[node] = 1
+            for key in note_keys(path):
+                self._by_key.setdefault(key, set()).add(node)
+        return node
+
+    def _set_targets(self, node: int, keys: Tuple[str, ...]) -> None:
+        for key in self._targets[node]:
+            self._referrers.get(key, set()).discard(node)
+        self._targets[node] = keys
+        for key in keys:
+            self._referrers.setdefault(key, set()).add(node)
+
+    def _resolve_key(self, key: str) -> Optional[int]:
+        candidates = self._by_key.get(key)
+        if not candidates:
+            return None
+        return min(candidates, key=lambda node: (len(self._paths[node]), self._paths[node]))
+
+    def _rewire(self, node: int) -> None:
+        """Re-resolves the outgoing links of a note and updates the incoming lists of their targets."""
+        resolved = (self._resolve_key(key) for key in self._targets[node])
+        out = array("i", sorted({target for target in resolved if target is not None and target != node}))
+        for target in self._out[node]:
+            self._in[target].remove(node)
+        for target in out:
+            self._in[target].append(node)
+        self._out[node] = out
+
+    def _rewire_referrers(self, path: str) -> None:
+        """Re-resolves the links that may point to `path` after it was added or removed."""
+        for key in note_keys(path):
+            for node in list(self._referrers.get(key, ())):
+                self._rewire(node)
+
+    # Queries
+
+    def resolve(self, name: str) -> Optional[str]:
+        """Path of the note a link target, note name or path refers to, if it is in the graph."""
+        if name in self:
+            return name
+        with self._lock:
+            node = self._resolve_key(link_key(name))
+            return self._paths[node] if node is not None else None
+
+    def _adjacent(self, node: int, direction: str) -> Iterable[int]:
+        if direction == "out":
+            return self._out[node]
+        if direction == "in":
+            return self._in[node]
+        return (*self._out[node], *self._in[node])
+
+    def neighbors(self, path: str, hops: int = 1, direction: str = "both") -> List[Tuple[str, int]]:
+        """
+        Notes within `hops` links of `path`, as (path, distance) sorted by distance.
+        `direction` is "out" (notes it links to), "in" (backlinks) or "both".
+        """
+        if direction not in DIRECTIONS:
+            raise ValueError(f"direction must be one of {', '.join(DIRECTIONS)}")
+        with self._lock:
+            start = self._ids.get(path)
+            if start is None or not self._alive[start]:
+                return []
+            distances = {start: 0}
+            frontier = [start]
+            for distance in range(1, hops + 1):
+                next_frontier = []
+                for node in frontier:
+                    for neighbor in self._adjacent(node, direction):
+                        if neighbor not in distances:
+                            distances[neighbor] = distance
+                            next_frontier.append(neighbor)
+                frontier = next_frontier
+            del distances[start]
+            return sorted(((self._paths[n], d) for n, d in distances.items()), key=lambda item: (item[1], item[0]))
+
+    def expand(self, seeds: Dict[str, float], hops: int, decay: float) -> Dict[str, Tuple[float, str]]:
+        """
+        Spreads the scores of `seeds` to the notes within `hops` links (in both directions),
+        multiplied by `decay` per hop. Returns {path: (score, seed it was reached from)} for the
+        reached notes that are not seeds themselves, keeping the best score of each.
+        """
+        expanded: Dict[str, Tuple[float, str]] = {}
+        for seed, score in seeds.items():
+            for path, distance in self.neighbors(seed, hops):
+                if path in seeds:
+                    continue
+                decayed = score * decay ** distance
+                if path not in expanded or decayed > expanded[path][0]:
+                    expanded[path] = (decayed, seed)
+        return expanded
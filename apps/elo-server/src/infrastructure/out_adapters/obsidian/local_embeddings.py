@@ -0,0 +1,112 @@
+import asyncio
+import importlib.util
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Tuple
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from src.infrastructure.out_adapters.obsidian.text_analysis import tokenize
+
+
+class _PooledEmbeddings(Embeddings):
+    """Runs the (CPU-bound) sync embedding methods on a worker pool for the async API."""
+
+    def __init__(self, workers: int):
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="local-embeddings")
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self.embed_documents, texts)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self.embed_query, text)
+
+
+class HashingNgramEmbeddings(_PooledEmbeddings):
+    """
+    Offline embeddings from hashed character n-grams and words of the accent-folded text
+    (the "hashing trick"). No model and no network: vectors are deterministic, L2-normalized
+    and cheap enough to compute per query. Captures spelling similarity, not meaning.
+    """
+
+    def __init__(self, dimensions: int = 512, ngram_range: Tuple[int, int] = (3, 5), batch_size: int = 64, workers: int = 2):
+        super().__init__(workers)
+        self.dimensions = dimensions
+        self.ngram_range = ngram_range
+        self.batch_size = batch_size
+        self._feature = lru_cache(maxsize=200_000)(self._hash_feature)
+
+    def _hash_feature(self, feature: str) -> Tuple[int, float]:
+        h = zlib.crc32(feature.encode("utf-8"))
+        return h % self.dimensions, 1.0 if h & 0x80000000 else -1.0
+
+    def _features(self, text: str) -> List[str]:
+        low, high = self.ngram_range
+        features = []
+        for word in tokenize(text):
+            features.append(word)
+            padded = f" {word} "
+            for n in range(low, high + 1):
+                features.extend(padded[i:i + n] for i in range(len(padded) - n + 1))
+        return features
+
+    def _embed_batch(self, texts: List[str]) -> np.ndarray:
+        rows, columns, signs = [], [], []
+        for row, text in enumerate(texts):
+            for feature in self._features(text):
+                column, sign = self._feature(feature)
+                rows.append(row)
+                columns.append(column)
+                signs.append(sign)
+
+        matrix = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        np.add.at(matrix, (np.asarray(rows, dtype=np.intp), np.asarray(columns, dtype=np.intp)), np.asarray(signs, dtype=np.float32))
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        vectors: List[List[float]] = []
+        for start in range(0, len(texts), self.batch_size):
+            vectors.extend(self._embed_batch(texts[start:start + self.batch_size]).tolist())
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed_batch([text])[0].tolist()
+
+
+class SentenceTransformerEmbeddings(_PooledEmbeddings):
+    """
+    CPU embeddings from a local sentence-transformers model (optional dependency).
+    `backend` can be "torch" or "onnx"; inputs are encoded in batches of `batch_size`.
+    """
+
+    def __init__(self, model_name: str, backend: str = "torch", batch_size: int = 64, workers: int = 1):
+        # Only check that the package exists: importing it pulls in torch, which is deferred to first use
+        if importlib.util.find_spec("sentence_transformers") is None:
+            raise ImportError("The 'sentence-transformers' embedding provider requires `pip install sentence-transformers`")
+        # A single worker by default: the model already uses every core for a batch
+        super().__init__(workers)
+        self.model_name = model_name
+        self.backend = backend
+        self.batch_size = batch_size
+        self._model = None
+        self._load_lock = threading.Lock()
+
+    @property
+    def model(self):
+        """Loads the model on first use, so building the provider does not delay startup."""
+        with self._load_lock:
+            if self._model is None:
+                from sentence_transformers import SentenceTransformer
+                self._model = SentenceTransformer(self.model_name, device="cpu", backend=self.backend)
+            return self._model
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.model.encode(texts, batch_size=self.batch_size, normalize_embeddings=True, convert_to_numpy=True).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
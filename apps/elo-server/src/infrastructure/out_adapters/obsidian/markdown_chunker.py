@@ -0,0 +1,195 @@
+import re
+import json
+import logging
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import yaml
+from langchain_core.documents import Document
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+_FRONTMATTER_RE = re.compile(r"^---\s*\n(.*?)\n---\s*(?:\n|$)", re.DOTALL)
+_HEADING_RE = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$")
+_FENCE_RE = re.compile(r"^\s*(```|~~~)")
+_WIKILINK_RE = re.compile(r"^\[\[([^\]|#]+)(?:[#|][^\]]*)?\]\]$")
+
+# Metadata keys set by the indexer; frontmatter keys with these names are not copied
+RESERVED_METADATA_KEYS = {"path", "source", "title", "folder", "heading", "chunk_index"}
+
+
+def parse_frontmatter(content: str) -> Tuple[Dict[str, Any], str]:
+    """Splits a note into its YAML frontmatter (as a dict) and its body."""
+    match = _FRONTMATTER_RE.match(content)
+    if not match:
+        return {}, content
+    try:
+        data = yaml.safe_load(match.group(1)) or {}
+    except yaml.YAMLError as e:
+        logging.warning(f"Invalid frontmatter, indexing it as text: {e}")
+        return {}, content
+    if not isinstance(data, dict):
+        return {}, content
+    return data, content[match.end():]
+
+
+def metadata_value(value: Any) -> Optional[Any]:
+    """Converts a frontmatter value to a vector-store friendly scalar ("[[Madrid]]" -> "Madrid")."""
+    if value is None:
+        return None
+    if isinstance(value, bool) or isinstance(value, (int, float)):
+        return value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False, default=str)
+    text = str(value).strip()
+    link = _WIKILINK_RE.match(text)
+    return link.group(1).strip() if link else text
+
+
+def frontmatter_metadata(frontmatter: Dict[str, Any], schema: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Flattens frontmatter into chunk metadata. Only keys of the vault schema are kept when
+    one is available. Lists become lists of strings so they can be filtered with $contains.
+    """
+    metadata: Dict[str, Any] = {}
+    for key, value in frontmatter.items():
+        key = str(key)
+        if key in RESERVED_METADATA_KEYS or (schema and key not in schema):
+            continue
+        if isinstance(value, (list, tuple, set)):
+            items = [str(v) for v in (metadata_value(v) for v in value) if v not in (None, "")]
+            if items:
+                metadata[key] = items
+        else:
+            scalar = metadata_value(value)
+            if scalar not in (None, ""):
+                metadata[key] = scalar
+    return metadata
+
+
+class MarkdownChunker:
+    """
+    Splits notes along their heading hierarchy instead of at fixed character offsets.
+    Each chunk is prefixed with the note title and heading path for context, small related
+    sections are packed together up to `chunk_size`, and oversized sections are split on
+    paragraph boundaries without overlap.
+    """
+
+    def __init__(self, chunk_size: int = 1500):
+        self.chunk_size = chunk_size
+        self._fallback_splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=0)
+
+    def split(self, path: str, content: str, schema: Optional[Dict[str, Any]] = None) -> List[Document]:
+        frontmatter, body = parse_frontmatter(content)
+        title = path.rsplit("/", 1)[-1].removesuffix(".md")
+        folder = path.rsplit("/", 1)[0] if "/" in path else ""
+        base_metadata = {"path": path, "source": path, "title": title, "folder": folder}
+        base_metadata.update(frontmatter_metadata(frontmatter, schema))
+
+        sections = self._pack(self._sections(body))
+        properties = self._properties_line(frontmatter, schema)
+        if properties:
+            first_heading = sections[0][0] if sections else []
+            sections = [(first_heading, f"{properties}\n\n{sections[0][1]}" if sections else properties)] + sections[1:]
+
+        documents = []
+        for headings, text in sections:
+            for piece in self._fit(text):
+                context = " > ".join([title] + headings)
+                metadata = dict(base_metadata, heading=" > ".join(headings), chunk_index=len(documents))
+                documents.append(Document(page_content=f"{context}\n\n{piece}", metadata=metadata))
+        return documents
+
+    def _sections(self, body: str) -> List[Tuple[List[str], str]]:
+        """
+        Returns (heading path, text) for every section, ignoring headings inside code fences.
+        Headings without text of their own are carried into the next section.
+        """
+        sections: List[Tuple[List[str], str]] = []
+        stack: List[Tuple[int, str]] = []
+        current: List[str] = []
+        carried: List[str] = []
+        in_fence = False
+
+        def flush():
+            lines = carried + current
+            carried.clear()
+            if len([l for l in current if l.strip()]) == 1 and _HEADING_RE.match(current[0]):
+                carried.extend(lines)
+                return
+            text = "\n".join(lines).strip()
+            if text:
+                sections.append(([h for _, h in stack], text))
+
+        for line in body.splitlines():
+            if _FENCE_RE.match(line):
+                in_fence = not in_fence
+            heading = None if in_fence else _HEADING_RE.match(line)
+            if heading:
+                flush()
+                current = [line]
+                level = len(heading.group(1))
+                while stack and stack[-1][0] >= level:
+                    stack.pop()
+                stack.append((level, heading.group(2)))
+            else:
+                current.append(line)
+        flush()
+        if carried:
+            sections.append(([h for _, h in stack], "\n".join(carried).strip()))
+        return sections
+
+    def _pack(self, sections: List[Tuple[List[str], str]]) -> List[Tuple[List[str], str]]:
+        """
+        Short notes become a single chunk. Otherwise consecutive small sections are merged
+        while they fit in one chunk and share at least their top-level heading.
+        """
+        whole = "\n\n".join(text for _, text in sections)
+        if sections and len(whole) <= self.chunk_size:
+            return [([], whole)]
+
+        packed: List[Tuple[List[str], str]] = []
+        for headings, text in sections:
+            if packed and len(packed[-1][1]) + len(text) + 2 <= self.chunk_size:
+                prev_headings, prev_text = packed[-1]
+                common = []
+                for a, b in zip(prev_headings, headings):
+                    if a != b:
+                        break
+                    common.append(a)
+                if common or (not prev_headings and not headings):
+                    packed[-1] = (common, f"{prev_text}\n\n{text}")
+                    continue
+            packed.append((headings, text))
+        return packed
+
+    def _fit(self, text: str) -> List[str]:
+        """Splits a section that exceeds the chunk size on paragraph boundaries."""
+        if len(text) <= self.chunk_size:
+            return [text]
+        pieces: List[str] = []
+        current = ""
+        for paragraph in re.split(r"\n\s*\n", text):
+            if len(paragraph) > self.chunk_size:
+                if current:
+                    pieces.append(current)
+                    current = ""
+                pieces.extend(self._fallback_splitter.split_text(paragraph))
+            elif current and len(current) + len(paragraph) + 2 > self.chunk_size:
+                pieces.append(current)
+                current = paragraph
+            else:
+                current = f"{current}\n\n{paragraph}" if current else paragraph
+        if current:
+            pieces.append(current)
+        return pieces
+
+    @staticmethod
+    def _properties_line(frontmatter: Dict[str, Any], schema: Optional[Dict[str, Any]]) -> str:
+        """Renders the frontmatter as one line of text so its values are searchable too."""
+        parts = []
+        for key, value in frontmatter_metadata(frontmatter, schema).items():
+            rendered = ", ".join(value) if isinstance(value, list) else str(value)
+            parts.append(f"{key}: {rendered}")
+        return "; ".join(parts)
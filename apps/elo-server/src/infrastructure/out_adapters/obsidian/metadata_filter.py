@@ -0,0 +1,100 @@
+from typing import Any, Dict, List, Optional
+
+from src.infrastructure.out_adapters.obsidian.markdown_chunker import metadata_value
+
+# Chunk metadata set by the indexer that can always be filtered on
+BUILTIN_FILTER_KEYS = {"path", "title", "folder"}
+
+# Obsidian property types stored as lists of strings in the chunk metadata
+LIST_PROPERTY_TYPES = {"multitext", "tags", "aliases"}
+
+
+def _condition(key: str, value: Any, property_type: Optional[str]) -> Dict[str, Any]:
+    value = metadata_value(value)
+    if property_type in LIST_PROPERTY_TYPES:
+        return {key: {"$contains": str(value)}}
+    if property_type is None and key not in BUILTIN_FILTER_KEYS and isinstance(value, str):
+        # Unknown type: the property may hold a single value or a list of them
+        return {"$or": [{key: {"$eq": value}}, {key: {"$contains": value}}]}
+    return {key: {"$eq": value}}
+
+
+def build_where(filters: Optional[Dict[str, Any]], schema: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+    """
+    Translates simple frontmatter filters into a vector store `where` clause.
+    {"Oficios": "Ebanista", "folder": "Personas"} matches chunks whose list property `Oficios`
+    contains "Ebanista" and that live in the `Personas` folder. A list value matches any of
+    its items, and a dict value is passed through as raw operators ({"$gte": 3}).
+    Raises ValueError for keys that are neither built-in nor part of the vault schema.
+    """
+    if not filters:
+        return None
+
+    schema = schema or {}
+    conditions: List[Dict[str, Any]] = []
+    for key, value in filters.items():
+        if key not in BUILTIN_FILTER_KEYS and schema and key not in schema:
+            allowed = ", ".join(sorted(BUILTIN_FILTER_KEYS | set(schema)))
+            raise ValueError(f"Unknown filter key '{key}'. Available keys: {allowed}")
+
+        property_type = schema.get(key)
+        if isinstance(value, dict):
+            conditions.append({key: value})
+        elif isinstance(value, (list, tuple, set)):
+            options = [_condition(key, item, property_type) for item in value]
+            if options:
+                conditions.append(options[0] if len(options) == 1 else {"$or": options})
+        else:
+            conditions.append(_condition(key, value, property_type))
+
+    if not conditions:
+        return None
+    return conditions[0] if len(conditions) == 1 else {"$and": conditions}
+
+
+def _compare(actual: Any, operator: str, expected: Any) -> bool:
+    if operator == "$eq":
+        return actual == expected
+    if operator == "$ne":
+        return actual != expected
+    if operator == "$in":
+        return actual in expected
+    if operator == "$nin":
+        return actual not in expected
+    if operator == "$contains":
+        return isinstance(actual, list) and expected in actual
+    if operator == "$not_contains":
+        return not (isinstance(actual, list) and expected in actual)
+    if actual is None or isinstance(actual, (list, dict)):
+        return False
+    try:
+        if operator == "$gt":
+            return actual > expected
+        if operator == "$gte":
+            return actual >= expected
+        if operator == "$lt":
+            return actual < expected
+        if operator == "$lte":
+            return actual <= expected
+    except TypeError:
+        return False
+    raise ValueError(f"Unsupported filter operator '{operator}'")
+
+
+def matches_where(metadata: Dict[str, Any], where: Optional[Dict[str, Any]]) -> bool:
+    """Evaluates a Chroma-style `where` clause against one metadata dict, for stores without a query engine."""
+    if not where:
+        return True
+    for key, condition in where.items():
+        if key == "$and":
+            if not all(matches_where(metadata, clause) for clause in condition):
+                return False
+        elif key == "$or":
+            if not any(matches_where(metadata, clause) for clause in condition):
+                return False
+        elif isinstance(condition, dict):
+            if not all(_compare(metadata.get(key), op, value) for op, value in condition.items()):
+                return False
+        elif metadata.get(key) != condition:
+            return False
+    return True
@@ -0,0 +1,477 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+from src.infrastructure.out_adapters.obsidian.metadata_filter import matches_where
+
+try:
+    import hnswlib
+except ImportError:  # pragma: no cover - exercised only when hnswlib is missing
+    hnswlib = None
+
+VECTOR_DTYPES = {"int8": np.int8, "float16": np.float16}
+VECTOR_INDEXES = ("flat", "hnsw")
+
+# Rows scored per step of the exact search; small blocks keep the float32 copy in cache
+_BLOCK_ROWS = 4096
+
+
+class NumpyVectorStore(VectorStore):
+    """
+    Compact single-process vector store. Normalized vectors live in a memory-mapped file,
+    quantized to int8 (with a per-vector scale) or stored as float16, and ids, documents and
+    metadata live in a SQLite sidecar. Search is an exact, vectorized dot product; an optional
+    HNSW index (hnswlib) serves unfiltered queries on large vaults.
+    Implements the subset of Chroma's `get`/`where` API the indexer relies on.
+    """
+
+    def __init__(self, directory: str, embedding_function: Optional[Embeddings] = None, dtype: str = "int8", index: str = "flat", hnsw_save_interval_seconds: float = 60):
+        if dtype not in VECTOR_DTYPES:
+            raise ValueError(f"Unknown vector dtype '{dtype}'. Use one of: {', '.join(VECTOR_DTYPES)}")
+        if index not in VECTOR_INDEXES:
+            raise ValueError(f"Unknown vector index '{index}'. Use one of: {', '.join(VECTOR_INDEXES)}")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.embedding_function = embedding_function
+        self.dtype = dtype
+        self.index_type = index
+        if index == "hnsw" and hnswlib is None:
+            logging.warning("hnswlib is not installed; using exact search. Install it with `pip install hnswlib`")
+            self.index_type = "flat"
+        self.hnsw_save_interval_seconds = hnsw_save_interval_seconds
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(os.path.join(directory, "rows.sqlite"), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS rows (
+                slot INTEGER PRIMARY KEY,
+                id TEXT UNIQUE NOT NULL,
+                path TEXT,
+                document TEXT,
+                metadata TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS rows_path ON rows(path);
+            """
+        )
+        self._conn.commit()
+
+        self.dim: Optional[int] = None
+        self._capacity = 0
+        self._count = 0  # High-water mark of used slots
+        self._generation = 0
+        self._vectors: Optional[np.memmap] = None
+        self._scales: Optional[np.memmap] = None
+        self._alive: Optional[np.memmap] = None
+        self._alive_count = 0
+        self._metadata_cache: Optional[Dict[int, dict]] = None
+        self._hnsw = None
+        self._hnsw_dirty = False
+        self._hnsw_saved_at = 0.0
+
+        meta = self._load_meta()
+        if meta and meta.get("dtype") != dtype:
+            logging.warning(f"Vector store at {directory} uses {meta.get('dtype')}, not {dtype}; rebuilding it")
+            self._reset()
+        elif meta:
+            self.dim = meta["dim"]
+            self._capacity = meta["capacity"]
+            self._count = meta["count"]
+            self._generation = meta["generation"]
+            self._open_arrays()
+            self._alive_count = int(np.count_nonzero(self._alive[:self._count]))
+
+    @property
+    def embeddings(self) -> Optional[Embeddings]:
+        return self.embedding_function
+
+    # Storage
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _load_meta(self) -> Optional[dict]:
+        try:
+            with open(self._path("store.json"), "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logging.warning(f"Could not read vector store metadata, rebuilding it: {e}")
+            self._reset()
+            return None
+
+    def _save_meta(self) -> None:
+        meta = {"dtype": self.dtype, "dim": self.dim, "capacity": self._capacity, "count": self._count, "generation": self._generation}
+        tmp_path = self._path("store.json.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, self._path("store.json"))
+
+    def _reset(self) -> None:
+        for name in ("store.json", "vectors.bin", "scales.bin", "alive.bin", "index.hnsw", "hnsw.json"):
+            if os.path.exists(self._path(name)):
+                os.remove(self._path(name))
+        with self._conn:
+            self._conn.execute("DELETE FROM rows")
+
+    def reset_collection(self) -> None:
+        """Removes every vector (same name as langchain_chroma.Chroma.reset_collection)."""
+        with self._lock:
+            self._vectors = self._scales = self._alive = None
+            self._reset()
+            self.dim = None
+            self._capacity = self._count = self._alive_count = 0
+            self._generation += 1
+            self._metadata_cache = None
+            self._hnsw = None
+            self._hnsw_dirty = False
+
+    def compact(self) -> int:
+        """
+        Moves the live rows to the front of the files and shrinks them to fit, dropping the space
+        held by deleted rows; the HNSW graph is rebuilt on the next query. Returns the slots reclaimed.
+        """
+        with self._lock:
+            if self._alive is None:
+                return 0
+            alive = np.flatnonzero(self._alive[:self._count])
+            if not len(alive):
+                reclaimed = self._capacity
+                self.reset_collection()
+                return reclaimed
+
+            # Rows only ever move down, and each block is read before it is written
+            for start in range(0, len(alive), _BLOCK_ROWS):
+                block = alive[start:start + _BLOCK_ROWS]
+                target = np.arange(start, start + len(block))
+                self._vectors[target] = self._vectors[block]
+                if self._scales is not None:
+                    self._scales[target] = self._scales[block]
+            with self._conn:
+                # Through negative slots, so the primary key stays unique while rows are renumbered
+                self._conn.executemany("UPDATE rows SET slot = ? WHERE slot = ?", [(-i - 1, int(slot)) for i, slot in enumerate(alive)])
+                self._conn.execute("UPDATE rows SET slot = -slot - 1 WHERE slot < 0")
+
+            reclaimed = self._capacity - len(alive)
+            self._flush_arrays()
+            self._vectors = self._scales = self._alive = None
+            self._capacity = self._count = self._alive_count = len(alive)
+            for name, dtype, shape in self._array_files():
+                with open(self._path(name), "r+b") as f:
+                    f.truncate(int(np.prod(shape)) * np.dtype(dtype).itemsize)
+            self._open_arrays()
+            self._alive[:] = 1
+
+            for name in ("index.hnsw", "hnsw.json"):
+                if os.path.exists(self._path(name)):
+                    os.remove(self._path(name))
+            self._hnsw = None
+            self._hnsw_dirty = False
+            self._metadata_cache = None
+            self._commit()
+        return reclaimed
+
+    def count(self) -> int:
+        """Number of live vectors."""
+        return self._alive_count
+
+    def _array_files(self) -> List[Tuple[str, Any, tuple]]:
+        files = [("vectors.bin", VECTOR_DTYPES[self.dtype], (self._capacity, self.dim)), ("alive.bin", np.uint8, (self._capacity,))]
+        if self.dtype == "int8":
+            files.append(("scales.bin", np.float32, (self._capacity,)))
+        return files
+
+    def _open_arrays(self) -> None:
+        arrays = {}
+        for name, dtype, shape in self._array_files():
+            arrays[name] = np.memmap(self._path(name), dtype=dtype, mode="r+", shape=shape)
+        self._vectors = arrays["vectors.bin"]
+        self._alive = arrays["alive.bin"]
+        self._scales = arrays.get("scales.bin")
+
+    def _grow(self, min_capacity: int) -> None:
+        self._flush_arrays()
+        self._vectors = self._scales = self._alive = None
+        self._capacity = max(1024, self._capacity * 2, min_capacity)
+        for name, dtype, shape in self._array_files():
+            # Extends the file with zeros; existing rows keep their offsets
+            with open(self._path(name), "ab") as f:
+                f.truncate(int(np.prod(shape)) * np.dtype(dtype).itemsize)
+        self._open_arrays()
+        if self._hnsw is not None:
+            self._hnsw.resize_index(self._capacity)
+
+    def _flush_arrays(self) -> None:
+        for array in (self._vectors, self._scales, self._alive):
+            if array is not None:
+                array.flush()
+
+    def _commit(self) -> None:
+        self._generation += 1
+        self._flush_arrays()
+        self._save_meta()
+        self._maybe_save_hnsw()
+
+    def _store_vectors(self, slots: np.ndarray, vectors: np.ndarray) -> None:
+        if self.dtype == "int8":
+            scales = np.abs(vectors).max(axis=1) / 127.0
+            scales[scales == 0] = 1.0
+            self._scales[slots] = scales
+            self._vectors[slots] = np.rint(vectors / scales[:, None]).astype(np.int8)
+        else:
+            self._vectors[slots] = vectors.astype(np.float16)
+
+    def _load_vectors(self, slots) -> np.ndarray:
+        vectors = np.asarray(self._vectors[slots], dtype=np.float32)
+        if self.dtype == "int8":
+            vectors *= self._scales[slots][:, None]
+        return vectors
+
+    # Writes
+
+    def add_embeddings(self, ids: Sequence[str], embeddings: Sequence[Sequence[float]], documents: Sequence[str], metadatas: Sequence[dict]) -> List[str]:
+        """Stores pre-computed embeddings; existing ids are overwritten in place."""
+        if not ids:
+            return []
+        # Keep the last occurrence of duplicated ids
+        rows = {cid: (vector, document, metadata or {}) for cid, vector, document, metadata in zip(ids, embeddings, documents, metadatas)}
+        ids = list(rows)
+        vectors = np.asarray([rows[cid][0] for cid in ids], dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        np.divide(vectors, norms, out=vectors, where=norms > 0)
+
+        with self._lock:
+            if self.dim is None:
+                self.dim = vectors.shape[1]
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(f"Embedding dimension {vectors.shape[1]} does not match the store ({self.dim})")
+
+            existing = dict(self._select("SELECT id, slot FROM rows WHERE id IN ({})", ids))
+            new_ids = [cid for cid in ids if cid not in existing]
+            free = np.flatnonzero(self._alive[:self._count] == 0) if self._alive is not None else np.array([], dtype=np.int64)
+            reused = [int(s) for s in free[:len(new_ids)]]
+            appended = list(range(self._count, self._count + len(new_ids) - len(reused)))
+            if self._count + len(appended) > self._capacity:
+                self._grow(self._count + len(appended))
+            for cid, slot in zip(new_ids, reused + appended):
+                existing[cid] = slot
+            slots = np.asarray([existing[cid] for cid in ids], dtype=np.int64)
+
+            self._store_vectors(slots, vectors)
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO rows (slot, id, path, document, metadata) VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (int(slot), cid, rows[cid][2].get("path"), rows[cid][1], json.dumps(rows[cid][2], ensure_ascii=False, default=str))
+                        for cid, slot in zip(ids, slots)
+                    ],
+                )
+            self._alive_count += int(np.count_nonzero(self._alive[slots] == 0))
+            self._alive[slots] = 1
+            self._count = max(self._count, int(slots.max()) + 1)
+            if self._metadata_cache is not None:
+                for cid, slot in zip(ids, slots):
+                    self._metadata_cache[int(slot)] = rows[cid][2]
+            if self._hnsw is not None:
+                self._hnsw.add_items(vectors, slots)
+                self._hnsw_dirty = True
+            self._commit()
+        return ids
+
+    def add_texts(self, texts: Iterable[str], metadatas: Optional[List[dict]] = None, ids: Optional[List[str]] = None, **kwargs: Any) -> List[str]:
+        texts = list(texts)
+        if self.embedding_function is None:
+            raise ValueError("An embedding function is required to add texts")
+        ids = list(ids) if ids else [str(uuid.uuid4()) for _ in texts]
+        metadatas = metadatas or [{} for _ in texts]
+        return self.add_embeddings(ids, self.embedding_function.embed_documents(texts), texts, metadatas)
+
+    def delete(self, ids: Optional[List[str]] = None, **kwargs: Any) -> Optional[bool]:
+        if not ids:
+            return True
+        with self._lock:
+            slots = [slot for _, slot in self._select("SELECT id, slot FROM rows WHERE id IN ({})", list(ids))]
+            if not slots:
+                return True
+            with self._conn:
+                self._conn.executemany("DELETE FROM rows WHERE slot = ?", [(s,) for s in slots])
+            self._alive[slots] = 0
+            self._alive_count -= len(slots)
+            for slot in slots:
+                if self._metadata_cache is not None:
+                    self._metadata_cache.pop(slot, None)
+                if self._hnsw is not None:
+                    self._hnsw.mark_deleted(slot)
+                    self._hnsw_dirty = True
+            self._commit()
+        return True
+
+    # Reads
+
+    def _select(self, sql: str, values: Sequence[Any]) -> List[tuple]:
+        """Runs `sql` with an `IN ({})` placeholder over `values`, in batches."""
+        rows: List[tuple] = []
+        values = list(values)
+        for start in range(0, len(values), 500):
+            batch = values[start:start + 500]
+            rows.extend(self._conn.execute(sql.format(",".join("?" for _ in batch)), batch).fetchall())
+        return rows
+
+    def _matching_slots(self, where: Dict[str, Any]) -> List[int]:
+        path = where.get("path") if len(where) == 1 else None
+        if isinstance(path, dict) and set(path) == {"$eq"}:
+            path = path["$eq"]
+        if isinstance(path, str):
+            return [slot for (slot,) in self._conn.execute("SELECT slot FROM rows WHERE path = ? ORDER BY slot", (path,))]
+
+        if self._metadata_cache is None:
+            # Parsed once, then kept in step with writes
+            self._metadata_cache = {slot: json.loads(metadata) for slot, metadata in self._conn.execute("SELECT slot, metadata FROM rows")}
+        return sorted(slot for slot, metadata in self._metadata_cache.items() if matches_where(metadata, where))
+
+    def get(self, ids: Optional[Sequence[str]] = None, where: Optional[Dict[str, Any]] = None, limit: Optional[int] = None, offset: Optional[int] = None, include: Sequence[str] = ("metadatas", "documents"), **kwargs: Any) -> Dict[str, Any]:
+        """Chroma-compatible `get`: returns ids plus the requested documents, metadatas and embeddings."""
+        with self._lock:
+            if ids is not None:
+                rows = self._select("SELECT slot, id, document, metadata FROM rows WHERE id IN ({}) ORDER BY slot", list(ids))
+            elif where:
+                rows = self._select("SELECT slot, id, document, metadata FROM rows WHERE slot IN ({}) ORDER BY slot", self._matching_slots(where))
+            else:
+                rows = self._conn.execute("SELECT slot, id, document, metadata FROM rows ORDER BY slot").fetchall()
+        if where and ids is not None:
+            rows = [row for row in rows if matches_where(json.loads(row[3]), where)]
+        rows = rows[offset or 0:][:limit] if limit is not None else rows[offset or 0:]
+        embeddings = None
+        if "embeddings" in include:
+            with self._lock:
+                embeddings = self._load_vectors(np.asarray([row[0] for row in rows], dtype=np.int64)) if rows else []
+        return {
+            "ids": [row[1] for row in rows],
+            "documents": [row[2] for row in rows] if "documents" in include else None,
+            "metadatas": [json.loads(row[3]) for row in rows] if "metadatas" in include else None,
+            "embeddings": embeddings,
+            "included": list(include),
+        }
+
+    def _score_slots(self, slots: np.ndarray, query: np.ndarray) -> np.ndarray:
+        scores = np.empty(len(slots), dtype=np.float32)
+        for start in range(0, len(slots), _BLOCK_ROWS):
+            block = slots[start:start + _BLOCK_ROWS]
+            scores[start:start + len(block)] = self._load_vectors(block) @ query
+        return scores
+
+    def _score_all(self, query: np.ndarray) -> np.ndarray:
+        scores = np.empty(self._count, dtype=np.float32)
+        for start in range(0, self._count, _BLOCK_ROWS):
+            end = min(start + _BLOCK_ROWS, self._count)
+            block = np.asarray(self._vectors[start:end], dtype=np.float32) @ query
+            if self.dtype == "int8":
+                block *= self._scales[start:end]
+            scores[start:end] = block
+        scores[self._alive[:self._count] == 0] = -np.inf
+        return scores
+
+    def _ensure_hnsw(self) -> None:
+        if self._hnsw is not None:
+            return
+        index = hnswlib.Index(space="ip", dim=self.dim)
+        saved_generation = None
+        try:
+            with open(self._path("hnsw.json"), "r") as f:
+                saved_generation = json.load(f).get("generation")
+        except (FileNotFoundError, ValueError):
+            pass
+        if saved_generation == self._generation and os.path.exists(self._path("index.hnsw")):
+            index.load_index(self._path("index.hnsw"), max_elements=self._capacity)
+        else:
+            logging.info(f"Building HNSW index over {self._alive_count} vectors...")
+            index.init_index(max_elements=self._capacity, ef_construction=200, M=16)
+            alive = np.flatnonzero(self._alive[:self._count])
+            for start in range(0, len(alive), _BLOCK_ROWS):
+                block = alive[start:start + _BLOCK_ROWS]
+                index.add_items(self._load_vectors(block), block)
+            self._hnsw_dirty = True
+        index.set_ef(64)
+        self._hnsw = index
+        self._maybe_save_hnsw(force=True)
+
+    def _maybe_save_hnsw(self, force: bool = False) -> None:
+        """Persists the HNSW graph at most every `hnsw_save_interval_seconds`; a stale graph is rebuilt on open."""
+        if self._hnsw is None or not self._hnsw_dirty:
+            return
+        if not force and time.monotonic() - self._hnsw_saved_at < self.hnsw_save_interval_seconds:
+            return
+        self._hnsw.save_index(self._path("index.hnsw"))
+        with open(self._path("hnsw.json"), "w") as f:
+            json.dump({"generation": self._generation}, f)
+        self._hnsw_dirty = False
+        self._hnsw_saved_at = time.monotonic()
+
+    def similarity_search_by_vector_with_score(self, embedding: List[float], k: int = 4, filter: Optional[Dict[str, Any]] = None) -> List[Tuple[Document, float]]:
+        query = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm:
+            query = query / norm
+
+        with self._lock:
+            if not self._alive_count or k <= 0:
+                return []
+            if filter:
+                slots = np.asarray(self._matching_slots(filter), dtype=np.int64)
+                scores = self._score_slots(slots, query)
+            elif self.index_type == "hnsw" and self._alive_count > k:
+                self._ensure_hnsw()
+                labels, distances = self._hnsw.knn_query(query, k=k)
+                slots, scores = labels[0].astype(np.int64), 1.0 - distances[0]
+            else:
+                slots = np.arange(self._count)
+                scores = self._score_all(query)
+
+            if len(slots) > k:
+                top = np.argpartition(-scores, k)[:k]
+                slots, scores = slots[top], scores[top]
+            order = np.argsort(-scores)
+            ranked = [(int(slots[i]), float(scores[i])) for i in order if np.isfinite(scores[i])]
+            rows = {slot: (cid, document, metadata) for slot, cid, document, metadata in self._select(
+                "SELECT slot, id, document, metadata FROM rows WHERE slot IN ({})", [slot for slot, _ in ranked]
+            )}
+
+        return [
+            (Document(id=rows[slot][0], page_content=rows[slot][1], metadata=json.loads(rows[slot][2])), score)
+            for slot, score in ranked if slot in rows
+        ]
+
+    def similarity_search_by_vector(self, embedding: List[float], k: int = 4, filter: Optional[Dict[str, Any]] = None, **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_by_vector_with_score(embedding, k=k, filter=filter)]
+
+    def similarity_search(self, query: str, k: int = 4, filter: Optional[Dict[str, Any]] = None, **kwargs: Any) -> List[Document]:
+        return self.similarity_search_by_vector(self.embedding_function.embed_query(query), k=k, filter=filter)
+
+    def similarity_search_with_score(self, query: str, k: int = 4, filter: Optional[Dict[str, Any]] = None, **kwargs: Any) -> List[Tuple[Document, float]]:
+        return self.similarity_search_by_vector_with_score(self.embedding_function.embed_query(query), k=k, filter=filter)
+
+    @classmethod
+    def from_texts(cls, texts: List[str], embedding: Embeddings, metadatas: Optional[List[dict]] = None, ids: Optional[List[str]] = None, directory: Optional[str] = None, **kwargs: Any) -> "NumpyVectorStore":
+        if not directory:
+            raise ValueError("NumpyVectorStore.from_texts requires a `directory`")
+        store = cls(directory, embedding_function=embedding, **kwargs)
+        store.add_texts(texts, metadatas=metadatas, ids=ids)
+        return store
+
+    def close(self) -> None:
+        with self._lock:
+            self._maybe_save_hnsw(force=True)
+            self._flush_arrays()
+            self._conn.close()
@@ -0,0 +1,42 @@
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+
+def reciprocal_rank_scores(rankings: Sequence[Sequence[str]], k: int = 60) -> Dict[str, float]:
+    """
+    Reciprocal rank fusion scores: score(id) = sum(1 / (k + rank)) over the rankings.
+    Items found by several retrievers rise to the top without having to calibrate their scores.
+    """
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, item_id in enumerate(ranking, start=1):
+            scores[item_id] = scores.get(item_id, 0.0) + 1.0 / (k + rank)
+    return scores
+
+
+def maximal_marginal_relevance(relevance: Sequence[float], vectors: np.ndarray, k: int, lambda_mult: float = 0.7) -> List[int]:
+    """
+    Greedy maximal marginal relevance. Picks, one at a time, the candidate maximizing
+    lambda * relevance - (1 - lambda) * (max similarity to the already picked ones), so
+    near-duplicate chunks do not crowd out other results. `vectors` are L2-normalized rows
+    (zero rows for candidates without a vector); relevance is rescaled to [0, 1].
+    Returns the indices of the picked candidates, in pick order.
+    """
+    n = len(relevance)
+    if n == 0 or k <= 0:
+        return []
+    rel = np.asarray(relevance, dtype=np.float32)
+    if rel.max() > 0:
+        rel = rel / rel.max()
+    similarity = vectors @ vectors.T
+    max_similarity = np.zeros(n, dtype=np.float32)
+    available = np.ones(n, dtype=bool)
+    picked: List[int] = []
+    for _ in range(min(k, n)):
+        scores = np.where(available, lambda_mult * rel - (1 - lambda_mult) * max_similarity, -np.inf)
+        best = int(np.argmax(scores))
+        picked.append(best)
+        available[best] = False
+        max_similarity = np.maximum(max_similarity, similarity[best])
+    return picked
@@ -0,0 +1,136 @@
+import re
+from typing import Dict, List, Sequence, Set, Tuple
+
+from src.infrastructure.out_adapters.obsidian.text_analysis import fold, tokenize
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+# Words too common to be worth highlighting
+_STOPWORDS = {
+    "que", "los", "las", "del", "con", "por", "para", "una", "uno", "unos", "unas", "como", "sus", "son", "est",
+    "the", "and", "for", "with", "are", "was", "this", "that", "from", "what", "who",
+}
+
+# Smallest useful snippet; a result that cannot get this many tokens is dropped
+MIN_SNIPPET_TOKENS = 40
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about 4 characters per token), good enough for budgeting."""
+    return (len(text) + 3) // 4
+
+
+def query_terms(query: str) -> Set[str]:
+    """Folded query words worth highlighting."""
+    return {t for t in tokenize(query) if len(t) > 2 and t not in _STOPWORDS}
+
+
+def match_spans(text: str, terms: Set[str]) -> List[Tuple[int, int]]:
+    """Character spans of the words of `text` matching `terms`, ignoring case and accents."""
+    if not terms:
+        return []
+    return [m.span() for m in _WORD_RE.finditer(text) if fold(m.group()) in terms]
+
+
+def highlight(text: str, spans: Sequence[Tuple[int, int]]) -> str:
+    """Wraps the given spans in Markdown bold markers."""
+    parts, last = [], 0
+    for start, end in spans:
+        parts.append(text[last:start])
+        parts.append(f"**{text[start:end]}**")
+        last = end
+    parts.append(text[last:])
+    return "".join(parts)
+
+
+def trim_around_matches(text: str, spans: Sequence[Tuple[int, int]], max_chars: int) -> Tuple[str, List[Tuple[int, int]]]:
+    """
+    Cuts `text` to at most `max_chars`, keeping the context line (title and headings) and a
+    window of the body centered on the first match. Returns the snippet and its match spans.
+    """
+    if len(text) <= max_chars:
+        return text, list(spans)
+    context, sep, body = text.partition("\n\n")
+    offset = len(context) + len(sep)
+    if not sep or len(context) + 2 >= max_chars:
+        context, sep, body, offset = "", "", text, 0
+    room = max_chars - len(context) - len(sep) - 2  # Two ellipses
+    body_spans = [(s - offset, e - offset) for s, e in spans if s >= offset]
+    center = body_spans[0][0] if body_spans else 0
+    start = max(0, min(center - room // 3, len(body) - room))
+    end = min(len(body), start + room)
+    # Snap to word boundaries
+    if start > 0:
+        space = body.find(" ", start)
+        start = space + 1 if 0 <= space < start + 20 else start
+    if end < len(body):
+        space = body.rfind(" ", start, end)
+        end = space if space > start else end
+    window = ("…" if start > 0 else "") + body[start:end] + ("…" if end < len(body) else "")
+    shift = len(context) + len(sep) + (1 if start > 0 else 0) - start
+    kept = [(s + shift, e + shift) for s, e in body_spans if s >= start and e <= end]
+    if context:
+        kept = [(s, e) for s, e in spans if e <= len(context)] + kept
+    return context + sep + window, kept
+
+
+def _join(chunks: List[dict]) -> dict:
+    joined = dict(chunks[0])
+    for previous, chunk in zip(chunks, chunks[1:]):
+        _, sep, body = chunk["content"].partition("\n\n")
+        # The context line only repeats what is already there when the heading did not change
+        same_heading = sep and chunk.get("heading") == previous.get("heading")
+        joined["content"] += "\n\n" + (body if same_heading else chunk["content"])
+    return joined
+
+
+def merge_adjacent(results: List[dict]) -> List[dict]:
+    """
+    Joins results that are consecutive chunks of the same note (by `chunk_index`) into one,
+    in chunk order, placed at the rank of its best chunk.
+    """
+    runs: List[List[int]] = []  # Positions in `results`, in chunk order
+    run_of: Dict[int, int] = {}
+    previous = None
+    for path, index, position in sorted(
+        (r["path"], r["chunk_index"], position) for position, r in enumerate(results) if r.get("chunk_index") is not None
+    ):
+        if previous != (path, index - 1):
+            runs.append([])
+        runs[-1].append(position)
+        run_of[position] = len(runs) - 1
+        previous = (path, index)
+
+    merged, emitted = [], set()
+    for position, result in enumerate(results):
+        run = run_of.get(position)
+        if run is None:
+            merged.append(dict(result))
+        elif run not in emitted:
+            emitted.add(run)
+            merged.append(_join([results[p] for p in runs[run]]))
+    return merged
+
+
+def pack_snippets(results: List[dict], terms: Set[str], token_budget: int) -> List[dict]:
+    """
+    Fits the results, in order, into `token_budget` tokens. A result that would take more than
+    its share of what is left is cut to a window around its matches; once the budget is spent
+    the rest are dropped. Matching words are highlighted in every snippet.
+    """
+    packed = []
+    remaining = token_budget
+    for position, result in enumerate(results):
+        if remaining < MIN_SNIPPET_TOKENS:
+            break
+        spans = match_spans(result["content"], terms)
+        text = result["content"]
+        share = min(remaining, max(MIN_SNIPPET_TOKENS, remaining // (len(results) - position)))
+        if estimate_tokens(text) > share:
+            text, spans = trim_around_matches(text, spans, share * 4)
+        snippet = highlight(text, spans)
+        remaining -= estimate_tokens(snippet)
+        packed.append({"content": snippet, "path": result["path"], "source": result.get("source", result["path"])})
+        if "linked_from" in result:
+            packed[-1]["linked_from"] = result["linked_from"]
+    return packed
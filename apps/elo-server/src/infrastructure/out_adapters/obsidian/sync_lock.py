@@ -0,0 +1,78 @@
+import asyncio
+import threading
+from collections import deque
+from typing import Deque, Tuple
+
+
+class SyncLock:
+    """
+    Lock serializing index writers, shared by coroutines on any event loop: the server's, or
+    the helper loop of a blocking `sync()`. Waiters are parked on a future of their own loop
+    and get the lock in arrival order, so a steady stream of watcher batches cannot starve a
+    reconcile or a compaction.
+
+        async with lock:
+            ...
+    """
+
+    def __init__(self):
+        self._mutex = threading.Lock()
+        self._locked = False
+        self._waiters: Deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+
+    def locked(self) -> bool:
+        return self._locked
+
+    def try_acquire(self) -> bool:
+        """Takes the lock if it is free and nobody is queued for it."""
+        with self._mutex:
+            if self._locked or self._waiters:
+                return False
+            self._locked = True
+            return True
+
+    async def acquire(self) -> None:
+        loop = asyncio.get_running_loop()
+        with self._mutex:
+            if not self._locked and not self._waiters:
+                self._locked = True
+                return
+            waiter = (loop, loop.create_future())
+            self._waiters.append(waiter)
+        try:
+            await waiter[1]
+        except asyncio.CancelledError:
+            with self._mutex:
+                queued = waiter in self._waiters
+                if queued:
+                    self._waiters.remove(waiter)
+            if not queued and waiter[1].done() and not waiter[1].cancelled():
+                # Cancelled right after the lock was handed over
+                self.release()
+            raise
+
+    def release(self) -> None:
+        """Hands the lock to the next waiter, or frees it."""
+        with self._mutex:
+            while self._waiters:
+                loop, future = self._waiters.popleft()
+                try:
+                    loop.call_soon_threadsafe(self._grant, future)
+                    return
+                except RuntimeError:
+                    continue  # The waiter's loop is closed
+            self._locked = False
+
+    def _grant(self, future: asyncio.Future) -> None:
+        if future.done():
+            # The waiter was cancelled meanwhile: pass the lock on
+            self.release()
+        else:
+            future.set_result(True)
+
+    async def __aenter__(self) -> "SyncLock":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.release()
@@ -0,0 +1,75 @@
+import threading
+from bisect import bisect_left
+from typing import Iterable, Iterator, List, Set, Tuple
+
+
+class TermTrie:
+    """
+    Vocabulary of folded index terms for prefix and fuzzy lookups. Terms live in one sorted
+    array that is walked as an implicit trie: the node of a prefix is the range of terms
+    starting with it, and its children are found by binary search. This keeps the vocabulary
+    as compact as a plain list of strings. New terms are buffered and merged on the next lookup.
+    """
+
+    def __init__(self, terms: Iterable[str] = ()):
+        self._lock = threading.Lock()
+        self._terms: List[str] = sorted(set(terms))
+        self._pending: Set[str] = set()
+
+    def add(self, terms: Iterable[str]) -> None:
+        with self._lock:
+            self._pending.update(terms)
+
+    def __len__(self) -> int:
+        return len(self._sorted_terms())
+
+    def __contains__(self, term: str) -> bool:
+        terms = self._sorted_terms()
+        i = bisect_left(terms, term)
+        return i < len(terms) and terms[i] == term
+
+    def _sorted_terms(self) -> List[str]:
+        with self._lock:
+            if self._pending:
+                self._terms = sorted(self._pending.union(self._terms))
+                self._pending = set()
+            return self._terms
+
+    def prefix(self, prefix: str, limit: int = 50) -> List[str]:
+        """Terms starting with `prefix`, in order."""
+        terms = self._sorted_terms()
+        start = bisect_left(terms, prefix)
+        end = bisect_left(terms, prefix + "\U0010ffff", start)
+        return terms[start:min(end, start + limit)]
+
+    def _children(self, terms: List[str], lo: int, hi: int, depth: int) -> Iterator[Tuple[str, int, int]]:
+        """(character, lo, hi) of the child nodes of the node spanning terms[lo:hi] at `depth`."""
+        i = lo
+        if i < hi and len(terms[i]) == depth:
+            i += 1  # The prefix itself is a term; it sorts first
+        while i < hi:
+            char = terms[i][depth]
+            j = bisect_left(terms, terms[i][:depth] + chr(ord(char) + 1), i, hi)
+            yield char, i, j
+            i = j
+
+    def fuzzy(self, word: str, max_distance: int = 1) -> List[Tuple[str, int]]:
+        """
+        Terms within `max_distance` edits (insertions, deletions, substitutions) of `word`,
+        as (term, distance). Walks the trie with one Levenshtein row per node and prunes
+        branches that can no longer get within the distance.
+        """
+        terms = self._sorted_terms()
+        matches: List[Tuple[str, int]] = []
+        stack = [(0, len(terms), 0, list(range(len(word) + 1)))]
+        while stack:
+            lo, hi, depth, previous = stack.pop()
+            for char, child_lo, child_hi in self._children(terms, lo, hi, depth):
+                row = [previous[0] + 1]
+                for col in range(1, len(word) + 1):
+                    row.append(min(row[col - 1] + 1, previous[col] + 1, previous[col - 1] + (word[col - 1] != char)))
+                if row[-1] <= max_distance and len(terms[child_lo]) == depth + 1:
+                    matches.append((terms[child_lo], row[-1]))
+                if min(row) <= max_distance:
+                    stack.append((child_lo, child_hi, depth + 1, row))
+        return sorted(matches, key=lambda match: (match[1], match[0]))
@@ -0,0 +1,16 @@
+import re
+import unicodedata
+from typing import List
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def fold(text: str) -> str:
+    """Case- and accent-folds text ("Profesión" -> "profesion") using NFKD decomposition."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def tokenize(text: str) -> List[str]:
+    """Splits folded text into word tokens."""
+    return _TOKEN_RE.findall(fold(text))
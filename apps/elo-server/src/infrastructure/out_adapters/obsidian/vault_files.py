@@ -0,0 +1,52 @@
+import os
+import json
+import logging
+from typing import Iterator, Optional, Tuple
+
+# Folders that never contain user notes
+IGNORED_DIRS = {".obsidian", ".trash", ".git"}
+
+
+def is_note_path(rel_path: str) -> bool:
+    """Returns True for vault-relative paths of markdown notes outside hidden/ignored folders."""
+    if not rel_path.endswith(".md"):
+        return False
+    parts = rel_path.split("/")
+    return not any(part in IGNORED_DIRS or part.startswith(".") for part in parts[:-1])
+
+
+def to_vault_path(vault_root: str, full_path: str) -> str:
+    """Converts an absolute path to the vault-relative, '/'-separated form used as note ID."""
+    return os.path.relpath(full_path, vault_root).replace(os.sep, "/")
+
+
+def walk_vault(vault_root: str) -> Iterator[Tuple[str, os.stat_result]]:
+    """Yields (vault-relative path, stat) for every markdown note in the vault."""
+    stack = [vault_root]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in IGNORED_DIRS and not entry.name.startswith("."):
+                            stack.append(entry.path)
+                    elif entry.name.endswith(".md") and entry.is_file():
+                        yield to_vault_path(vault_root, entry.path), entry.stat()
+        except OSError as e:
+            logging.warning(f"Could not scan {current}: {e}")
+
+
+def load_vault_schema(vault_path: Optional[str]) -> dict:
+    """Loads the frontmatter keys declared in .obsidian/types.json, if present."""
+    if not vault_path:
+        return {}
+    schema_path = os.path.join(vault_path, ".obsidian", "types.json")
+    if not os.path.exists(schema_path):
+        return {}
+    try:
+        with open(schema_path, "r") as f:
+            return json.load(f).get("types", {})
+    except Exception as e:
+        logging.warning(f"Could not load vault schema: {e}")
+        return {}
@@ -0,0 +1,177 @@
+import os
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from src.infrastructure.out_adapters.obsidian.vault_files import is_note_path, to_vault_path, walk_vault
+
+try:
+    from watchdog.events import FileSystemEvent, FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # pragma: no cover - exercised only when watchdog is missing
+    Observer = None
+    FileSystemEventHandler = object
+    FileSystemEvent = object
+
+logger = logging.getLogger(__name__)
+
+# Receives (changed paths, deleted paths), both vault-relative. A deleted path ending in "/" is a
+# whole folder that was deleted or moved away; the notes it held are no longer listed one by one
+BatchHandler = Callable[[List[str], List[str]], Awaitable[None]]
+
+
+class _EventForwarder(FileSystemEventHandler):
+    """Forwards watchdog events (raised on the observer thread) to the event loop."""
+
+    def __init__(self, watcher: "VaultWatcher", loop: asyncio.AbstractEventLoop):
+        self.watcher = watcher
+        self.loop = loop
+
+    def on_any_event(self, event: FileSystemEvent):
+        if event.is_directory:
+            # Moving a folder out of (or into) the vault raises no events for the notes inside
+            if event.event_type in ("deleted", "moved"):
+                folders = [event.src_path] + ([event.dest_path] if getattr(event, "dest_path", None) else [])
+                self.loop.call_soon_threadsafe(self.watcher.record_folders, folders)
+            return
+        paths = [event.src_path]
+        if getattr(event, "dest_path", None):
+            paths.append(event.dest_path)
+        self.loop.call_soon_threadsafe(self.watcher.record, paths)
+
+
+class VaultWatcher:
+    """
+    Watches the vault for note changes and hands them over in batches.
+    Uses inotify (via watchdog) when available and falls back to polling the vault listing.
+    Events are collected for `batch_seconds` after the first one, then each touched note
+    is reported as changed or deleted depending on whether it still exists.
+    """
+
+    def __init__(self, vault_path: str, on_batch: BatchHandler, batch_seconds: float = 1.0, poll_interval_seconds: float = 2.0, use_watchdog: bool = True):
+        self.vault_root = os.path.abspath(vault_path)
+        self.on_batch = on_batch
+        self.batch_seconds = batch_seconds
+        self.poll_interval_seconds = poll_interval_seconds
+        self.use_watchdog = use_watchdog and Observer is not None
+        self.is_running = False
+        self.mode: Optional[str] = None
+        self.events_received = 0
+        self.batches_processed = 0
+
+        self._pending: Set[str] = set()
+        self._pending_folders: Set[str] = set()
+        self._event: Optional[asyncio.Event] = None
+        self._observer = None
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self):
+        """Starts watching the vault."""
+        if self.is_running:
+            return
+        if not os.path.isdir(self.vault_root):
+            logger.warning(f"Vault path not found, watcher not started: {self.vault_root}")
+            return
+
+        self.is_running = True
+        self._event = asyncio.Event()
+        loop = asyncio.get_running_loop()
+
+        if self.use_watchdog:
+            self._observer = Observer()
+            self._observer.schedule(_EventForwarder(self, loop), self.vault_root, recursive=True)
+            self._observer.start()
+            self.mode = "inotify"
+        else:
+            self._tasks.append(asyncio.create_task(self._poll_loop()))
+            self.mode = "polling"
+
+        self._tasks.append(asyncio.create_task(self._batch_loop()))
+        logger.info(f"VaultWatcher started ({self.mode}). Watching {self.vault_root}")
+
+    async def stop(self):
+        """Stops watching the vault."""
+        self.is_running = False
+        if self._observer:
+            self._observer.stop()
+            await asyncio.to_thread(self._observer.join)
+            self._observer = None
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        logger.info("VaultWatcher stopped.")
+
+    def status(self) -> dict:
+        return {
+            "running": self.is_running,
+            "mode": self.mode,
+            "events_received": self.events_received,
+            "batches_processed": self.batches_processed,
+            "pending_paths": len(self._pending) + len(self._pending_folders),
+        }
+
+    def record(self, full_paths: List[str]) -> None:
+        """Registers raw filesystem paths touched by an event."""
+        for full_path in full_paths:
+            rel_path = to_vault_path(self.vault_root, os.fsdecode(full_path))
+            if is_note_path(rel_path):
+                self._pending.add(rel_path)
+                self.events_received += 1
+        if self._pending and self._event:
+            self._event.set()
+
+    def record_folders(self, full_paths: List[str]) -> None:
+        """Registers folders deleted or moved; their notes are resolved when the batch is taken."""
+        for full_path in full_paths:
+            rel_path = to_vault_path(self.vault_root, os.fsdecode(full_path))
+            if rel_path != "." and not rel_path.startswith("..") and is_note_path(f"{rel_path}/note.md"):
+                self._pending_folders.add(rel_path)
+                self.events_received += 1
+        if self._pending_folders and self._event:
+            self._event.set()
+
+    def _take_batch(self) -> Tuple[List[str], List[str]]:
+        paths, self._pending = self._pending, set()
+        folders, self._pending_folders = self._pending_folders, set()
+        removed_folders = []
+        for folder in sorted(folders):
+            full_path = os.path.join(self.vault_root, folder)
+            if os.path.isdir(full_path):
+                # Moved into place: every note under it is new at this path
+                paths.update(f"{folder}/{path}" for path, _ in walk_vault(full_path))
+            else:
+                removed_folders.append(f"{folder}/")
+        changed = sorted(p for p in paths if os.path.isfile(os.path.join(self.vault_root, p)))
+        deleted = sorted(p for p in paths if p not in changed)
+        return changed, deleted + removed_folders
+
+    async def _batch_loop(self):
+        while self.is_running:
+            await self._event.wait()
+            await asyncio.sleep(self.batch_seconds)
+            self._event.clear()
+
+            changed, deleted = self._take_batch()
+            if not changed and not deleted:
+                continue
+            logger.info(f"Vault changes detected: {len(changed)} changed, {len(deleted)} deleted")
+            try:
+                await self.on_batch(changed, deleted)
+                self.batches_processed += 1
+            except Exception as e:
+                logger.error(f"Error indexing vault changes: {e}", exc_info=True)
+
+    def _snapshot(self) -> Dict[str, Tuple[int, int]]:
+        return {path: (stat.st_mtime_ns, stat.st_size) for path, stat in walk_vault(self.vault_root)}
+
+    async def _poll_loop(self):
+        previous = await asyncio.to_thread(self._snapshot)
+        while self.is_running:
+            await asyncio.sleep(self.poll_interval_seconds)
+            current = await asyncio.to_thread(self._snapshot)
+            touched = [p for p, sig in current.items() if previous.get(p) != sig]
+            touched += [p for p in previous if p not in current]
+            previous = current
+            if touched:
+                self.record([os.path.join(self.vault_root, p) for p in touched])
@@ -0,0 +1,144 @@
+import os
+import logging
+
+from chromadb.config import Settings
+from langchain_chroma import Chroma
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+from src.infrastructure.config import ObsidianConfig
+from src.infrastructure.out_adapters.obsidian.numpy_vector_store import NumpyVectorStore
+
+VECTOR_STORE_BACKENDS = ("chroma", "numpy")
+COMPACTING_SUFFIX = "-compacting"
+
+
+class ChromaHandle:
+    """
+    The private langchain_chroma fields that compaction needs, read in one place.
+    Raises AttributeError on construction if a langchain_chroma upgrade renames them.
+    """
+
+    def __init__(self, store: Chroma):
+        self.store = store
+        self.client = store._client
+        self.metadata = store._collection_metadata
+        self.configuration = store._collection_configuration
+        store._chroma_collection  # Swapped by `use`
+
+    @property
+    def collection(self):
+        return self.store._chroma_collection
+
+    def use(self, collection) -> None:
+        """Points the store at another collection of the same client."""
+        self.store._chroma_collection = collection
+
+    def get_collection(self, name: str):
+        try:
+            return self.client.get_collection(name)
+        except Exception:
+            return None
+
+
+def _recover_chroma_compaction(store: Chroma) -> None:
+    """
+    Finishes or discards a compaction interrupted by a crash. The original collection is only
+    deleted once the copy is complete, so a copy next to a missing (re-created empty) original
+    is complete and takes its place. A copy next to a populated original is a partial leftover.
+    """
+    handle = ChromaHandle(store)
+    name = handle.collection.name
+    copy = handle.get_collection(name + COMPACTING_SUFFIX)
+    if copy is None:
+        return
+    if handle.collection.count() == 0 and copy.count() > 0:
+        logging.warning(f"Restoring collection '{name}' from an interrupted compaction")
+        handle.client.delete_collection(name)
+        copy.modify(name=name)
+        handle.use(handle.client.get_collection(name))
+    else:
+        handle.client.delete_collection(copy.name)
+
+
+def _open_chroma(persist_directory: str, embeddings: Embeddings, collection_name: str) -> Chroma:
+    if os.path.exists(persist_directory) and os.listdir(persist_directory):
+        try:
+            store = Chroma(
+                collection_name=collection_name,
+                persist_directory=persist_directory,
+                embedding_function=embeddings,
+                client_settings=Settings(anonymized_telemetry=False)
+            )
+            _recover_chroma_compaction(store)
+            return store
+        except Exception as e:
+            logging.warning(f"Could not load existing ChromaDB: {e}")
+
+    logging.info(f"Creating new ChromaDB at {persist_directory}")
+    return Chroma(
+        collection_name=collection_name,
+        embedding_function=embeddings,
+        persist_directory=persist_directory,
+        client_settings=Settings(anonymized_telemetry=False)
+    )
+
+
+def create_vector_store(config: ObsidianConfig, embeddings: Embeddings, collection_name: str) -> VectorStore:
+    """
+    Opens the vector store selected by `obsidian.vectorStore`. Every backend supports
+    add_documents/delete, similarity_search_by_vector with a `filter`, and Chroma-style `get`.
+    """
+    if config.vector_store == "numpy":
+        directory = os.path.join(config.persist_directory, "numpy", collection_name)
+        logging.info(f"Opening NumPy vector store at {directory} ({config.vector_dtype}, {config.vector_index})")
+        return NumpyVectorStore(directory, embedding_function=embeddings, dtype=config.vector_dtype, index=config.vector_index)
+    if config.vector_store != "chroma":
+        raise ValueError(f"Unknown vector store '{config.vector_store}'. Use one of: {', '.join(VECTOR_STORE_BACKENDS)}")
+    return _open_chroma(config.persist_directory, embeddings, collection_name)
+
+
+def count_entries(vector_store: VectorStore) -> int:
+    """Number of live entries in the collection."""
+    if isinstance(vector_store, Chroma):
+        return ChromaHandle(vector_store).collection.count()
+    return vector_store.count()
+
+
+def _compact_chroma(vector_store: Chroma, batch_size: int) -> None:
+    # Copy the live records into a fresh collection, then swap it in under the original name.
+    # A crash mid-swap is repaired by `_recover_chroma_compaction` when the store is next opened
+    handle = ChromaHandle(vector_store)
+    client = handle.client
+    source = handle.collection
+    target_name = source.name + COMPACTING_SUFFIX
+    if handle.get_collection(target_name) is not None:
+        client.delete_collection(target_name)  # Left over by an interrupted compaction
+    target = client.create_collection(
+        name=target_name,
+        embedding_function=None,
+        metadata=handle.metadata,
+        configuration=handle.configuration,
+    )
+    offset = 0
+    while True:
+        batch = source.get(limit=batch_size, offset=offset, include=["embeddings", "documents", "metadatas"])
+        if not batch["ids"]:
+            break
+        target.add(ids=batch["ids"], embeddings=batch["embeddings"], documents=batch["documents"], metadatas=batch["metadatas"])
+        offset += len(batch["ids"])
+    # Searches run outside the sync lock: point them at the complete copy before the source goes
+    handle.use(target)
+    client.delete_collection(source.name)
+    target.modify(name=source.name)
+
+
+def compact_vector_store(vector_store: VectorStore, batch_size: int = 1000) -> None:
+    """
+    Rebuilds the collection without the space held by deleted entries.
+    Stored embeddings are copied, not recomputed.
+    """
+    if isinstance(vector_store, Chroma):
+        _compact_chroma(vector_store, batch_size)
+    else:
+        vector_store.compact()
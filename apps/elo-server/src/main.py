@@ -1,3 +1,4 @@
+import time
 import uvicorn
 import os
 from contextlib import asynccontextmanager
@@ -16,13 +17,20 @@ from starlette.types import ASGIApp, Receive, Scope, Send
 from fastapi import Request, HTTPException
 from src.infrastructure.in_adapters.api.auth import verify_token
 from src.application.services.task_watcher_service import TaskWatcherService
+from src.application.services.semantic_index_service import SemanticIndexService
 
 from src.infrastructure.out_adapters.obsidian.langchain_obsidian_adapter import LangChainObsidianAdapter
+from src.infrastructure.out_adapters.obsidian.filesystem_obsidian_adapter import FilesystemObsidianAdapter
+from src.infrastructure.out_adapters.obsidian.vault_watcher import VaultWatcher
 from src.infrastructure.out_adapters.n8n.n8n_adapter import N8nAdapter
-from langchain_core.tools import tool
+from langchain_core.tools import StructuredTool, tool
+from typing import List, Optional
 
 from src.infrastructure.logging.logger import setup_logging, get_logger
 
+# For the time-to-ready log line: covers configuration, adapters and the lifespan startup
+PROCESS_STARTED = time.monotonic()
+
 # Load configuration first to get paths
 config = load_config()
 
@@ -44,23 +52,48 @@ ai_adapter = LangGraphAgentAdapter(
     api_key=config.ai.api_key, 
     model_name=config.ai.model,
     vault_path=config.obsidian.vault_path,
-    base_storage_path=os.path.join(config.paths.workspace, "users")
+    base_storage_path=os.path.join(config.paths.workspace, "users"),
+    planner_mode=config.ai.planner_mode,
+    planner_bypass_max_words=config.ai.planner_bypass_max_words,
+    fast_commands=config.ai.fast_commands
 )
 task_watcher = None
 
-# Initialize Obsidian Semantic Search Adapter (optional/lazy)
+# Initialize Obsidian Semantic Search Adapter (optional/lazy). Construction is cheap: the index
+# is opened and synced by the background indexer's warm-up, after the server is already serving
+INDEX_WARMING_MESSAGE = "The semantic index is still warming up. Try again in a moment, or use the other vault tools meanwhile."
 obsidian_adapter = None
 if config.obsidian.vault_path and config.ai.api_key:
     try:
-        logger.info(f"Initializing Obsidian Semantic Search for {config.obsidian.vault_path}...")
-        obsidian_adapter = LangChainObsidianAdapter(
+        logger.info(f"Initializing Obsidian Semantic Search for {config.obsidian.vault_path} ({config.obsidian.indexer} indexer)...")
+        adapter_class = FilesystemObsidianAdapter if config.obsidian.indexer == "filesystem" else LangChainObsidianAdapter
+        obsidian_adapter = adapter_class(
             obsidian_config=config.obsidian,
-            google_api_key=config.ai.api_key,
-            config_path="elo.config.json" # Pass path to allow self-update
+            google_api_key=config.ai.api_key
         )
     except Exception as e:
         logger.warning(f"Could not initialize Obsidian Semantic Search: {e}")
 
+# Background indexer: keeps the semantic index fresh off the request path
+semantic_index_service = None
+if obsidian_adapter:
+    semantic_index_service = SemanticIndexService(
+        obsidian_adapter,
+        min_interval_seconds=config.obsidian.sync_min_interval_seconds,
+        debounce_seconds=config.obsidian.sync_debounce_seconds,
+        reconcile_interval_seconds=config.obsidian.reconcile_interval_seconds
+    )
+
+# Filesystem watcher: re-indexes exactly the notes that change under vault_path
+vault_watcher = None
+if semantic_index_service and config.obsidian.watch:
+    vault_watcher = VaultWatcher(
+        config.obsidian.vault_path,
+        on_batch=semantic_index_service.sync_paths,
+        batch_seconds=config.obsidian.watch_batch_seconds,
+        poll_interval_seconds=config.obsidian.watch_poll_interval_seconds
+    )
+
 # Initialize n8n Adapter
 n8n_adapter = N8nAdapter(config=config.n8n)
 
@@ -76,6 +109,12 @@ async def lifespan(app: FastAPI):
     
     if task_watcher:
         await task_watcher.start()
+
+    if semantic_index_service:
+        await semantic_index_service.start()
+
+    if vault_watcher:
+        await vault_watcher.start()
     
     try:
         mcp_tools = await mcp_manager.get_tools()
@@ -85,24 +124,124 @@ async def lifespan(app: FastAPI):
         # Add Semantic Search Tool
         semantic_tools = []
         if obsidian_adapter:
-            @tool
-            def vault_semantic_search(query: str) -> str:
+            def format_search_result(res: dict) -> str:
+                header = f"--- File: {res['path']} (linked from {res['linked_from']}) ---" if res.get("linked_from") else f"--- File: {res['path']} ---"
+                return f"{header}\n{res['content']}"
+
+            def format_search_results(results: list) -> str:
+                text = "\n\n".join(format_search_result(res) for res in results) or "No semantic results found."
+                if obsidian_adapter.warming:
+                    # The initial sync is still running: results come from the index as persisted
+                    return f"(The semantic index is still warming up; results may be incomplete.)\n\n{text}"
+                return text
+
+            def vault_semantic_search(query: str, filters: Optional[dict] = None, hops: int = 0) -> str:
                 """
-                Searches the Obsidian vault semantically using vector embeddings. 
-                Use this when you can't find something with exact text search, 
-                when there might be typos, accents, or when looking for concepts.
-                Returns document snippets and their paths.
+                Searches the Obsidian vault combining semantic (vector) and keyword (BM25) retrieval.
+                Finds both concepts and exact names or identifiers, and tolerates accents and casing.
+                'filters' optionally restricts the search by frontmatter keys of the vault schema,
+                or by 'folder', 'title' and 'path', e.g. {"Oficios": "Ebanista", "folder": "Personas"}.
+                A list value matches any of its items.
+                'hops' (0-2) also returns notes linked to or from the top results via [[wikilinks]].
+                Returns document snippets and their paths, with the words matching the query in bold.
                 """
-                results = obsidian_adapter.search(query)
-                if not results:
-                    return "No semantic results found."
-                
-                formatted = []
-                for res in results:
-                    formatted.append(f"--- File: {res['path']} ---\n{res['content']}")
-                return "\n\n".join(formatted)
+                if obsidian_adapter.vector_store is None:
+                    return INDEX_WARMING_MESSAGE
+                try:
+                    return format_search_results(obsidian_adapter.search(query, filters=filters, hops=min(max(hops, 0), 2)))
+                except ValueError as e:
+                    return f"Invalid filters: {e}"
+
+            async def avault_semantic_search(query: str, filters: Optional[dict] = None, hops: int = 0) -> str:
+                # Used by the async agent executor so searches never block the event loop
+                if obsidian_adapter.vector_store is None:
+                    return INDEX_WARMING_MESSAGE
+                try:
+                    return format_search_results(await obsidian_adapter.asearch(query, filters=filters, hops=min(max(hops, 0), 2)))
+                except ValueError as e:
+                    return f"Invalid filters: {e}"
             
-            semantic_tools.append(vault_semantic_search)
+            semantic_tools.append(StructuredTool.from_function(func=vault_semantic_search, coroutine=avault_semantic_search))
+
+            def vault_text_search(query: str, limit: int = 10) -> str:
+                """
+                Full-text search of the vault for exact words, names and identifiers.
+                Ignores accents and casing ('profesion' finds 'Profesión'), matches unfinished words
+                ('carpint' finds 'carpintería') and tolerates one typo per word. No need to retry spellings.
+                Returns the best snippet of each matching note, with the matched words in bold.
+                """
+                if obsidian_adapter.vector_store is None:
+                    return INDEX_WARMING_MESSAGE
+                results = obsidian_adapter.text_search(query, k=min(max(limit, 1), 50))
+                if not results:
+                    return "No text matches found."
+                return "\n\n".join(
+                    f"--- File: {res['path']} (matched {res['matched']} words) ---\n{res['content']}" for res in results
+                )
+
+            semantic_tools.append(StructuredTool.from_function(func=vault_text_search))
+
+            def vault_related_notes(note: str, hops: int = 1, direction: str = "both") -> str:
+                """
+                Lists the notes connected to a note by [[wikilinks]], without reading them.
+                'note' is a note name or path. 'hops' (1-3) is how many links away to look.
+                'direction' is "out" (notes it links to), "in" (notes linking to it) or "both".
+                Use it to explore a note's neighbourhood instead of chaining searches.
+                """
+                if obsidian_adapter.vector_store is None:
+                    return INDEX_WARMING_MESSAGE
+                try:
+                    related = obsidian_adapter.related_notes(note, hops=min(max(hops, 1), 3), direction=direction)
+                except ValueError as e:
+                    return f"Invalid arguments: {e}"
+                if related is None:
+                    return f"Note not found in the index: {note}"
+                if not related:
+                    return f"No linked notes found for {note}."
+                return "\n".join(f"- {r['path']} ({r['distance']} hop{'s' if r['distance'] > 1 else ''})" for r in related)
+
+            semantic_tools.append(StructuredTool.from_function(func=vault_related_notes))
+
+            def vault_query(
+                filters: Optional[dict] = None,
+                sort_by: Optional[str] = None,
+                descending: bool = False,
+                limit: int = 20,
+                fields: Optional[List[str]] = None,
+                group_by: Optional[str] = None,
+                stats: Optional[str] = None,
+            ) -> str:
+                """
+                Answers structured questions about the vault from note properties, e.g. people whose
+                Profesión is X, or notes in a folder modified this week. Prefer it over full-text search
+                for such lists and counts.
+                Properties: every frontmatter key, plus 'path', 'title', 'folder' and 'file_modified'
+                (the file's last modification, 'YYYY-MM-DDTHH:MM:SS').
+                'filters' matches values ignoring case and accents; a list matches any of its items and
+                operators compare, e.g. {"Profesión": "Ebanista", "file_modified": {"$gte": "2026-10-12"}}.
+                Operators: $eq, $ne, $in, $nin, $gt, $gte, $lt, $lte.
+                'sort_by'/'descending' order the notes, 'fields' adds properties to each note,
+                'group_by' counts notes per value and 'stats' gives count/min/max/sum/avg of a property.
+                """
+                if obsidian_adapter.vector_store is None:
+                    return INDEX_WARMING_MESSAGE
+                try:
+                    result = obsidian_adapter.query_notes(filters, sort_by, descending, limit, fields, group_by, stats)
+                except ValueError as e:
+                    return f"Invalid query: {e}"
+                lines = [f"{result['total']} matching notes."]
+                for note in result["notes"]:
+                    values = "; ".join(f"{key}: {value}" for key, value in note.items() if key != "path")
+                    lines.append(f"- {note['path']}" + (f" ({values})" if values else ""))
+                if len(result["notes"]) < result["total"]:
+                    lines.append(f"... {result['total'] - len(result['notes'])} more.")
+                if "groups" in result:
+                    lines.append(f"By {group_by}: " + ", ".join(f"{value}: {count}" for value, count in result["groups"].items()))
+                if "stats" in result:
+                    lines.append(f"{stats}: " + ", ".join(f"{key} {value}" for key, value in result["stats"].items()))
+                return "\n".join(lines)
+
+            semantic_tools.append(StructuredTool.from_function(func=vault_query))
 
         # Add n8n Tools
         n8n_tools = []
@@ -144,6 +283,7 @@ async def lifespan(app: FastAPI):
         import traceback
         logger.error(traceback.format_exc())
 
+    logger.info(f"Server ready in {time.monotonic() - PROCESS_STARTED:.2f}s")
     yield
     
     logger.info("Stopping MCP Manager...")
@@ -152,6 +292,12 @@ async def lifespan(app: FastAPI):
     if task_watcher:
         await task_watcher.stop()
 
+    if vault_watcher:
+        await vault_watcher.stop()
+
+    if semantic_index_service:
+        await semantic_index_service.stop()
+
 class ConstToEnumMiddleware:
     """
     Middleware to fix Pydantic v2 'const' -> 'enum' for LangServe chat playground.
@@ -322,6 +468,10 @@ def bootstrap():
     # 3. Initialize API (Infrastructure)
     app = create_app(ask_ai_use_case, config=config, lifespan=lifespan)
     app.state.ai_tools_use_case = ai_tools_use_case
+    app.state.semantic_index_service = semantic_index_service
+    app.state.vault_watcher = vault_watcher
+    app.state.obsidian_adapter = obsidian_adapter
+    app.state.ai_adapter = ai_adapter
     
     # 4. Add LangServe Routes
     
@@ -379,12 +529,9 @@ def bootstrap():
             
         cfg["configurable"] = configurable
 
-        # Trigger Semantic Sync on new interaction (fast with internal cooldown)
-        if obsidian_adapter:
-            try:
-                obsidian_adapter.sync()
-            except Exception as e:
-                logger.warning(f"Background semantic sync failed: {e}")
+        # Signal the background indexer that the vault may have changed (never blocks)
+        if semantic_index_service:
+            semantic_index_service.notify()
 
         return cfg
 
@@ -0,0 +1,94 @@
+"""
+Measures the per-turn overhead of the agent graph with a fake LLM that answers instantly,
+comparing the executor compiled once per tool set against rebuilding the ReAct agent (and
+re-converting every tool schema) on each turn.
+
+Usage: python -m src.scripts.benchmark_agent_turn [--tools 120] [--turns 50]
+"""
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from typing import Any, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.runnables import RunnableLambda
+from langchain_core.tools import StructuredTool
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from langgraph.prebuilt import create_react_agent
+
+from src.infrastructure.out_adapters.ai.langgraph_agent_adapter import ExecutorState, LangGraphAgentAdapter, Plan
+
+
+class InstantChatModel(BaseChatModel):
+    """Answers at once. Binding tools converts their schemas, as a real provider does."""
+
+    @property
+    def _llm_type(self) -> str:
+        return "instant"
+
+    def bind_tools(self, tools, **kwargs):
+        for t in tools:
+            convert_to_openai_tool(t)
+        return self
+
+    def with_structured_output(self, schema, **kwargs):
+        return RunnableLambda(lambda _: Plan(steps=["Answer"]))
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager=None, **kwargs) -> ChatResult:
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content="Done."))])
+
+
+def make_tools(count: int) -> List[Any]:
+    def make(i: int):
+        def run(query: str, limit: int = 10, folder: Optional[str] = None) -> str:
+            return query
+        return StructuredTool.from_function(run, name=f"tool_{i}", description=f"Fake MCP tool number {i}.")
+    return [make(i) for i in range(count)]
+
+
+async def timed_turns(adapter: LangGraphAgentAdapter, turns: int) -> float:
+    samples = []
+    for turn in range(turns):
+        config = {"configurable": {"thread_id": f"turn-{turn}"}, "callbacks": []}
+        started = time.perf_counter()
+        await adapter.ainvoke({"messages": [{"type": "human", "content": "Hi"}]}, config)
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+async def run(tools: int, turns: int):
+    with tempfile.TemporaryDirectory() as path:
+        adapter = LangGraphAgentAdapter(api_key="benchmark", base_storage_path=path)
+        adapter.llm = InstantChatModel()
+        adapter.bind_tools(make_tools(tools))
+        compiled_ms = await timed_turns(adapter, turns)
+
+        # Previous behaviour: a fresh ReAct agent for every executor run
+        class RebuildingAgent:
+            async def ainvoke(self, state, *args, **kwargs):
+                agent = create_react_agent(adapter.llm, adapter.tools, prompt="Execute the plan.", state_schema=ExecutorState)
+                return await agent.ainvoke(state, *args, **kwargs)
+
+        adapter.executor_agent = RebuildingAgent()
+        rebuilt_ms = await timed_turns(adapter, turns)
+
+    print(f"{tools} tools, median of {turns} turns")
+    print(f"{'executor':>16} | {'ms per turn':>11}")
+    print(f"{'compiled once':>16} | {compiled_ms:>11.2f}")
+    print(f"{'rebuilt per turn':>16} | {rebuilt_ms:>11.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tools", type=int, default=120)
+    parser.add_argument("--turns", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(run(args.tools, args.turns))
+
+
+if __name__ == "__main__":
+    main()
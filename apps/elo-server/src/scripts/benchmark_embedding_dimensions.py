@@ -0,0 +1,98 @@
+"""
+Recall-vs-dimension report for Matryoshka-style truncated embeddings.
+Embeds the vault's chunks once at full width (through the persistent embedding cache, so
+re-runs are free), then measures, for each truncated width, how many of the full-width
+top-k neighbours are still found, the index size per chunk and the exact scan time.
+Queries are the title and heading path of randomly sampled chunks.
+
+Usage: python -m src.scripts.benchmark_embedding_dimensions [--dims 3072,1536,768,512,256,128]
+       [--k 10] [--queries 200] [--max-chunks 5000] [--provider gemini]
+"""
+import argparse
+import os
+import random
+import time
+
+import numpy as np
+
+from src.infrastructure.config import load_config
+from src.infrastructure.out_adapters.obsidian.embedding_cache import CachedEmbeddings, EmbeddingCache
+from src.infrastructure.out_adapters.obsidian.embedding_providers import create_embeddings, embedding_model_id
+from src.infrastructure.out_adapters.obsidian.markdown_chunker import MarkdownChunker
+from src.infrastructure.out_adapters.obsidian.vault_files import load_vault_schema, walk_vault
+
+
+def load_chunks(vault_path: str, chunk_size: int, max_chunks: int):
+    chunker = MarkdownChunker(chunk_size=chunk_size)
+    schema = load_vault_schema(vault_path)
+    chunks = []
+    for path, _ in walk_vault(vault_path):
+        with open(os.path.join(vault_path, path), "r", encoding="utf-8", errors="replace") as f:
+            chunks.extend(chunker.split(path, f.read(), schema))
+        if len(chunks) >= max_chunks:
+            break
+    return chunks[:max_chunks]
+
+
+def truncate(matrix: np.ndarray, dims: int) -> np.ndarray:
+    truncated = matrix[:, :dims].copy()
+    norms = np.linalg.norm(truncated, axis=1, keepdims=True)
+    np.divide(truncated, norms, out=truncated, where=norms > 0)
+    return truncated
+
+
+def top_k(documents: np.ndarray, queries: np.ndarray, k: int) -> np.ndarray:
+    scores = queries @ documents.T
+    return np.argsort(-scores, axis=1)[:, :k]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dims", default="3072,1536,768,512,256,128")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--max-chunks", type=int, default=5000)
+    parser.add_argument("--provider", help="Overrides obsidian.embeddingProvider")
+    args = parser.parse_args()
+
+    config = load_config()
+    obs_config = config.obsidian
+    if args.provider:
+        obs_config.embedding_provider = args.provider
+    obs_config.embedding_dimensions = None  # Measure against the native width
+
+    embeddings = create_embeddings(obs_config, config.ai.api_key)
+    if obs_config.embedding_cache_path and obs_config.embedding_provider != "local":
+        embeddings = CachedEmbeddings(embeddings, EmbeddingCache(obs_config.embedding_cache_path), model=embedding_model_id(obs_config), task_type="retrieval_document")
+
+    chunks = load_chunks(obs_config.vault_path, obs_config.chunk_size, args.max_chunks)
+    if len(chunks) <= args.k:
+        print(f"Not enough chunks in {obs_config.vault_path} ({len(chunks)})")
+        return
+    print(f"Embedding {len(chunks)} chunks with {embedding_model_id(obs_config)}...")
+    documents = np.asarray(embeddings.embed_documents([c.page_content for c in chunks]), dtype=np.float32)
+
+    sampled = random.Random(0).sample(chunks, min(args.queries, len(chunks)))
+    query_texts = [c.page_content.split("\n\n", 1)[0] for c in sampled]
+    queries = np.asarray(embeddings.embed_documents(query_texts), dtype=np.float32)
+
+    native = documents.shape[1]
+    dims = sorted({d for d in (int(x) for x in args.dims.split(",")) if d <= native} | {native}, reverse=True)
+    truth = top_k(truncate(documents, native), truncate(queries, native), args.k)
+
+    print(f"{len(chunks)} chunks, {len(queries)} queries, recall@{args.k} against the native {native} dimensions")
+    print(f"{'dims':>6} | {'recall':>7} | {'float32 B/chunk':>15} | {'int8 B/chunk':>12} | {'index vs native':>15} | {'scan ms':>8}")
+    for d in dims:
+        docs_d, queries_d = truncate(documents, d), truncate(queries, d)
+        found = top_k(docs_d, queries_d, args.k)
+        recall = np.mean([len(set(found[i]) & set(truth[i])) / args.k for i in range(len(queries))])
+
+        started = time.perf_counter()
+        for q in queries_d:
+            docs_d @ q
+        scan_ms = (time.perf_counter() - started) * 1000 / len(queries_d)
+        print(f"{d:>6} | {recall:>7.3f} | {d * 4:>15} | {d:>12} | {native / d:>14.1f}x | {scan_ms:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Compares frontmatter-filtered vector search pushed down into Chroma against
+searching the whole collection and filtering the results afterwards.
+
+Usage: python -m src.scripts.benchmark_filtered_search [--chunks 20000] [--dim 768]
+"""
+import argparse
+import statistics
+import tempfile
+import time
+
+import chromadb
+import numpy as np
+from chromadb.config import Settings
+
+FRACTIONS = [1.0, 0.5, 0.1, 0.01, 0.001]
+K = 5
+
+
+def build_collection(path: str, chunks: int, dim: int):
+    rng = np.random.default_rng(42)
+    client = chromadb.PersistentClient(path=path, settings=Settings(anonymized_telemetry=False))
+    collection = client.create_collection("benchmark", metadata={"hnsw:space": "cosine"})
+    vectors = rng.standard_normal((chunks, dim), dtype=np.float32)
+    # Chunk i belongs to bucket i % 1000, so "bucket < n" selects n / 1000 of the collection
+    for start in range(0, chunks, 5000):
+        end = min(start + 5000, chunks)
+        collection.add(
+            ids=[str(i) for i in range(start, end)],
+            embeddings=vectors[start:end].tolist(),
+            metadatas=[{"bucket": i % 1000} for i in range(start, end)],
+        )
+    return collection, rng
+
+
+def timed(fn, repeats: int) -> float:
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chunks", type=int, default=20000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as path:
+        collection, rng = build_collection(path, args.chunks, args.dim)
+        query = rng.standard_normal(args.dim, dtype=np.float32).tolist()
+
+        print(f"{args.chunks} chunks, dim {args.dim}, k={K}, median of {args.repeats} runs")
+        print(f"{'filtered out':>12} | {'pushdown ms':>11} | {'post-filter ms':>14}")
+        for fraction in FRACTIONS:
+            where = {"bucket": {"$lt": max(1, int(1000 * fraction))}}
+
+            def pushdown():
+                collection.query(query_embeddings=[query], n_results=K, where=where)
+
+            def post_filter():
+                # Without pushdown the whole collection has to be ranked to guarantee k matches
+                result = collection.query(query_embeddings=[query], n_results=args.chunks, include=["metadatas"])
+                limit = where["bucket"]["$lt"]
+                [m for m in result["metadatas"][0] if m["bucket"] < limit][:K]
+
+            print(f"{1 - fraction:>12.1%} | {timed(pushdown, args.repeats):>11.2f} | {timed(post_filter, args.repeats):>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Compares the vector store backends on resident memory, cold-open time and query latency.
+Each store is built once, then opened and queried in a fresh process so the numbers
+reflect a cold start.
+
+Usage: python -m src.scripts.benchmark_vector_stores [--sizes 10000,100000,1000000] [--dim 768]
+       [--backends chroma,numpy-int8,numpy-float16,numpy-int8-hnsw]
+"""
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+BACKENDS = ["chroma", "numpy-int8", "numpy-float16", "numpy-int8-hnsw"]
+BATCH = 5000
+QUERIES = 50
+
+
+def rss_mb() -> float:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def random_vectors(rng, n: int, dim: int) -> np.ndarray:
+    vectors = rng.standard_normal((n, dim), dtype=np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def import_backend(backend: str) -> None:
+    """Imports the backend's libraries up front so they are not counted as open time."""
+    if backend == "chroma":
+        import chromadb  # noqa: F401
+    else:
+        import src.infrastructure.out_adapters.obsidian.numpy_vector_store  # noqa: F401
+
+
+def open_store(backend: str, path: str):
+    if backend == "chroma":
+        import chromadb
+        from chromadb.config import Settings
+        client = chromadb.PersistentClient(path=path, settings=Settings(anonymized_telemetry=False))
+        return client.get_or_create_collection("benchmark")
+
+    from src.infrastructure.out_adapters.obsidian.numpy_vector_store import NumpyVectorStore
+    _, dtype, *index = backend.split("-")
+    return NumpyVectorStore(path, dtype=dtype, index=index[0] if index else "flat", hnsw_save_interval_seconds=0)
+
+
+def build(backend: str, path: str, size: int, dim: int) -> float:
+    rng = np.random.default_rng(42)
+    store = open_store(backend, path)
+    started = time.perf_counter()
+    for start in range(0, size, BATCH):
+        end = min(start + BATCH, size)
+        ids = [str(i) for i in range(start, end)]
+        vectors = random_vectors(rng, end - start, dim)
+        metadatas = [{"path": f"note-{i // 4}.md"} for i in range(start, end)]
+        documents = [f"chunk {i}" for i in range(start, end)]
+        if backend == "chroma":
+            store.add(ids=ids, embeddings=vectors, metadatas=metadatas, documents=documents)
+        else:
+            store.add_embeddings(ids, vectors, documents, metadatas)
+    if backend.endswith("hnsw"):
+        # Build and persist the graph now so the cold open loads it instead of rebuilding it
+        store.similarity_search_by_vector(random_vectors(rng, 1, dim)[0].tolist(), k=5)
+    if backend != "chroma":
+        store.close()
+    return time.perf_counter() - started
+
+
+def measure(backend: str, path: str, dim: int) -> dict:
+    """Runs in a fresh process: opens the store and queries it."""
+    rng = np.random.default_rng(7)
+    queries = random_vectors(rng, QUERIES + 1, dim)
+    import_backend(backend)
+    baseline = rss_mb()
+
+    started = time.perf_counter()
+    store = open_store(backend, path)
+    open_ms = (time.perf_counter() - started) * 1000
+
+    def query(vector):
+        if backend == "chroma":
+            store.query(query_embeddings=[vector.tolist()], n_results=5)
+        else:
+            store.similarity_search_by_vector(vector.tolist(), k=5)
+
+    started = time.perf_counter()
+    query(queries[0])
+    first_ms = (time.perf_counter() - started) * 1000
+
+    samples = []
+    for vector in queries[1:]:
+        started = time.perf_counter()
+        query(vector)
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {
+        "open_ms": open_ms,
+        "first_query_ms": first_ms,
+        "p50_ms": statistics.median(samples),
+        "p95_ms": samples[int(len(samples) * 0.95) - 1],
+        "rss_mb": rss_mb() - baseline,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--backends", default=",".join(BACKENDS))
+    parser.add_argument("--measure", nargs=2, metavar=("BACKEND", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(args.measure[0], args.measure[1], args.dim)))
+        return
+
+    print(f"dim {args.dim}, k=5, {QUERIES} queries; RSS is the growth (after imports) from opening and querying the store")
+    print(f"{'chunks':>8} | {'backend':<16} | {'build s':>8} | {'open ms':>8} | {'1st query ms':>12} | {'p50 ms':>7} | {'p95 ms':>7} | {'RSS MB':>7}")
+    for size in [int(s) for s in args.sizes.split(",")]:
+        for backend in args.backends.split(","):
+            with tempfile.TemporaryDirectory() as path:
+                build_s = build(backend, path, size, args.dim)
+                output = subprocess.run(
+                    [sys.executable, "-m", "src.scripts.benchmark_vector_stores", "--dim", str(args.dim), "--measure", backend, path],
+                    check=True, capture_output=True, text=True, cwd=os.getcwd(),
+                ).stdout
+                r = json.loads(output.strip().splitlines()[-1])
+                print(f"{size:>8} | {backend:<16} | {build_s:>8.1f} | {r['open_ms']:>8.1f} | {r['first_query_ms']:>12.1f} | {r['p50_ms']:>7.2f} | {r['p95_ms']:>7.2f} | {r['rss_mb']:>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
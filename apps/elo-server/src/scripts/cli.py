@@ -93,6 +93,15 @@ async def main():
                                 
                     elif isinstance(chunk, str):
                         print(chunk, end="", flush=True)
+                    elif getattr(chunk, "additional_kwargs", {}).get("plan"): # Planner output
+                        steps = chunk.additional_kwargs["plan"]
+                        print("\n[plan] " + " -> ".join(steps) + "\nAI: ", end="", flush=True)
+                    elif getattr(chunk, "type", None) == "tool": # Tool call finished
+                        print(f"\n[tool] {chunk.name} done\nAI: ", end="", flush=True)
+                    elif getattr(chunk, "tool_call_chunks", None): # Tool call started
+                        for call in chunk.tool_call_chunks:
+                            if call.get("name"):
+                                print(f"\n[tool] {call['name']}...", end="", flush=True)
                     elif hasattr(chunk, "content"): # Direct message object
                          print(chunk.content, end="", flush=True)
             except Exception as e:
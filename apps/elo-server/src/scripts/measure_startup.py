@@ -0,0 +1,76 @@
+"""
+Measures the server's time to first healthy response: starts uvicorn in a fresh process,
+polls GET /health until it answers 200, then (optionally) polls the semantic index status
+until its warm-up has finished. Each run is a cold start.
+
+Usage: python -m src.scripts.measure_startup [--runs 3] [--port 8765] [--timeout 300] [--wait-warm]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+
+def poll(url: str, deadline: float, ready, headers=None) -> bool:
+    while time.monotonic() < deadline:
+        try:
+            response = httpx.get(url, timeout=1.0, headers=headers)
+            if response.status_code == 200 and ready(response):
+                return True
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.05)
+    return False
+
+
+def measure(port: int, timeout: float, wait_warm: bool) -> dict:
+    started = time.monotonic()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.main:app", "--host", "127.0.0.1", "--port", str(port)],
+        cwd=os.getcwd(), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = started + timeout
+        base_url = f"http://127.0.0.1:{port}"
+        result = {"healthy_s": None, "warm_s": None}
+        if not poll(f"{base_url}/health", deadline, lambda r: True):
+            return result
+        result["healthy_s"] = time.monotonic() - started
+
+        if wait_warm:
+            headers = {"Authorization": f"Bearer {os.getenv('SERVER_AUTH_TOKEN', '')}"}
+            if poll(f"{base_url}/api/obsidian/index/status", deadline, lambda r: r.json().get("warm"), headers):
+                result["warm_s"] = time.monotonic() - started
+        return result
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--timeout", type=float, default=300)
+    parser.add_argument("--wait-warm", action="store_true", help="Also wait for the semantic index warm-up")
+    args = parser.parse_args()
+
+    runs = []
+    for i in range(args.runs):
+        r = measure(args.port, args.timeout, args.wait_warm)
+        runs.append(r)
+        warm = f"{r['warm_s']:.2f}s" if r["warm_s"] is not None else "-"
+        healthy = f"{r['healthy_s']:.2f}s" if r["healthy_s"] is not None else "timeout"
+        print(f"run {i + 1}: healthy {healthy}, index warm {warm}")
+
+    healthy = [r["healthy_s"] for r in runs if r["healthy_s"] is not None]
+    if healthy:
+        print(f"time to first healthy response: median {statistics.median(healthy):.2f}s, max {max(healthy):.2f}s")
+
+
+if __name__ == "__main__":
+    main()
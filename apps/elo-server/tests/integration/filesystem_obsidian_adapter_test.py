@@ -0,0 +1,350 @@
+import os
+import json
+import pytest
+from src.infrastructure.out_adapters.obsidian.numpy_vector_store import NumpyVectorStore
+from unittest.mock import patch
+from src.infrastructure.config import ObsidianConfig
+from src.infrastructure.out_adapters.obsidian.filesystem_obsidian_adapter import FilesystemObsidianAdapter
+
+
+@pytest.fixture
+def vault(tmp_path):
+    vault = tmp_path / "vault"
+    (vault / "People").mkdir(parents=True)
+    (vault / ".obsidian").mkdir()
+    (vault / "People" / "Ana.md").write_text("Carpintera en Madrid.")
+    (vault / "People" / "Luis.md").write_text("Profesor de música.")
+    (vault / ".obsidian" / "workspace.md").write_text("not a note")
+    return vault
+
+
+def _adapter(tmp_path, vault, embedding_dimensions: int = 512):
+    config = ObsidianConfig(
+        vault_path=str(vault),
+        persist_directory=str(tmp_path / "chroma"),
+        indexer="filesystem",
+        embedding_provider="local",
+        embedding_dimensions=embedding_dimensions,
+    )
+    adapter = FilesystemObsidianAdapter(config, google_api_key="test-key")
+    adapter._run_blocking(adapter.warm_up())
+    return adapter
+
+
+def _indexed_paths(adapter):
+    return sorted({m["path"] for m in adapter.vector_store.get()["metadatas"]})
+
+
+def test_initial_sync_indexes_notes_from_disk(tmp_path, vault):
+    # Act
+    adapter = _adapter(tmp_path, vault)
+
+    # Assert
+    assert _indexed_paths(adapter) == ["People/Ana.md", "People/Luis.md"]
+    assert adapter.warming is False
+
+
+def test_construction_defers_opening_and_syncing_the_index(tmp_path, vault):
+    # Arrange
+    config = ObsidianConfig(
+        vault_path=str(vault),
+        persist_directory=str(tmp_path / "chroma"),
+        indexer="filesystem",
+        embedding_provider="local",
+    )
+
+    # Act
+    with patch.object(FilesystemObsidianAdapter, "_fetch_note_content") as fetch:
+        adapter = FilesystemObsidianAdapter(config, google_api_key="test-key")
+
+    # Assert
+    fetch.assert_not_called()
+    assert adapter.vector_store is None
+    assert adapter.warming is True
+    assert adapter.search("Carpintera") == []
+
+
+def test_resync_applies_modifications_and_deletions(tmp_path, vault):
+    # Arrange
+    adapter = _adapter(tmp_path, vault)
+    (vault / "People" / "Ana.md").write_text("Ebanista en Sevilla.")
+    os.utime(vault / "People" / "Ana.md", ns=(1, 1))
+    (vault / "People" / "Luis.md").unlink()
+
+    # Act
+    adapter.sync(force=True)
+
+    # Assert
+    assert _indexed_paths(adapter) == ["People/Ana.md"]
+    assert adapter.vector_store.get()["documents"] == ["Ana\n\nEbanista en Sevilla."]
+
+
+def test_unchanged_notes_are_skipped_after_restart(tmp_path, vault):
+    # Arrange
+    _adapter(tmp_path, vault)
+
+    # Act
+    with patch.object(FilesystemObsidianAdapter, "_fetch_note_content", return_value=None) as fetch:
+        _adapter(tmp_path, vault)
+
+    # Assert
+    fetch.assert_not_called()
+
+
+def test_legacy_manifest_is_migrated_into_the_index_state(tmp_path, vault):
+    # Arrange
+    previous = _adapter(tmp_path, vault)
+    manifest = {path: [state.mtime_ns, state.size, state.content_hash] for path, state in previous.index_state.notes().items()}
+    previous.index_state.close()
+    for state_file in (tmp_path / "chroma").glob("index-state.sqlite*"):
+        state_file.unlink()
+    (tmp_path / "chroma" / "fs-manifest.json").write_text(json.dumps(manifest))
+
+    # Act
+    adapter = _adapter(tmp_path, vault)
+
+    # Assert: notes are read once more to record their links, but nothing is re-embedded
+    assert adapter.index_version == 0
+    assert sorted(adapter.index_state.notes()) == ["People/Ana.md", "People/Luis.md"]
+    assert all(state.links == [] for state in adapter.index_state.notes().values())
+    assert not (tmp_path / "chroma" / "fs-manifest.json").exists()
+
+
+def test_targeted_sync_updates_only_given_notes(tmp_path, vault):
+    # Arrange
+    adapter = _adapter(tmp_path, vault)
+    (vault / "People" / "Ana.md").write_text("Ebanista en Sevilla.")
+    (vault / "People" / "Luis.md").unlink()
+
+    # Act
+    adapter._run_blocking(adapter.async_sync_paths(["People/Ana.md"], ["People/Luis.md"]))
+
+    # Assert
+    assert _indexed_paths(adapter) == ["People/Ana.md"]
+    assert adapter.index_state.get("People/Luis.md") is None
+
+
+def test_targeted_sync_removes_every_note_of_a_removed_folder(tmp_path, vault):
+    # Arrange
+    (vault / "Places").mkdir()
+    (vault / "Places" / "Madrid.md").write_text("Capital.")
+    adapter = _adapter(tmp_path, vault)
+    (vault / "People").rename(tmp_path / "People")
+
+    # Act
+    adapter._run_blocking(adapter.async_sync_paths([], ["People/"]))
+
+    # Assert
+    assert _indexed_paths(adapter) == ["Places/Madrid.md"]
+    assert adapter.index_state.get("People/Ana.md") is None
+
+
+def test_switching_embedding_provider_reindexes_into_a_new_collection(tmp_path, vault):
+    # Arrange
+    _adapter(tmp_path, vault)
+
+    # Act
+    adapter = _adapter(tmp_path, vault, embedding_dimensions=128)
+
+    # Assert
+    assert adapter.collection_name == "vault-hashing-ngram-128"
+    assert _indexed_paths(adapter) == ["People/Ana.md", "People/Luis.md"]
+    assert adapter.search("Carpintera")[0]["path"] == "People/Ana.md"
+
+
+def test_numpy_vector_store_backend_indexes_and_searches(tmp_path, vault):
+    # Arrange
+    config = ObsidianConfig(
+        vault_path=str(vault),
+        persist_directory=str(tmp_path / "chroma"),
+        indexer="filesystem",
+        embedding_provider="local",
+        vector_store="numpy",
+    )
+    adapter = FilesystemObsidianAdapter(config, google_api_key="test-key")
+    (vault / "People" / "Luis.md").unlink()
+
+    # Act
+    adapter.sync(force=True)
+
+    # Assert
+    assert _indexed_paths(adapter) == ["People/Ana.md"]
+    assert adapter.search("Carpintera")[0]["path"] == "People/Ana.md"
+
+
+def test_index_with_another_dimensionality_is_rebuilt(tmp_path, vault):
+    # Arrange
+    stale = NumpyVectorStore(str(tmp_path / "chroma" / "numpy" / "vault-hashing-ngram-128"))
+    stale.add_embeddings(["old"], [[1.0] * 8], ["old chunk"], [{"path": "Old.md"}])
+    stale.close()
+    config = ObsidianConfig(
+        vault_path=str(vault),
+        persist_directory=str(tmp_path / "chroma"),
+        indexer="filesystem",
+        embedding_provider="local",
+        embedding_dimensions=128,
+        vector_store="numpy",
+    )
+
+    adapter = FilesystemObsidianAdapter(config, google_api_key="test-key")
+
+    # Act
+    adapter._run_blocking(adapter.warm_up())
+
+    # Assert
+    assert _indexed_paths(adapter) == ["People/Ana.md", "People/Luis.md"]
+    assert adapter.vector_store.dim == 128
+
+
+def test_search_merges_adjacent_chunks_and_highlights_matches(tmp_path, vault):
+    # Arrange
+    paragraphs = [f"Párrafo {i} sobre el taller de carpintería de Ana, con mesas y sillas." for i in range(12)]
+    (vault / "People" / "Ana.md").write_text("# Taller\n\n" + "\n\n".join(paragraphs))
+    config = ObsidianConfig(
+        vault_path=str(vault),
+        persist_directory=str(tmp_path / "chroma"),
+        indexer="filesystem",
+        embedding_provider="local",
+        chunk_size=300,
+        search_token_budget=2000,
+    )
+    adapter = FilesystemObsidianAdapter(config, google_api_key="test-key")
+    adapter._run_blocking(adapter.warm_up())
+
+    # Act
+    results = adapter.search("carpinteria", k=5)
+
+    # Assert
+    ana = [r for r in results if r["path"] == "People/Ana.md"]
+    assert len(ana) < 5
+    assert "**carpintería**" in ana[0]["content"]
+    assert ana[0]["content"].count("Ana > Taller") < ana[0]["content"].count("**carpintería**")
+
+
+def test_search_results_fit_the_token_budget(tmp_path, vault):
+    # Arrange
+    (vault / "People" / "Ana.md").write_text("Carpintera en Madrid. " + "Hace muebles a medida. " * 200)
+    config = ObsidianConfig(
+        vault_path=str(vault),
+        persist_directory=str(tmp_path / "chroma"),
+        indexer="filesystem",
+        embedding_provider="local",
+        search_token_budget=100,
+    )
+    adapter = FilesystemObsidianAdapter(config, google_api_key="test-key")
+    adapter._run_blocking(adapter.warm_up())
+
+    # Act
+    results = adapter.search("Carpintera")
+
+    # Assert
+    assert results[0]["path"] == "People/Ana.md"
+    assert "**Carpintera**" in results[0]["content"]
+    assert sum(len(r["content"]) for r in results) <= 100 * 4
+
+
+def test_related_notes_and_link_expanded_search(tmp_path, vault):
+    # Arrange
+    (vault / "People" / "Ana.md").write_text("Carpintera en Madrid. Trabaja con [[Luis]].")
+    (vault / "People" / "Luis.md").write_text("Profesor de música. Vive en [[Valencia]].")
+    (vault / "Valencia.md").write_text("Ciudad de la costa.")
+    adapter = _adapter(tmp_path, vault)
+
+    # Act
+    related = adapter.related_notes("Ana", hops=2)
+    results = adapter.search("Carpintera", k=1, hops=1)
+
+    # Assert
+    assert related == [{"path": "People/Luis.md", "distance": 1}, {"path": "Valencia.md", "distance": 2}]
+    assert [r["path"] for r in results] == ["People/Ana.md", "People/Luis.md"]
+    assert results[1]["linked_from"] == "People/Ana.md"
+    assert adapter.related_notes("Nadie") is None
+
+
+def test_links_of_notes_indexed_before_the_graph_are_backfilled(tmp_path, vault):
+    # Arrange
+    (vault / "People" / "Ana.md").write_text("Carpintera. Trabaja con [[Luis]].")
+    previous = _adapter(tmp_path, vault)
+    chunk_ids = previous.index_state.get("People/Ana.md").chunk_ids
+    previous.index_state.import_notes({
+        path: state._replace(links=None) for path, state in previous.index_state.notes().items()
+    })
+    previous.index_state.close()
+
+    # Act
+    adapter = _adapter(tmp_path, vault)
+
+    # Assert
+    assert adapter.related_notes("People/Ana.md") == [{"path": "People/Luis.md", "distance": 1}]
+    assert adapter.index_state.get("People/Ana.md").chunk_ids == chunk_ids
+
+
+def test_notes_are_queried_by_frontmatter_and_modification_time(tmp_path, vault):
+    # Arrange
+    (vault / "People" / "Ana.md").write_text("---\nProfesión: Carpintera\n---\nVive en Madrid.")
+    (vault / "People" / "Luis.md").write_text("---\nProfesión: Profesor\n---\nProfesor de música.")
+    os.utime(vault / "People" / "Luis.md", (1_600_000_000, 1_600_000_000))
+    adapter = _adapter(tmp_path, vault)
+
+    # Act
+    carpenters = adapter.query_notes({"Profesión": "carpintera"})
+    recent = adapter.query_notes({"file_modified": {"$gte": "2021-01-01"}})
+    (vault / "People" / "Ana.md").unlink()
+    adapter.sync(force=True)
+
+    # Assert
+    assert [n["path"] for n in carpenters["notes"]] == ["People/Ana.md"]
+    assert [n["path"] for n in recent["notes"]] == ["People/Ana.md"]
+    assert adapter.query_notes({"Profesión": "carpintera"})["total"] == 0
+
+
+def test_text_search_finds_notes_despite_accents_and_typos(tmp_path, vault):
+    # Arrange
+    (vault / "People" / "Luis.md").write_text("---\nProfesión: Profesor\n---\nProfesor de música en Valencia.")
+    adapter = _adapter(tmp_path, vault)
+
+    # Act
+    results = adapter.text_search("profesion valensia")
+
+    # Assert
+    assert results[0]["path"] == "People/Luis.md"
+    assert results[0]["matched"] == "2/2"
+    assert "**Profesión**" in results[0]["content"] and "**Valencia**" in results[0]["content"]
+
+
+def test_sync_fails_instead_of_hanging_when_a_fetch_raises(tmp_path, vault):
+    # Arrange
+    adapter = _adapter(tmp_path, vault)
+    (vault / "People" / "Eva.md").write_text("Pintora.")
+
+    # Act
+    with patch.object(FilesystemObsidianAdapter, "_fetch_note_content", side_effect=UnicodeError("bad bytes")):
+        with pytest.raises(UnicodeError):
+            adapter.sync(force=True)
+    adapter.sync(force=True)
+
+    # Assert
+    assert _indexed_paths(adapter) == ["People/Ana.md", "People/Eva.md", "People/Luis.md"]
+
+
+def test_failed_warm_up_keeps_warming_until_a_later_sync_succeeds(tmp_path, vault):
+    # Arrange
+    config = ObsidianConfig(
+        vault_path=str(vault),
+        persist_directory=str(tmp_path / "chroma"),
+        indexer="filesystem",
+        embedding_provider="local",
+    )
+    adapter = FilesystemObsidianAdapter(config, google_api_key="test-key")
+
+    # Act
+    with patch.object(FilesystemObsidianAdapter, "_detect_changes", return_value=None):
+        with pytest.raises(RuntimeError):
+            adapter._run_blocking(adapter.warm_up())
+    still_warming = adapter.warming
+    adapter.sync(force=True)
+
+    # Assert
+    assert still_warming is True
+    assert adapter.warming is False
+    assert _indexed_paths(adapter) == ["People/Ana.md", "People/Luis.md"]
@@ -0,0 +1,276 @@
+import os
+import time
+import asyncio
+import httpx
+import pytest
+from datetime import datetime
+from unittest.mock import patch
+from src.infrastructure.config import ObsidianConfig
+from src.infrastructure.out_adapters.obsidian.langchain_obsidian_adapter import LangChainObsidianAdapter
+
+def _vault_transport(notes: dict) -> httpx.MockTransport:
+    """Emulates the Obsidian Local REST API over an in-memory vault."""
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/search/":
+            return httpx.Response(200, json=[{"filename": p, "result": {}} for p in notes])
+        path = httpx.URL(request.url).path.removeprefix("/vault/")
+        if path in notes:
+            return httpx.Response(200, text=notes[path])
+        return httpx.Response(404)
+    return httpx.MockTransport(handler)
+
+
+@pytest.fixture
+def adapter(tmp_path):
+    config = ObsidianConfig(
+        vault_path=str(tmp_path / "vault"),
+        persist_directory=str(tmp_path / "chroma"),
+        url="http://127.0.0.1:9",
+        embedding_provider="local",
+    )
+    yield LangChainObsidianAdapter(config, google_api_key="test-key")
+
+
+def _sync(adapter, notes: dict, transport: httpx.MockTransport = None):
+    transport = transport or _vault_transport(notes)
+    adapter.client = httpx.Client(base_url="http://obsidian", transport=transport)
+    adapter._create_async_client = lambda _: httpx.AsyncClient(base_url="http://obsidian", transport=transport)
+    adapter.sync(force=True)
+
+
+def test_resync_does_not_duplicate_chunks(adapter):
+    # Arrange
+    notes = {"People/Ana.md": "# Ana\n\nCarpintera en Madrid."}
+    _sync(adapter, notes)
+    first_ids = set(adapter.vector_store.get(include=[])["ids"])
+
+    # Act
+    _sync(adapter, notes)
+
+    # Assert
+    assert set(adapter.vector_store.get(include=[])["ids"]) == first_ids
+    assert len(first_ids) == 1
+
+
+def test_resync_replaces_stale_chunks_of_modified_note(adapter):
+    # Arrange
+    _sync(adapter, {"People/Ana.md": "Carpintera en Madrid."})
+
+    # Act
+    _sync(adapter, {"People/Ana.md": "Ebanista en Sevilla."})
+
+    # Assert
+    stored = adapter.vector_store.get(where={"path": "People/Ana.md"})
+    assert stored["documents"] == ["Ana\n\nEbanista en Sevilla."]
+
+
+def test_fetch_retries_server_errors(adapter):
+    # Arrange
+    adapter.obs_config.retry_backoff_seconds = 0
+    notes = {"A.md": "Nota A", "B.md": "Nota B"}
+    vault = _vault_transport(notes)
+    failures = {"B.md": 2}
+
+    def flaky(request: httpx.Request) -> httpx.Response:
+        path = request.url.path.removeprefix("/vault/")
+        if failures.get(path):
+            failures[path] -= 1
+            return httpx.Response(503)
+        return vault.handler(request)
+
+    # Act
+    _sync(adapter, notes, transport=httpx.MockTransport(flaky))
+
+    # Assert
+    assert sorted(adapter.vector_store.get()["documents"]) == ["A\n\nNota A", "B\n\nNota B"]
+
+
+def test_search_finds_exact_names_through_keyword_retrieval(adapter):
+    # Arrange
+    notes = {f"Notes/{i}.md": f"Nota genérica número {i} sobre cosas varias." for i in range(30)}
+    notes["People/Zapatero.md"] = "Ramiro Quintanilla arregla zapatos."
+    _sync(adapter, notes)
+
+    # Act
+    results = adapter.search("Quintanilla", k=3)
+
+    # Assert
+    assert results[0]["path"] == "People/Zapatero.md"
+
+
+def test_repeated_search_is_served_from_cache_until_index_changes(adapter):
+    # Arrange
+    _sync(adapter, {"A.md": "Nota sobre carpintería."})
+    adapter.search("carpintería")
+
+    # Act
+    adapter.search("  Carpintería ")
+    hits_before_write = adapter.stats()["result_cache"]["hits"]
+    _sync(adapter, {"A.md": "Nota sobre ebanistería."})
+    results = adapter.search("carpintería")
+
+    # Assert
+    assert hits_before_write == 1
+    assert adapter.stats()["result_cache"]["hits"] == 1
+    assert results[0]["content"].endswith("Nota sobre ebanistería.")
+
+
+def test_search_filters_are_pushed_down_to_both_retrievers(adapter):
+    # Arrange
+    notes = {
+        "Personas/Ana.md": "---\nOficios: [Ebanista]\n---\nAna trabaja la madera.",
+        "Personas/Luis.md": "---\nOficios: [Pintor]\n---\nLuis trabaja la madera.",
+        "Lugares/Taller.md": "El taller donde se trabaja la madera.",
+    }
+    _sync(adapter, notes)
+
+    # Act
+    by_property = adapter.search("madera", filters={"Oficios": "Ebanista"})
+    by_folder = adapter.search("madera", filters={"folder": "Personas"})
+
+    # Assert
+    assert [r["path"] for r in by_property] == ["Personas/Ana.md"]
+    assert sorted(r["path"] for r in by_folder) == ["Personas/Ana.md", "Personas/Luis.md"]
+
+
+def test_reconcile_removes_deleted_notes_and_indexes_renamed_ones(adapter):
+    # Arrange
+    _sync(adapter, {"A.md": "Nota sobre carpintería.", "B.md": "Nota sobre jardinería."})
+    transport = _vault_transport({"A.md": "Nota sobre carpintería.", "Plantas/B.md": "Nota sobre jardinería."})
+    adapter.client = httpx.Client(base_url="http://obsidian", transport=transport)
+    adapter._create_async_client = lambda _: httpx.AsyncClient(base_url="http://obsidian", transport=transport)
+
+    # Act
+    stats = adapter._run_blocking(adapter.reconcile())
+
+    # Assert
+    indexed = sorted({m["path"] for m in adapter.vector_store.get()["metadatas"]})
+    assert indexed == ["A.md", "Plantas/B.md"]
+    assert adapter.last_reconcile["removed_notes"] == 1
+    assert adapter.last_reconcile["added_notes"] == 1
+    assert stats["tombstones"] == 0
+    # One dead entry out of three crosses the default threshold, so the collection was compacted
+    assert stats["dead_entries"] == 0
+    assert stats["live_entries"] == 2
+    assert adapter.last_compaction["dead_entries_removed"] == 1
+    assert adapter.search("jardinería", k=1)[0]["path"] == "Plantas/B.md"
+
+
+def test_notes_synced_by_path_keep_their_modified_date(tmp_path, adapter):
+    # Arrange
+    _sync(adapter, {"A.md": "Nota sobre carpintería."})
+    note = tmp_path / "vault" / "A.md"
+    note.parent.mkdir(parents=True)
+    note.write_text("Nota sobre ebanistería.")
+    edited = datetime(2026, 10, 15, 9, 30).timestamp()
+    os.utime(note, (edited, edited))
+    transport = _vault_transport({"A.md": "Nota sobre ebanistería."})
+    adapter._create_async_client = lambda _: httpx.AsyncClient(base_url="http://obsidian", transport=transport)
+
+    # Act
+    adapter._run_blocking(adapter.async_sync_paths(["A.md"], []))
+
+    # Assert
+    result = adapter.frontmatter_store.query(filters={"file_modified": {"$gte": "2026-10-15"}}, fields=["file_modified"])
+    assert result["notes"] == [{"path": "A.md", "file_modified": "2026-10-15T09:30:00"}]
+
+
+@pytest.mark.parametrize("listing", [{}, {"A.md": "Nota sobre carpintería."}])
+def test_reconcile_keeps_the_index_when_the_listing_looks_wrong(adapter, listing):
+    # Arrange
+    _sync(adapter, {"A.md": "Nota sobre carpintería.", "B.md": "Nota sobre jardinería.", "C.md": "Nota sobre pintura."})
+    ids_before = set(adapter.vector_store.get(include=[])["ids"])
+    transport = _vault_transport(listing)
+    adapter.client = httpx.Client(base_url="http://obsidian", transport=transport)
+
+    # Act
+    with pytest.raises(RuntimeError, match="keeping the index"):
+        adapter._run_blocking(adapter.reconcile())
+
+    # Assert
+    assert set(adapter.vector_store.get(include=[])["ids"]) == ids_before
+    assert sorted(adapter.index_state.notes()) == ["A.md", "B.md", "C.md"]
+    assert adapter.tombstones == set()
+
+
+def test_interrupted_sync_resumes_without_re_embedding(tmp_path, adapter):
+    # Arrange
+    notes = {"A.md": "Nota sobre carpintería.", "B.md": "Nota sobre jardinería."}
+    adapter.obs_config.max_concurrent_requests = 1
+    index_note = adapter._index_note
+
+    def crash_on_second_note(vector_store, path, content):
+        if path == "B.md":
+            raise RuntimeError("Process killed")
+        return index_note(vector_store, path, content)
+
+    adapter._index_note = crash_on_second_note
+    with pytest.raises(RuntimeError, match="Process killed"):
+        _sync(adapter, notes)
+    restarted = LangChainObsidianAdapter(adapter.obs_config, google_api_key="test-key")
+
+    # Act
+    with patch.object(restarted.embeddings, "embed_documents", wraps=restarted.embeddings.embed_documents) as embed:
+        _sync(restarted, notes)
+
+    # Assert
+    embedded = [text for call in embed.call_args_list for text in call.args[0]]
+    assert len(embedded) == 1 and "jardinería" in embedded[0]
+    assert sorted(restarted.index_state.notes()) == ["A.md", "B.md"]
+    assert restarted.index_state.get_meta("last_index_datetime") is not None
+
+
+def test_tombstoned_notes_are_hidden_from_search(adapter):
+    # Arrange
+    _sync(adapter, {"A.md": "Nota sobre carpintería.", "B.md": "Otra nota sobre carpintería."})
+
+    # Act
+    adapter.tombstones.add("B.md")
+    adapter._bump_index_version()
+    results = adapter.search("carpintería")
+
+    # Assert
+    assert [r["path"] for r in results] == ["A.md"]
+
+
+def test_text_search_fills_k_around_tombstoned_notes(adapter):
+    # Arrange
+    _sync(adapter, {"A.md": "Taller de carpintería.", "B.md": "Curso de carpintería.", "C.md": "Libro de carpintería."})
+    adapter.tombstones.add("A.md")
+
+    # Act
+    results = adapter.text_search("carpintería", k=2)
+
+    # Assert
+    assert sorted(r["path"] for r in results) == ["B.md", "C.md"]
+
+
+@pytest.mark.asyncio
+async def test_asearch_matches_search_without_blocking_the_event_loop(adapter):
+    # Arrange
+    _sync(adapter, {"A.md": "Nota sobre carpintería.", "B.md": "Nota sobre jardinería."})
+    expected = adapter.search("carpintería", k=2)
+    adapter.result_cache.clear()
+    vector_search = adapter._vector_search
+
+    def slow_vector_search(*args):
+        time.sleep(0.3)
+        return vector_search(*args)
+
+    adapter._vector_search = slow_vector_search
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    # Act
+    ticker_task = asyncio.create_task(ticker())
+    results = await adapter.asearch("carpintería", k=2)
+    ticker_task.cancel()
+
+    # Assert
+    assert results == expected
+    assert ticks >= 10
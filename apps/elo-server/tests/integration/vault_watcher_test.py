@@ -0,0 +1,71 @@
+import asyncio
+import pytest
+from src.infrastructure.out_adapters.obsidian.vault_watcher import VaultWatcher
+
+
+class BatchRecorder:
+    def __init__(self):
+        self.changed = set()
+        self.deleted = set()
+
+    async def __call__(self, changed, deleted):
+        self.changed.update(changed)
+        self.deleted.update(deleted)
+
+
+async def _wait_for(condition, timeout=5.0):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not condition() and loop.time() < deadline:
+        await asyncio.sleep(0.05)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("use_watchdog", [True, False])
+async def test_watcher_reports_changes_deletes_and_renames(tmp_path, use_watchdog):
+    # Arrange
+    (tmp_path / "People").mkdir()
+    (tmp_path / "People" / "Old.md").write_text("old")
+    (tmp_path / "People" / "Gone.md").write_text("gone")
+    recorder = BatchRecorder()
+    watcher = VaultWatcher(str(tmp_path), recorder, batch_seconds=0.1, poll_interval_seconds=0.1, use_watchdog=use_watchdog)
+    await watcher.start()
+    await asyncio.sleep(0.2)
+
+    # Act
+    (tmp_path / "People" / "New.md").write_text("new")
+    (tmp_path / "People" / "Gone.md").unlink()
+    (tmp_path / "People" / "Old.md").rename(tmp_path / "People" / "Renamed.md")
+    (tmp_path / ".obsidian").mkdir()
+    (tmp_path / ".obsidian" / "workspace.md").write_text("ignored")
+    await _wait_for(lambda: len(recorder.changed) == 2 and len(recorder.deleted) == 2)
+    await watcher.stop()
+
+    # Assert
+    assert recorder.changed == {"People/New.md", "People/Renamed.md"}
+    assert recorder.deleted == {"People/Gone.md", "People/Old.md"}
+
+
+@pytest.mark.asyncio
+async def test_watcher_reports_folders_moved_out_of_and_into_the_vault(tmp_path):
+    # Arrange
+    pytest.importorskip("watchdog")
+    vault = tmp_path / "vault"
+    (vault / "Archive" / "2024").mkdir(parents=True)
+    (vault / "Archive" / "2024" / "Old.md").write_text("old")
+    (tmp_path / "Inbox").mkdir()
+    (tmp_path / "Inbox" / "Idea.md").write_text("idea")
+    recorder = BatchRecorder()
+    watcher = VaultWatcher(str(vault), recorder, batch_seconds=0.1, use_watchdog=True)
+    await watcher.start()
+    await asyncio.sleep(0.2)
+
+    # Act
+    (vault / "Archive").rename(tmp_path / "Archive")
+    (tmp_path / "Inbox").rename(vault / "Inbox")
+    await _wait_for(lambda: "Archive/" in recorder.deleted and recorder.changed)
+    await watcher.stop()
+
+    # Assert
+    assert "Archive/" in recorder.deleted
+    assert recorder.changed == {"Inbox/Idea.md"}
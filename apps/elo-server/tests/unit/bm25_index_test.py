@@ -0,0 +1,88 @@
+import numpy as np
+
+from src.infrastructure.out_adapters.obsidian.bm25_index import BM25Index
+from src.infrastructure.out_adapters.obsidian.retrieval import maximal_marginal_relevance, reciprocal_rank_scores
+
+
+def _index(tmp_path):
+    index = BM25Index(str(tmp_path / "bm25.sqlite"))
+    index.add(
+        ["c1", "c2", "c3"],
+        ["Ana.md", "Luis.md", "Eva.md"],
+        ["Ana es carpintera en Madrid.", "Luis da clases de música.", "Eva trabaja con Ana en la carpintería XK-42."],
+    )
+    return index
+
+
+def test_exact_identifiers_rank_first(tmp_path):
+    # Arrange
+    index = _index(tmp_path)
+
+    # Act
+    hits = index.search("xk-42", k=2)
+
+    # Assert
+    assert [h["id"] for h in hits] == ["c3"]
+    assert hits[0]["path"] == "Eva.md"
+
+
+def test_matching_is_accent_and_case_insensitive(tmp_path):
+    # Arrange
+    index = _index(tmp_path)
+
+    # Act
+    hits = index.search("MUSICA", k=5)
+
+    # Assert
+    assert [h["id"] for h in hits] == ["c2"]
+
+
+def test_deleted_chunks_are_not_returned(tmp_path):
+    # Arrange
+    index = _index(tmp_path)
+
+    # Act
+    index.delete(["c1"])
+
+    # Assert
+    assert [h["id"] for h in index.search("ana", k=5)] == ["c3"]
+    assert index.count() == 2
+
+
+def test_reciprocal_rank_scores_prefer_items_found_by_both_retrievers():
+    # Act
+    scores = reciprocal_rank_scores([["a", "b", "c"], ["d", "c", "a"]])
+
+    # Assert
+    assert sorted(scores, key=scores.get, reverse=True)[:2] == ["a", "c"]
+    assert set(scores) == {"a", "b", "c", "d"}
+    assert scores["a"] == 1 / 61 + 1 / 63
+
+
+def test_maximal_marginal_relevance_skips_near_duplicates():
+    # Arrange
+    vectors = np.array([[1.0, 0.0], [0.999, 0.045], [0.0, 1.0]], dtype=np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    # Act
+    picked = maximal_marginal_relevance([1.0, 0.95, 0.6], vectors, k=2)
+
+    # Assert
+    assert picked == [0, 2]
+
+
+def test_text_search_tolerates_accents_prefixes_and_typos(tmp_path):
+    # Arrange
+    index = _index(tmp_path)
+
+    # Act
+    by_prefix = index.text_search("CARPINT")
+    by_typo = index.text_search("musica lucis")
+    ranked = index.text_search("ana carpinteria")
+
+    # Assert
+    assert {h["path"] for h in by_prefix} == {"Ana.md", "Eva.md"}
+    assert [h["path"] for h in by_typo] == ["Luis.md"]
+    assert by_typo[0]["terms"] == ["luis", "musica"]
+    assert ranked[0]["path"] == "Eva.md"
+    assert ranked[0]["matched"] == ranked[0]["words"] == 2
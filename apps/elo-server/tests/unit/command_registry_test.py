@@ -0,0 +1,29 @@
+from src.infrastructure.out_adapters.ai.command_registry import CommandRegistry
+
+
+def test_match_recognizes_commands_in_english_and_spanish():
+    # Arrange
+    registry = CommandRegistry()
+
+    # Act
+    matches = {
+        text: registry.match(text)
+        for text in ["list n8n workflows", "Muéstrame los flujos de n8n, por favor", "Refresh tools", "Sincroniza el espacio de trabajo"]
+    }
+
+    # Assert
+    assert [command.tool for command in matches.values()] == ["list_n8n_workflows", "list_n8n_workflows", "refresh_local_tools", "sync_workspace"]
+    assert registry.stats() == {"matches": {"list_n8n_workflows": 2, "refresh_local_tools": 1, "sync_workspace": 1}, "misses": 0}
+
+
+def test_match_leaves_open_requests_and_unavailable_tools_to_the_agent():
+    # Arrange
+    registry = CommandRegistry()
+
+    # Act
+    open_request = registry.match("list workflows that mention Ana")
+    unavailable = registry.match("list n8n workflows", available=["refresh_local_tools"])
+
+    # Assert
+    assert open_request is None and unavailable is None
+    assert registry.stats() == {"matches": {}, "misses": 2}
@@ -0,0 +1,40 @@
+from unittest.mock import MagicMock
+from src.infrastructure.out_adapters.obsidian.embedding_cache import CachedEmbeddings, EmbeddingCache
+
+
+def _provider():
+    provider = MagicMock()
+    provider.embed_documents.side_effect = lambda texts: [[float(len(t)), 1.0] for t in texts]
+    return provider
+
+
+def test_only_uncached_chunks_are_embedded(tmp_path):
+    # Arrange
+    provider = _provider()
+    embeddings = CachedEmbeddings(provider, EmbeddingCache(str(tmp_path / "cache.sqlite")), model="m", task_type="doc")
+    embeddings.embed_documents(["alpha", "beta"])
+
+    # Act
+    vectors = embeddings.embed_documents(["alpha", "gamma!", "beta"])
+
+    # Assert
+    assert vectors == [[5.0, 1.0], [6.0, 1.0], [4.0, 1.0]]
+    assert provider.embed_documents.call_args_list[-1].args[0] == ["gamma!"]
+    assert embeddings.hits == 2
+
+
+def test_cache_survives_reopen_and_is_keyed_by_model(tmp_path):
+    # Arrange
+    db_path = str(tmp_path / "cache.sqlite")
+    CachedEmbeddings(_provider(), EmbeddingCache(db_path), model="m1").embed_documents(["alpha"])
+    provider = _provider()
+
+    # Act
+    same_model = CachedEmbeddings(provider, EmbeddingCache(db_path), model="m1")
+    same_model.embed_documents(["alpha"])
+    other_model = CachedEmbeddings(provider, EmbeddingCache(db_path), model="m2")
+    other_model.embed_documents(["alpha"])
+
+    # Assert
+    assert provider.embed_documents.call_count == 1
+    assert same_model.hits == 1 and other_model.misses == 1
@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from src.infrastructure.config import ObsidianConfig
+from src.infrastructure.out_adapters.obsidian.embedding_providers import TruncatedEmbeddings, collection_name
+
+
+def test_truncation_keeps_the_leading_components_renormalized():
+    # Arrange
+    full = DeterministicFakeEmbedding(size=64)
+    truncated = TruncatedEmbeddings(full, dimensions=16)
+
+    # Act
+    vector = truncated.embed_query("Carpintero")
+    documents = truncated.embed_documents(["Carpintero"])
+
+    # Assert
+    expected = np.asarray(full.embed_query("Carpintero")[:16])
+    assert len(vector) == 16
+    assert np.linalg.norm(vector) == pytest.approx(1.0, abs=1e-5)
+    assert np.allclose(vector, expected / np.linalg.norm(expected), atol=1e-6)
+    assert documents == [vector]
+
+
+@pytest.mark.parametrize("settings, expected", [
+    ({}, "langchain"),
+    ({"embedding_dimensions": 768}, "vault-models-gemini-embedding-001-768d"),
+    ({"embedding_provider": "local"}, "vault-hashing-ngram-512"),
+    ({"embedding_provider": "local", "embedding_dimensions": 256}, "vault-hashing-ngram-256"),
+])
+def test_collection_name_records_provider_and_width(settings, expected):
+    # Act / Assert
+    assert collection_name(ObsidianConfig(**settings)) == expected
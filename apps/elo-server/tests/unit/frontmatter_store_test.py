@@ -0,0 +1,80 @@
+import pytest
+
+from src.infrastructure.out_adapters.obsidian.frontmatter_store import FrontmatterStore, extract_properties
+
+
+def _store():
+    store = FrontmatterStore()
+    store.set("Personas/Ana.md", {"Profesión": "Carpintera", "Edad": 34, "Oficios": ["Ebanista", "Tallista"]}, "2026-10-15T09:00:00")
+    store.set("Personas/Luis.md", {"Profesión": "Profesor", "Edad": 51}, "2026-09-01T12:00:00")
+    store.set("Personas/Eva.md", {"Profesión": "carpintera", "Oficios": ["Ebanista"]}, "2026-10-16T18:30:00")
+    store.set("Mi mundo/Madrid.md", {}, "2026-10-16T08:00:00")
+    return store
+
+
+def test_filters_ignore_case_and_accents_and_match_list_items():
+    # Arrange
+    store = _store()
+
+    # Act
+    by_profession = store.query({"Profesión": "CARPINTERA"})
+    by_trade = store.query({"Oficios": "ebanista", "folder": "Personas"})
+    recent = store.query({"file_modified": {"$gte": "2026-10-12"}, "folder": "Mi mundo"})
+
+    # Assert
+    assert [n["path"] for n in by_profession["notes"]] == ["Personas/Ana.md", "Personas/Eva.md"]
+    assert by_trade["total"] == 2
+    assert [n["path"] for n in recent["notes"]] == ["Mi mundo/Madrid.md"]
+
+
+def test_file_time_does_not_hide_a_modified_property():
+    # Arrange
+    store = FrontmatterStore()
+
+    # Act
+    store.set("Diario/Hoy.md", {"modified": "2026-01-02"}, "2026-10-16T08:00:00")
+
+    # Assert
+    result = store.query({"modified": "2026-01-02"}, fields=["modified", "file_modified"])
+    assert result["notes"] == [{"path": "Diario/Hoy.md", "modified": "2026-01-02", "file_modified": "2026-10-16T08:00:00"}]
+
+
+def test_sorting_grouping_and_stats():
+    # Arrange
+    store = _store()
+
+    # Act
+    result = store.query({"folder": "Personas"}, sort_by="Edad", descending=True, group_by="Oficios", stats="Edad")
+
+    # Assert
+    assert result["notes"] == [
+        {"path": "Personas/Luis.md", "Edad": 51, "Oficios": None},
+        {"path": "Personas/Ana.md", "Edad": 34, "Oficios": ["Ebanista", "Tallista"]},
+        {"path": "Personas/Eva.md", "Edad": None, "Oficios": ["Ebanista"]},
+    ]
+    assert result["groups"] == {"Ebanista": 2, "None": 1, "Tallista": 1}
+    assert result["stats"] == {"count": 2, "min": 34, "max": 51, "sum": 85, "avg": 42.5}
+
+
+def test_updates_and_removals_keep_the_indexes_in_step():
+    # Arrange
+    store = _store()
+
+    # Act
+    store.set("Personas/Ana.md", {"Profesión": "Pintora", "Edad": 35})
+    store.remove("Personas/Luis.md")
+
+    # Assert
+    assert store.query({"Profesión": "Carpintera"})["total"] == 1
+    assert [n["path"] for n in store.query({"Edad": {"$gt": 30}})["notes"]] == ["Personas/Ana.md"]
+    assert store.query({"Oficios": {"$ne": "Tallista"}, "folder": "Personas"})["total"] == 2
+    with pytest.raises(ValueError, match="Unknown property"):
+        store.query({"Ciudad": "Madrid"})
+
+
+def test_extract_properties_flattens_frontmatter():
+    # Act
+    properties = extract_properties("---\nProfesión: \"[[Carpintera]]\"\nOficios:\n  - Ebanista\nEdad: 34\n---\nTexto")
+
+    # Assert
+    assert properties == {"Profesión": "Carpintera", "Oficios": ["Ebanista"], "Edad": 34}
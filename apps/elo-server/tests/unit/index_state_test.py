@@ -0,0 +1,77 @@
+import sqlite3
+
+from src.infrastructure.out_adapters.obsidian.index_state import IndexStateStore, content_hash
+
+
+def test_committed_notes_survive_reopen_with_increasing_versions(tmp_path):
+    # Arrange
+    db_path = str(tmp_path / "state.sqlite")
+    store = IndexStateStore(db_path, "vault-a")
+    first = store.commit_note("A.md", content_hash("uno"), ["c1", "c2"], mtime_ns=10, size=3)
+    second = store.commit_note("B.md", content_hash("dos"), [])
+    store.close()
+
+    # Act
+    reopened = IndexStateStore(db_path, "vault-a")
+    note = reopened.get("A.md")
+
+    # Assert
+    assert second > first
+    assert note.chunk_ids == ["c1", "c2"]
+    assert (note.content_hash, note.mtime_ns, note.size, note.index_version) == (content_hash("uno"), 10, 3, first)
+    assert sorted(reopened.notes()) == ["A.md", "B.md"]
+
+
+def test_collections_are_isolated_and_cleared_independently(tmp_path):
+    # Arrange
+    db_path = str(tmp_path / "state.sqlite")
+    a = IndexStateStore(db_path, "vault-a")
+    b = IndexStateStore(db_path, "vault-b")
+    a.commit_note("A.md", "h", ["c1"])
+    a.set_meta(last_index_datetime="2026-01-01T00:00:00", tombstones=["Old.md"])
+    b.commit_note("A.md", "h", ["c9"])
+
+    # Act
+    a.clear()
+
+    # Assert
+    assert a.notes() == {}
+    assert a.get_meta("last_index_datetime") is None
+    assert b.get("A.md").chunk_ids == ["c9"]
+
+
+def test_deleted_and_touched_notes(tmp_path):
+    # Arrange
+    store = IndexStateStore(str(tmp_path / "state.sqlite"), "vault")
+    store.commit_note("A.md", "h1", ["c1"], mtime_ns=1, size=1)
+    store.commit_note("B.md", "h2", ["c2"], mtime_ns=1, size=1)
+
+    # Act
+    store.touch("A.md", mtime_ns=5, size=7)
+    store.delete_notes(["B.md"])
+
+    # Assert
+    assert store.get("B.md") is None
+    assert (store.get("A.md").mtime_ns, store.get("A.md").size, store.get("A.md").content_hash) == (5, 7, "h1")
+
+
+def test_state_files_without_links_and_properties_are_upgraded(tmp_path):
+    # Arrange
+    db_path = str(tmp_path / "state.sqlite")
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "CREATE TABLE notes (collection TEXT NOT NULL, path TEXT NOT NULL, content_hash TEXT, chunk_ids TEXT, "
+        "mtime_ns INTEGER, size INTEGER, index_version INTEGER NOT NULL, PRIMARY KEY (collection, path))"
+    )
+    conn.execute("INSERT INTO notes VALUES ('vault', 'A.md', 'h', '[\"c1\"]', 1, 1, 1)")
+    conn.commit()
+    conn.close()
+
+    # Act
+    store = IndexStateStore(db_path, "vault")
+    before = store.get("A.md")
+    store.set_extracted("A.md", ["b"], {"Profesión": "Carpintera"})
+
+    # Assert
+    assert (before.chunk_ids, before.links, before.properties) == (["c1"], None, None)
+    assert (store.get("A.md").links, store.get("A.md").properties) == (["b"], {"Profesión": "Carpintera"})
@@ -0,0 +1,235 @@
+import asyncio
+import json
+import threading
+import pytest
+from typing import Any, Iterator, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import RunnableLambda
+from langchain_core.tools import tool
+
+from src.infrastructure.out_adapters.ai.langgraph_agent_adapter import LangGraphAgentAdapter, Plan
+
+
+class ScriptedChatModel(BaseChatModel):
+    """Streams one scripted reply per call: a tool call first, then the answer word by word."""
+
+    replies: List[Any]
+    calls: int = 0
+    system_prompts: List[str] = []
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def with_structured_output(self, schema, **kwargs):
+        return RunnableLambda(lambda _: Plan(steps=["Look up Ana", "Answer"]))
+
+    def _next_reply(self, messages: List[BaseMessage]) -> Any:
+        self.system_prompts.append(messages[0].content)
+        reply = self.replies[min(self.calls, len(self.replies) - 1)]
+        self.calls += 1
+        return reply
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager=None, **kwargs) -> ChatResult:
+        reply = self._next_reply(messages)
+        message = AIMessage(content="", tool_calls=[reply]) if isinstance(reply, dict) else AIMessage(content=reply)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager=None, **kwargs) -> Iterator[ChatGenerationChunk]:
+        reply = self._next_reply(messages)
+        if isinstance(reply, dict):
+            chunks = [AIMessageChunk(content="", tool_call_chunks=[{**reply, "args": json.dumps(reply["args"]), "index": 0}])]
+        else:
+            chunks = [AIMessageChunk(content=word + " ") for word in reply.split(" ")]
+        for chunk in chunks:
+            if run_manager:
+                run_manager.on_llm_new_token(chunk.content, chunk=ChatGenerationChunk(message=chunk))
+            yield ChatGenerationChunk(message=chunk)
+
+
+@tool
+def lookup_person(name: str) -> str:
+    """Looks up a person in the vault."""
+    return f"{name} is a carpenter."
+
+
+@tool
+def list_n8n_workflows() -> str:
+    """Lists all n8n workflows available."""
+    return "Available n8n workflows: daily-digest, backup"
+
+
+slow_lookups = {"started": 0, "finished": 0}
+
+
+@tool
+async def slow_lookup(name: str) -> str:
+    """Looks up a person in a slow archive."""
+    slow_lookups["started"] += 1
+    await asyncio.sleep(30)
+    slow_lookups["finished"] += 1
+    return f"{name} is a carpenter."
+
+
+def make_adapter(tmp_path, planner_mode: str) -> LangGraphAgentAdapter:
+    adapter = LangGraphAgentAdapter(api_key="test", base_storage_path=str(tmp_path), planner_mode=planner_mode)
+    adapter.llm = ScriptedChatModel(replies=[
+        {"name": "lookup_person", "args": {"name": "Ana"}, "id": "call-1"},
+        "Ana is a carpenter.",
+    ])
+    adapter.tools = [lookup_person, list_n8n_workflows]
+    adapter._initialize_agent()
+    return adapter
+
+
+@pytest.fixture
+def adapter(tmp_path):
+    return make_adapter(tmp_path, planner_mode="always")
+
+
+@pytest.mark.asyncio
+async def test_astream_emits_plan_tool_events_and_tokens_in_order(adapter):
+    # Arrange
+    input_data = {"messages": [{"type": "human", "content": "Who is Ana?"}]}
+
+    # Act
+    chunks = [chunk async for chunk in adapter.astream(input_data, {"configurable": {"user_id": "u1"}})]
+
+    # Assert
+    assert chunks[0].additional_kwargs["plan"] == ["Look up Ana", "Answer"]
+    assert chunks[1].tool_call_chunks[0]["name"] == "lookup_person"
+    assert isinstance(chunks[2], ToolMessage) and chunks[2].content == "Ana is a carpenter."
+    tokens = chunks[3:]
+    assert len(tokens) > 1 and all(isinstance(chunk, AIMessageChunk) for chunk in tokens)
+    assert "".join(chunk.content for chunk in tokens).strip() == "Ana is a carpenter."
+
+
+def test_stream_yields_the_same_chunks_from_sync_code(adapter):
+    # Arrange
+    input_data = {"messages": [{"type": "human", "content": "Who is Ana?"}]}
+
+    # Act
+    chunks = list(adapter.stream(input_data, {"configurable": {"user_id": "u2"}}))
+
+    # Assert
+    assert chunks[0].additional_kwargs["plan"] == ["Look up Ana", "Answer"]
+    assert "".join(chunk.content for chunk in chunks if isinstance(chunk, AIMessageChunk)).strip() == "Ana is a carpenter."
+
+
+def test_closing_the_stream_cancels_the_turn(adapter):
+    # Arrange
+    adapter.llm.replies = [{"name": "slow_lookup", "args": {"name": "Ana"}, "id": "call-1"}, "Ana is a carpenter."]
+    adapter.tools = [slow_lookup]
+    adapter._initialize_agent()
+    stream = adapter.stream({"messages": [{"type": "human", "content": "Who is Ana?"}]}, {"configurable": {"user_id": "u6"}})
+
+    threads_before = set(threading.enumerate())
+
+    # Act
+    next(stream)
+    stream.close()
+
+    # Assert
+    helpers = set(threading.enumerate()) - threads_before
+    for thread in helpers:
+        thread.join(timeout=5)
+    assert helpers and not any(thread.is_alive() for thread in helpers)
+    assert slow_lookups["finished"] == 0
+    assert adapter.llm.calls <= 1  # The answer after the tool is never requested
+
+
+@pytest.mark.asyncio
+async def test_executor_is_compiled_once_and_gets_the_plan_of_each_turn(adapter):
+    # Arrange
+    executor_agent = adapter.executor_agent
+    input_data = {"messages": [{"type": "human", "content": "Who is Ana?"}]}
+
+    # Act
+    await adapter.ainvoke(input_data, {"configurable": {"user_id": "u3"}})
+    await adapter.ainvoke(input_data, {"configurable": {"user_id": "u3"}})
+
+    # Assert
+    assert adapter.executor_agent is executor_agent
+    assert len(adapter.llm.system_prompts) == 3
+    assert all("1. Look up Ana" in prompt and "2. Answer" in prompt for prompt in adapter.llm.system_prompts)
+
+
+@pytest.mark.asyncio
+async def test_simple_request_skips_the_planner_with_an_implicit_plan(tmp_path):
+    # Arrange
+    adapter = make_adapter(tmp_path, planner_mode="auto")
+    input_data = {"messages": [{"type": "human", "content": "Who is Ana?"}]}
+
+    # Act
+    chunks = [chunk async for chunk in adapter.astream(input_data, {"configurable": {"user_id": "u4"}})]
+
+    # Assert
+    assert not any(chunk.additional_kwargs.get("plan") for chunk in chunks if isinstance(chunk, AIMessageChunk))
+    assert all("1. Who is Ana?" in prompt for prompt in adapter.llm.system_prompts)
+    stats = adapter.route_stats.snapshot()
+    assert stats["direct"]["count"] == 1 and stats["direct"]["reasons"] == {"single intent": 1}
+
+
+@pytest.mark.asyncio
+async def test_known_command_runs_its_tool_without_calling_the_model(tmp_path):
+    # Arrange
+    adapter = make_adapter(tmp_path, planner_mode="auto")
+    config = {"configurable": {"user_id": "u5"}}
+
+    # Act
+    reply = await adapter.ainvoke({"messages": [{"type": "human", "content": "Lista los workflows de n8n"}]}, config)
+    follow_up = await adapter.ainvoke({"messages": [{"type": "human", "content": "Who is Ana?"}]}, config)
+
+    # Assert
+    assert reply.content == "Available n8n workflows: daily-digest, backup"
+    assert follow_up.content.strip() == "Ana is a carpenter."
+    assert len(adapter.llm.system_prompts) == 2  # Only the follow-up reached the model
+    assert adapter.command_registry.stats() == {"matches": {"list_n8n_workflows": 1}, "misses": 1}
+    history = adapter.graph.get_state(adapter._ensure_config(config)).values["messages"]
+    assert [message.type for message in history[:2]] == ["human", "ai"]
+
+
+def test_known_command_skips_the_model_from_sync_code(tmp_path):
+    # Arrange
+    adapter = make_adapter(tmp_path, planner_mode="auto")
+
+    # Act
+    reply = adapter.invoke({"messages": [{"type": "human", "content": "Lista los workflows de n8n"}]}, {"configurable": {"user_id": "u7"}})
+
+    # Assert
+    assert reply.content == "Available n8n workflows: daily-digest, backup"
+    assert adapter.llm.calls == 0
+    assert adapter.route_stats.snapshot()["command"]["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_known_command_skips_the_model_through_ask(tmp_path):
+    # Arrange
+    adapter = make_adapter(tmp_path, planner_mode="auto")
+
+    # Act
+    reply = await adapter.ask("Lista los workflows de n8n", user_id="u8")
+
+    # Assert
+    assert reply == "Available n8n workflows: daily-digest, backup"
+    assert adapter.llm.calls == 0
+    assert adapter.command_registry.stats() == {"matches": {"list_n8n_workflows": 1}, "misses": 0}
+
+
+@pytest.mark.asyncio
+async def test_ask_records_the_route_of_each_turn(tmp_path):
+    # Arrange
+    adapter = make_adapter(tmp_path, planner_mode="auto")
+
+    # Act
+    reply = await adapter.ask("Who is Ana?", user_id="u9")
+
+    # Assert
+    assert reply.strip() == "Ana is a carpenter."
+    assert adapter.route_stats.snapshot()["direct"]["reasons"] == {"single intent": 1}
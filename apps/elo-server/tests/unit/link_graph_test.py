@@ -0,0 +1,49 @@
+from src.infrastructure.out_adapters.obsidian.link_graph import LinkGraph, extract_links
+
+
+def test_extract_links_normalizes_wikilinks_embeds_and_markdown_links():
+    # Arrange
+    content = (
+        "Vive en [[Madrid|la capital]] y trabaja con [[People/Luis.md#Taller]].\n"
+        "![[Plano.png]] ![[Receta de Paella]] [notas](Otros/Carpintería%20básica.md) [web](https://example.com/a.md)"
+    )
+
+    # Act
+    links = extract_links(content)
+
+    # Assert
+    assert links == ["madrid", "people/luis", "receta de paella", "otros/carpinteria basica"]
+
+
+def test_links_resolve_by_name_once_the_target_note_exists():
+    # Arrange
+    graph = LinkGraph()
+    graph.set_links("People/Ana.md", ["luis", "madrid"])
+
+    # Act
+    before = graph.neighbors("People/Ana.md")
+    graph.set_links("People/Luis.md", ["people/ana"])
+    after = graph.neighbors("People/Ana.md")
+
+    # Assert
+    assert before == []
+    assert after == [("People/Luis.md", 1)]
+    assert graph.neighbors("People/Ana.md", direction="in") == [("People/Luis.md", 1)]
+    assert graph.resolve("luis") == "People/Luis.md"
+
+
+def test_neighbors_within_hops_and_removal():
+    # Arrange
+    graph = LinkGraph()
+    graph.load({"A.md": ["b"], "B.md": ["c"], "C.md": [], "D.md": ["a"]})
+
+    # Act
+    two_hops = graph.neighbors("A.md", hops=2)
+    outgoing = graph.neighbors("A.md", hops=2, direction="out")
+    graph.remove("B.md")
+
+    # Assert
+    assert two_hops == [("B.md", 1), ("D.md", 1), ("C.md", 2)]
+    assert outgoing == [("B.md", 1), ("C.md", 2)]
+    assert graph.neighbors("A.md", hops=2) == [("D.md", 1)]
+    assert graph.expand({"D.md": 1.0}, hops=2, decay=0.5) == {"A.md": (0.5, "D.md")}
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+from src.infrastructure.out_adapters.obsidian.local_embeddings import HashingNgramEmbeddings
+
+
+def _cosine(a, b):
+    return float(np.dot(a, b))
+
+
+def test_vectors_are_deterministic_and_normalized():
+    # Arrange
+    embeddings = HashingNgramEmbeddings(dimensions=256)
+
+    # Act
+    first = embeddings.embed_query("Carpintero en Madrid")
+    second = HashingNgramEmbeddings(dimensions=256).embed_query("Carpintero en Madrid")
+
+    # Assert
+    assert first == second
+    assert len(first) == 256
+    assert np.linalg.norm(first) == pytest.approx(1.0, abs=1e-5)
+
+
+def test_similar_spellings_are_closer_than_unrelated_text():
+    # Arrange
+    embeddings = HashingNgramEmbeddings()
+    query = embeddings.embed_query("carpinteria")
+
+    # Act
+    close, far = embeddings.embed_documents(["Taller de Carpintería", "Receta de gazpacho"])
+
+    # Assert
+    assert _cosine(query, close) > _cosine(query, far)
+
+
+def test_batches_match_single_embeddings():
+    # Arrange
+    embeddings = HashingNgramEmbeddings(batch_size=2)
+    texts = ["uno", "dos", "tres", ""]
+
+    # Act
+    batched = embeddings.embed_documents(texts)
+
+    # Assert
+    assert batched == [embeddings.embed_query(t) for t in texts]
+    assert not any(batched[-1])
+
+
+@pytest.mark.asyncio
+async def test_async_methods_run_on_the_worker_pool():
+    # Arrange
+    embeddings = HashingNgramEmbeddings()
+
+    # Act
+    vector = await embeddings.aembed_query("Madrid")
+    vectors = await embeddings.aembed_documents(["Madrid"])
+
+    # Assert
+    assert vectors == [vector]
@@ -0,0 +1,93 @@
+from src.infrastructure.out_adapters.obsidian.markdown_chunker import MarkdownChunker, parse_frontmatter
+
+NOTE = """---
+Profesión: "[[Carpintero]]"
+Oficios:
+  - "[[Ebanista]]"
+  - Tallista
+tags: [persona]
+---
+Intro de Ana.
+
+# Trabajo
+
+## Taller
+Tiene un taller en Madrid.
+
+```python
+# not a heading
+```
+
+## Clientes
+Trabaja para museos.
+
+# Familia
+Dos hermanos.
+"""
+
+
+def test_frontmatter_is_parsed_once_and_attached_as_metadata():
+    # Arrange
+    chunker = MarkdownChunker(chunk_size=1500)
+
+    # Act
+    chunks = chunker.split("Personas/Ana.md", NOTE, schema={"Profesión": {}, "Oficios": {}})
+
+    # Assert
+    for chunk in chunks:
+        assert chunk.metadata["Profesión"] == "Carpintero"
+        assert chunk.metadata["Oficios"] == ["Ebanista", "Tallista"]
+        assert chunk.metadata["folder"] == "Personas"
+        assert "tags" not in chunk.metadata
+    assert "Profesión: Carpintero" in chunks[0].page_content
+
+
+def test_sections_keep_their_heading_path():
+    # Arrange
+    chunker = MarkdownChunker(chunk_size=80)
+
+    # Act
+    chunks = chunker.split("Personas/Ana.md", NOTE)
+
+    # Assert
+    headings = [c.metadata["heading"] for c in chunks]
+    assert "Trabajo > Taller" in headings
+    assert "Trabajo > Clientes" in headings
+    assert "Familia" in headings
+    taller = chunks[headings.index("Trabajo > Taller")]
+    assert taller.page_content.startswith("Ana > Trabajo > Taller\n\n")
+    assert "# not a heading" in taller.page_content
+
+
+def test_small_sections_are_packed_without_overlap():
+    # Arrange
+    chunker = MarkdownChunker(chunk_size=1500)
+
+    # Act
+    chunks = chunker.split("Personas/Ana.md", NOTE)
+
+    # Assert
+    assert len(chunks) == 1
+    assert chunks[0].page_content.count("Tiene un taller en Madrid.") == 1
+
+
+def test_oversized_sections_are_split_on_paragraphs():
+    # Arrange
+    chunker = MarkdownChunker(chunk_size=100)
+    body = "# Largo\n\n" + "\n\n".join(f"Párrafo {i} " + "x" * 60 for i in range(4))
+
+    # Act
+    chunks = chunker.split("Largo.md", body)
+
+    # Assert
+    assert len(chunks) == 4
+    assert [c.metadata["chunk_index"] for c in chunks] == [0, 1, 2, 3]
+
+
+def test_invalid_frontmatter_is_kept_as_text():
+    # Act
+    frontmatter, body = parse_frontmatter("---\n: [unclosed\n---\nBody")
+
+    # Assert
+    assert frontmatter == {}
+    assert body.startswith("---")
@@ -0,0 +1,40 @@
+import pytest
+from src.infrastructure.out_adapters.obsidian.metadata_filter import build_where
+
+SCHEMA = {"Oficios": "multitext", "Edad": "number", "Ciudad": "text"}
+
+
+def test_list_properties_use_contains_and_scalars_use_eq():
+    # Act
+    where = build_where({"Oficios": "Ebanista", "Ciudad": "[[Madrid]]"}, SCHEMA)
+
+    # Assert
+    assert where == {"$and": [{"Oficios": {"$contains": "Ebanista"}}, {"Ciudad": {"$eq": "Madrid"}}]}
+
+
+def test_list_values_match_any_item():
+    # Act
+    where = build_where({"folder": ["Personas", "Clientes"]}, SCHEMA)
+
+    # Assert
+    assert where == {"$or": [{"folder": {"$eq": "Personas"}}, {"folder": {"$eq": "Clientes"}}]}
+
+
+def test_operator_dicts_are_passed_through():
+    # Act
+    where = build_where({"Edad": {"$gte": 30}}, SCHEMA)
+
+    # Assert
+    assert where == {"Edad": {"$gte": 30}}
+
+
+def test_unknown_keys_are_rejected_when_a_schema_exists():
+    # Act / Assert
+    with pytest.raises(ValueError, match="Oficio"):
+        build_where({"Oficio": "Ebanista"}, SCHEMA)
+
+
+def test_empty_filters_mean_no_where_clause():
+    # Act / Assert
+    assert build_where({}, SCHEMA) is None
+    assert build_where(None) is None
@@ -0,0 +1,114 @@
+import numpy as np
+import pytest
+from src.infrastructure.out_adapters.obsidian import numpy_vector_store
+from src.infrastructure.out_adapters.obsidian.numpy_vector_store import NumpyVectorStore
+
+
+def _vectors(n, dim=32, seed=0):
+    return np.random.default_rng(seed).standard_normal((n, dim)).astype(np.float32)
+
+
+def _fill(store, vectors):
+    ids = [f"c{i}" for i in range(len(vectors))]
+    metadatas = [{"path": f"n{i % 10}.md", "tags": ["par" if i % 2 == 0 else "impar"]} for i in range(len(vectors))]
+    store.add_embeddings(ids, vectors.tolist(), [f"doc {i}" for i in range(len(vectors))], metadatas)
+    return ids
+
+
+@pytest.mark.parametrize("dtype", ["int8", "float16"])
+def test_exact_search_finds_the_nearest_vector(tmp_path, dtype):
+    # Arrange
+    store = NumpyVectorStore(str(tmp_path), dtype=dtype)
+    vectors = _vectors(500)
+    _fill(store, vectors)
+
+    # Act
+    results = store.similarity_search_by_vector((vectors[42] + 0.01).tolist(), k=3)
+
+    # Assert
+    assert results[0].id == "c42"
+    assert results[0].page_content == "doc 42"
+    assert len(results) == 3
+
+
+def test_filters_restrict_search_and_get(tmp_path):
+    # Arrange
+    store = NumpyVectorStore(str(tmp_path))
+    vectors = _vectors(100)
+    _fill(store, vectors)
+
+    # Act
+    filtered = store.similarity_search_by_vector(vectors[3].tolist(), k=5, filter={"tags": {"$contains": "par"}})
+    by_path = store.get(where={"path": "n3.md"}, include=[])
+
+    # Assert
+    assert all("par" in d.metadata["tags"] for d in filtered)
+    assert by_path["ids"] == [f"c{i}" for i in range(3, 100, 10)]
+    assert by_path["documents"] is None
+
+
+def test_deleted_slots_are_reused_and_state_survives_reopen(tmp_path):
+    # Arrange
+    store = NumpyVectorStore(str(tmp_path))
+    vectors = _vectors(20)
+    _fill(store, vectors)
+    store.delete(["c0", "c1"])
+    store.add_embeddings(["new"], [vectors[0].tolist()], ["nuevo"], [{"path": "new.md"}])
+    store.close()
+
+    # Act
+    reopened = NumpyVectorStore(str(tmp_path))
+
+    # Assert
+    assert len(reopened.get(include=[])["ids"]) == 19
+    assert reopened._count == 20
+    assert reopened.similarity_search_by_vector(vectors[0].tolist(), k=1)[0].id == "new"
+    assert "c1" not in reopened.get(include=[])["ids"]
+
+
+def test_compaction_drops_deleted_rows_and_keeps_search(tmp_path):
+    # Arrange
+    store = NumpyVectorStore(str(tmp_path))
+    vectors = _vectors(2000)
+    ids = _fill(store, vectors)
+    store.delete(ids[:1500])
+
+    # Act
+    reclaimed = store.compact()
+    store.close()
+    reopened = NumpyVectorStore(str(tmp_path))
+
+    # Assert
+    assert reclaimed == 1500
+    assert reopened._capacity == reopened._count == reopened.count() == 500
+    assert (tmp_path / "vectors.bin").stat().st_size == 500 * 32
+    assert reopened.similarity_search_by_vector(vectors[1700].tolist(), k=1)[0].id == "c1700"
+    assert reopened.get(where={"path": "n3.md"}, include=[])["ids"] == [f"c{i}" for i in range(1503, 2000, 10)]
+
+
+def test_changing_dtype_rebuilds_the_store(tmp_path):
+    # Arrange
+    _fill(NumpyVectorStore(str(tmp_path), dtype="int8"), _vectors(10))
+
+    # Act
+    store = NumpyVectorStore(str(tmp_path), dtype="float16")
+
+    # Assert
+    assert store.get(include=[])["ids"] == []
+
+
+@pytest.mark.skipif(numpy_vector_store.hnswlib is None, reason="hnswlib is not installed")
+def test_hnsw_index_agrees_with_exact_search_and_follows_writes(tmp_path):
+    # Arrange
+    store = NumpyVectorStore(str(tmp_path), index="hnsw")
+    vectors = _vectors(2000)
+    _fill(store, vectors)
+    store.similarity_search_by_vector(vectors[0].tolist(), k=1)
+
+    # Act
+    store.delete(["c7"])
+    store.add_embeddings(["extra"], [vectors[7].tolist()], ["extra"], [{"path": "x.md"}])
+    hits = [store.similarity_search_by_vector(vectors[i].tolist(), k=1)[0].id for i in (5, 7, 1500)]
+
+    # Assert
+    assert hits == ["c5", "extra", "c1500"]
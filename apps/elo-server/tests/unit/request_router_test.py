@@ -0,0 +1,54 @@
+from langchain_core.messages import AIMessage, HumanMessage
+
+from src.infrastructure.out_adapters.ai.request_router import ROUTE_DIRECT, ROUTE_PLAN, RouteStats, route_request
+
+
+def test_route_request_bypasses_the_planner_for_small_talk_and_single_intents():
+    # Arrange
+    requests = ["hola", "¡Muchas gracias!", "¿Quién es Ana?", "Busca notas sobre carpintería"]
+
+    # Act
+    routes = [route_request([HumanMessage(content=text)])[0] for text in requests]
+
+    # Assert
+    assert routes == [ROUTE_DIRECT] * 4
+
+
+def test_route_request_plans_long_chained_and_follow_up_requests():
+    # Arrange
+    long_request = "Necesito que revises todas las notas de proyectos abiertos y me digas cuáles llevan más de un mes sin cambios"
+    chained = "Busca a Ana y luego avísame"
+    listed = "Haz esto:\n1. Busca a Ana\n2. Resume su nota"
+    follow_up = [HumanMessage(content="Crea el flujo"), AIMessage(content="DELEGATED_TO_HUMAN: I need the webhook URL"), HumanMessage(content="Ya está")]
+
+    # Act
+    routes = {
+        "long": route_request([HumanMessage(content=long_request)]),
+        "chained": route_request([HumanMessage(content=chained)]),
+        "listed": route_request([HumanMessage(content=listed)]),
+        "follow_up": route_request(follow_up),
+        "forced": route_request([HumanMessage(content="hola")], mode="always"),
+    }
+
+    # Assert
+    assert routes["long"] == (ROUTE_PLAN, "long request")
+    assert routes["chained"] == (ROUTE_PLAN, "several tasks")
+    assert routes["listed"][0] == ROUTE_PLAN
+    assert routes["follow_up"] == (ROUTE_PLAN, "follow-up to a delegation")
+    assert routes["forced"] == (ROUTE_PLAN, "planner always on")
+    assert route_request([HumanMessage(content=long_request)], mode="never")[0] == ROUTE_DIRECT
+
+
+def test_route_stats_aggregate_latency_per_route():
+    # Arrange
+    stats = RouteStats()
+
+    # Act
+    stats.record(ROUTE_DIRECT, "small talk", 0.5)
+    stats.record(ROUTE_DIRECT, "single intent", 1.5)
+    stats.record(ROUTE_PLAN, "long request", 3.0)
+
+    # Assert
+    snapshot = stats.snapshot()
+    assert snapshot[ROUTE_DIRECT] == {"count": 2, "avg_ms": 1000.0, "max_ms": 1500.0, "reasons": {"small talk": 1, "single intent": 1}}
+    assert snapshot[ROUTE_PLAN]["count"] == 1
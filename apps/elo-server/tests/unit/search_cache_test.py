@@ -0,0 +1,35 @@
+import time
+from src.infrastructure.out_adapters.obsidian.search_cache import LRUCache, normalize_query
+
+
+def test_least_recently_used_entry_is_evicted():
+    # Arrange
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+
+    # Act
+    cache.put("c", 3)
+
+    # Assert
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_entries_expire_after_ttl():
+    # Arrange
+    cache = LRUCache(maxsize=2, ttl_seconds=0.05)
+    cache.put("a", 1)
+
+    # Act
+    time.sleep(0.06)
+
+    # Assert
+    assert cache.get("a") is None
+    assert cache.stats()["misses"] == 1
+
+
+def test_normalize_query_ignores_case_and_spacing():
+    assert normalize_query("  Quién es   ANA ") == normalize_query("quién es ana")
@@ -0,0 +1,107 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+from src.application.services.semantic_index_service import SemanticIndexService
+from src.domain.ports.obsidian_port import ObsidianPort
+
+
+@pytest.mark.asyncio
+async def test_signals_are_coalesced_into_one_sync():
+    # Arrange
+    port = AsyncMock(spec=ObsidianPort)
+    service = SemanticIndexService(port, min_interval_seconds=0, debounce_seconds=0.05)
+    await service.start()
+
+    # Act
+    for _ in range(5):
+        service.notify()
+    await asyncio.sleep(0.2)
+    await service.stop()
+
+    # Assert
+    port.async_sync.assert_awaited_once_with(force=True)
+    status = service.status()
+    assert status["syncs_completed"] == 1
+    assert status["coalesced_signals"] == 4
+    assert status["queue_depth"] == 0
+    assert status["last_completed_at"] is not None
+
+
+@pytest.mark.asyncio
+async def test_notify_does_not_wait_for_sync():
+    # Arrange
+    async def slow_sync(force):
+        await asyncio.sleep(10)
+
+    port = AsyncMock(spec=ObsidianPort)
+    port.async_sync.side_effect = slow_sync
+    service = SemanticIndexService(port, min_interval_seconds=0, debounce_seconds=0)
+    await service.start()
+
+    # Act
+    service.notify()
+    await asyncio.sleep(0.05)
+    status = service.status()
+    await service.stop()
+
+    # Assert
+    assert status["indexing"] is True
+
+
+@pytest.mark.asyncio
+async def test_failed_sync_is_reported():
+    # Arrange
+    port = AsyncMock(spec=ObsidianPort)
+    port.async_sync.side_effect = RuntimeError("Obsidian is down")
+    service = SemanticIndexService(port)
+
+    # Act
+    await service.run_once()
+
+    # Assert
+    assert service.status()["last_error"] == "Obsidian is down"
+    assert service.status()["syncs_completed"] == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_compaction_is_reported():
+    # Arrange
+    port = AsyncMock(spec=ObsidianPort)
+    port.compact.side_effect = RuntimeError("Disk full")
+    service = SemanticIndexService(port)
+
+    # Act
+    stats = await service.compact(force=True)
+
+    # Assert
+    assert stats is None
+    assert service.status()["last_error"] == "Disk full"
+
+
+@pytest.mark.asyncio
+async def test_start_warms_up_the_index_in_the_background():
+    # Arrange
+    warm_up_started = asyncio.Event()
+
+    async def slow_warm_up():
+        warm_up_started.set()
+        await asyncio.sleep(0.1)
+
+    port = AsyncMock(spec=ObsidianPort)
+    port.warm_up.side_effect = slow_warm_up
+    service = SemanticIndexService(port, min_interval_seconds=0, debounce_seconds=0)
+
+    # Act
+    await service.start()
+    await warm_up_started.wait()
+    status_while_warming = service.status()
+    await asyncio.sleep(0.2)
+    status = service.status()
+    await service.stop()
+
+    # Assert
+    assert status_while_warming["warm"] is False
+    assert status_while_warming["indexing"] is True
+    assert status["warm"] is True
+    assert status["warm_up_seconds"] is not None
+    port.async_sync.assert_not_awaited()
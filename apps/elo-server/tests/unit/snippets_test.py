@@ -0,0 +1,55 @@
+from src.infrastructure.out_adapters.obsidian.snippets import merge_adjacent, pack_snippets, query_terms
+
+
+def _chunk(path, index, heading, body):
+    return {"path": path, "source": path, "chunk_index": index, "heading": heading, "content": f"{path} > {heading}\n\n{body}"}
+
+
+def test_adjacent_chunks_are_merged_at_the_rank_of_the_best_one():
+    # Arrange
+    results = [
+        _chunk("A", 2, "H", "two"),
+        _chunk("B", 0, "H", "bee"),
+        _chunk("A", 1, "H", "one"),
+        _chunk("A", 3, "I", "three"),
+        _chunk("A", 5, "I", "five"),
+    ]
+
+    # Act
+    merged = merge_adjacent(results)
+
+    # Assert
+    assert [m["content"] for m in merged] == [
+        "A > H\n\none\n\ntwo\n\nA > I\n\nthree",
+        "B > H\n\nbee",
+        "A > I\n\nfive",
+    ]
+
+
+def test_query_terms_ignore_accents_case_and_stopwords():
+    # Act
+    terms = query_terms("¿Quién es la Carpintera de los muebles?")
+
+    # Assert
+    assert terms == {"quien", "carpintera", "muebles"}
+
+
+def test_packing_shares_the_budget_and_trims_long_results_around_matches():
+    # Arrange
+    long_body = " ".join(f"relleno{i}" for i in range(300)) + " la carpintería de Ana " + " ".join(f"resto{i}" for i in range(300))
+    results = [
+        {"path": "Ana.md", "content": f"Ana > Trabajo\n\n{long_body}"},
+        {"path": "Luis.md", "content": "Luis\n\nVecino de la carpintería."},
+        {"path": "Eva.md", "content": "Eva\n\n" + "x " * 400},
+    ]
+
+    # Act
+    packed = pack_snippets(results, query_terms("carpinteria"), token_budget=150)
+
+    # Assert
+    assert [p["path"] for p in packed] == ["Ana.md", "Luis.md", "Eva.md"]
+    assert packed[0]["content"].startswith("Ana > Trabajo\n\n…")
+    assert packed[2]["content"].endswith("…")
+    assert "**carpintería** de Ana" in packed[0]["content"]
+    assert packed[1]["content"] == "Luis\n\nVecino de la **carpintería**."
+    assert sum(len(p["content"]) for p in packed) <= 150 * 4
@@ -0,0 +1,61 @@
+import asyncio
+import threading
+
+import pytest
+
+from src.infrastructure.out_adapters.obsidian.sync_lock import SyncLock
+
+
+@pytest.mark.asyncio
+async def test_waiters_get_the_lock_in_arrival_order():
+    # Arrange
+    lock = SyncLock()
+    order = []
+
+    async def writer(name: str):
+        async with lock:
+            order.append(name)
+            await asyncio.sleep(0)
+
+    # Act
+    await lock.acquire()
+    tasks = [asyncio.create_task(writer(name)) for name in ("watcher-1", "reconcile", "watcher-2", "watcher-3")]
+    await asyncio.sleep(0)
+    lock.release()
+    await asyncio.gather(*tasks)
+
+    # Assert
+    assert order == ["watcher-1", "reconcile", "watcher-2", "watcher-3"]
+    assert not lock.locked()
+
+
+@pytest.mark.asyncio
+async def test_lock_is_shared_with_other_event_loops_and_survives_cancelled_waiters():
+    # Arrange
+    lock = SyncLock()
+    acquired_elsewhere = threading.Event()
+    await lock.acquire()
+    cancelled = asyncio.create_task(lock.acquire())
+    await asyncio.sleep(0)
+
+    def blocking_sync():
+        async def run():
+            async with lock:
+                acquired_elsewhere.set()
+        asyncio.run(run())
+
+    thread = threading.Thread(target=blocking_sync)
+    thread.start()
+    while len(lock._waiters) < 2:
+        await asyncio.sleep(0.01)
+
+    # Act
+    cancelled.cancel()
+    await asyncio.sleep(0)
+    assert lock.try_acquire() is False
+    lock.release()
+    await asyncio.to_thread(thread.join, 5)
+
+    # Assert
+    assert acquired_elsewhere.is_set()
+    assert not lock.locked()
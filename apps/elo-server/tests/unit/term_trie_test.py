@@ -0,0 +1,30 @@
+from src.infrastructure.out_adapters.obsidian.term_trie import TermTrie
+
+
+def test_prefix_lookup_includes_buffered_terms():
+    # Arrange
+    trie = TermTrie(["carpintera", "carpinteria", "casa", "madrid"])
+    trie.add(["carpintero"])
+
+    # Act
+    matches = trie.prefix("carpint")
+
+    # Assert
+    assert matches == ["carpintera", "carpinteria", "carpintero"]
+    assert "carpintero" in trie
+    assert trie.prefix("zz") == []
+
+
+def test_fuzzy_lookup_finds_terms_one_edit_away():
+    # Arrange
+    trie = TermTrie(["profesion", "profesor", "profesora", "confesion", "madrid"])
+
+    # Act
+    matches = trie.fuzzy("profesoin")
+    near_profesor = trie.fuzzy("profeso")
+
+    # Assert
+    assert matches == []  # A transposition is two edits
+    assert near_profesor == [("profesor", 1)]
+    assert trie.fuzzy("profesion") == [("profesion", 0)]
+    assert trie.fuzzy("confesian") == [("confesion", 1)]
@@ -0,0 +1,86 @@
+from unittest.mock import patch
+
+import pytest
+from chromadb.api.models.Collection import Collection
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from src.infrastructure.out_adapters.obsidian.vector_stores import (
+    COMPACTING_SUFFIX,
+    ChromaHandle,
+    _open_chroma,
+    compact_vector_store,
+    count_entries,
+)
+
+
+def _store(tmp_path):
+    store = _open_chroma(str(tmp_path / "chroma"), DeterministicFakeEmbedding(size=8), "notes")
+    store.add_texts(["Ana", "Luis", "Eva"], ids=["a", "b", "c"], metadatas=[{"path": f"{n}.md"} for n in "abc"])
+    return store
+
+
+def test_chroma_handle_reads_the_private_langchain_chroma_fields(tmp_path):
+    # Arrange
+    store = _store(tmp_path)
+
+    # Act
+    handle = ChromaHandle(store)
+
+    # Assert
+    assert handle.collection.name == "notes"
+    assert handle.get_collection("notes").count() == 3
+    assert handle.get_collection("missing") is None
+    assert isinstance(handle.metadata, (dict, type(None)))
+
+
+def test_compaction_interrupted_mid_swap_is_finished_on_open(tmp_path):
+    # Arrange
+    store = _store(tmp_path)
+    store.delete(ids=["b"])
+
+    # Act
+    with patch.object(Collection, "modify", side_effect=RuntimeError("Process killed")):
+        with pytest.raises(RuntimeError):
+            compact_vector_store(store, batch_size=1)
+    reopened = _open_chroma(str(tmp_path / "chroma"), DeterministicFakeEmbedding(size=8), "notes")
+
+    # Assert
+    assert count_entries(reopened) == 2
+    assert sorted(reopened.get()["ids"]) == ["a", "c"]
+    assert ChromaHandle(reopened).get_collection("notes" + COMPACTING_SUFFIX) is None
+
+
+def test_searches_during_the_compaction_swap_see_the_copy(tmp_path):
+    # Arrange
+    store = _store(tmp_path)
+    store.delete(ids=["b"])
+    modify = Collection.modify
+    seen = []
+
+    def search_then_rename(collection, **kwargs):
+        # The source collection is already deleted at this point
+        seen.append(sorted(doc.page_content for doc in store.similarity_search("Ana", k=3)))
+        return modify(collection, **kwargs)
+
+    # Act
+    with patch.object(Collection, "modify", autospec=True, side_effect=search_then_rename):
+        compact_vector_store(store, batch_size=1)
+
+    # Assert
+    assert seen == [["Ana", "Eva"]]
+    assert ChromaHandle(store).collection.name == "notes"
+
+
+def test_partial_compaction_copy_is_discarded_on_open(tmp_path):
+    # Arrange
+    store = _store(tmp_path)
+    handle = ChromaHandle(store)
+    copy = handle.client.create_collection("notes" + COMPACTING_SUFFIX, embedding_function=None)
+    copy.add(ids=["a"], embeddings=[[0.0] * 8], documents=["Ana"])
+
+    # Act
+    reopened = _open_chroma(str(tmp_path / "chroma"), DeterministicFakeEmbedding(size=8), "notes")
+
+    # Assert
+    assert count_entries(reopened) == 3
+    assert ChromaHandle(reopened).get_collection("notes" + COMPACTING_SUFFIX) is None